@@ -0,0 +1,170 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+# Sprite siap blit:
+# - premul    : BGR yang sudah dikali alpha (uint8, H x W x 3)
+# - inv_alpha : 255 - alpha, diulang 3 channel (uint8, H x W x 3)
+# - source    : objek asal sprite (untuk validasi cache)
+Sprite = namedtuple("Sprite", ["premul", "inv_alpha", "source"])
+
+
+# ===========================================================
+#   MEMBUAT SPRITE (PRE-MULTIPLIED ALPHA)
+# ===========================================================
+def sprite_from_alpha(bgr, alpha, source=None):
+    """
+    Membuat sprite dari warna dan alpha mask.
+
+    Parameters:
+        bgr (numpy.ndarray|tuple): Gambar BGR (H x W x 3) atau satu
+            warna BGR untuk seluruh sprite (mis. teks).
+        alpha (numpy.ndarray): Alpha mask uint8 (H x W), 0–255.
+        source: Disimpan di sprite.source (untuk validasi cache).
+
+    Returns:
+        Sprite: Sprite pre-multiplied alpha.
+    """
+    alpha3 = cv2.merge([alpha] * 3)
+
+    if not isinstance(bgr, np.ndarray):
+        color = bgr
+        bgr = np.empty_like(alpha3)
+        bgr[:] = color
+
+    # premul = bgr * alpha / 255 (dibulatkan)
+    premul = cv2.multiply(bgr, alpha3, scale=1 / 255.0)
+    inv_alpha = cv2.subtract(np.full_like(alpha3, 255), alpha3)
+
+    return Sprite(premul, inv_alpha, source)
+
+
+def make_sprite(img, size=None):
+    """
+    Membuat sprite dari gambar BGR/BGRA, opsional sambil di-resize.
+
+    Gambar tanpa channel alpha dianggap opaque penuh.
+
+    Parameters:
+        img (numpy.ndarray): Gambar BGR atau BGRA.
+        size (int|tuple[int, int]|None): Sisi sprite (px), (w, h),
+            atau None untuk ukuran asli.
+
+    Returns:
+        Sprite: Sprite dengan BGR pre-multiplied dan inverse alpha.
+    """
+    if isinstance(size, int):
+        size = (size, size)
+    if size is not None:
+        img_resized = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+    else:
+        img_resized = img
+
+    bgr = np.ascontiguousarray(img_resized[:, :, :3])
+
+    if img_resized.ndim == 3 and img_resized.shape[2] == 4:
+        alpha = np.ascontiguousarray(img_resized[:, :, 3])
+    else:
+        alpha = np.full(bgr.shape[:2], 255, dtype=np.uint8)
+
+    return sprite_from_alpha(bgr, alpha, img)
+
+
+# ===========================================================
+#   BLIT (ALPHA BLENDING IN-PLACE DENGAN CLIPPING PENUH)
+# ===========================================================
+def blit_sprite(img, sprite, pos):
+    """
+    Menempelkan sprite ke frame secara in-place.
+
+    Blending integer: out = premul + roi * inv_alpha / 255, semua channel
+    sekaligus dengan operasi OpenCV dan ditulis langsung ke ROI frame.
+    Bagian sprite yang keluar frame (kiri, atas, kanan, bawah)
+    dipotong, termasuk untuk posisi x/y negatif.
+
+    Parameters:
+        img (numpy.ndarray): Frame BGR uint8.
+        sprite (Sprite): Sprite dari make_sprite()/sprite_from_alpha().
+        pos (tuple[int, int]): Posisi (x, y) kiri-atas sprite.
+
+    Returns:
+        None
+        (Modifies img directly)
+    """
+    x, y = int(pos[0]), int(pos[1])
+    h, w = sprite.premul.shape[:2]
+
+    # Potong bagian sprite di luar frame
+    x1, y1 = max(0, x), max(0, y)
+    x2, y2 = min(img.shape[1], x + w), min(img.shape[0], y + h)
+    if x1 >= x2 or y1 >= y2:
+        return
+
+    sx, sy = x1 - x, y1 - y
+    roi = img[y1:y2, x1:x2]
+    premul = sprite.premul[sy:sy + (y2 - y1), sx:sx + (x2 - x1)]
+    inv_alpha = sprite.inv_alpha[sy:sy + (y2 - y1), sx:sx + (x2 - x1)]
+
+    cv2.multiply(roi, inv_alpha, dst=roi, scale=1 / 255.0)
+    cv2.add(roi, premul, dst=roi)
+
+
+def blit_many(img, items):
+    """
+    Batch blit: menempelkan banyak sprite dalam satu panggilan.
+
+    Parameters:
+        img (numpy.ndarray): Frame BGR uint8.
+        items (iterable[tuple[Sprite, tuple[int, int]]]):
+            Pasangan (sprite, (x, y)), digambar berurutan.
+
+    Returns:
+        None
+        (Modifies img directly)
+    """
+    for sprite, pos in items:
+        if sprite is not None:
+            blit_sprite(img, sprite, pos)
+
+
+def blend_alpha(img, overlay, pos, alpha_mask=None):
+    """
+    Alpha blending satu kali untuk gambar yang belum berbentuk sprite.
+
+    Hanya bagian overlay yang terlihat di frame yang dikonversi, lalu
+    di-blit dengan blit_sprite. Untuk gambar yang dipakai berulang,
+    buat sprite sekali dengan make_sprite() dan pakai blit_sprite().
+
+    Parameters:
+        img (numpy.ndarray): Frame BGR uint8.
+        overlay (numpy.ndarray): Gambar BGR atau BGRA.
+        pos (tuple[int, int]): Posisi (x, y) kiri-atas overlay.
+        alpha_mask (numpy.ndarray|None): Mask alpha (H x W), 0–255.
+            Jika None, channel alpha overlay dipakai (atau opaque).
+
+    Returns:
+        None
+        (Modifies img directly)
+    """
+    x, y = int(pos[0]), int(pos[1])
+    h, w = overlay.shape[:2]
+
+    # Potong dulu ke area yang terlihat agar konversi seminimal mungkin
+    x1, y1 = max(0, x), max(0, y)
+    x2, y2 = min(img.shape[1], x + w), min(img.shape[0], y + h)
+    if x1 >= x2 or y1 >= y2:
+        return
+
+    visible = (slice(y1 - y, y2 - y), slice(x1 - x, x2 - x))
+    bgr = np.ascontiguousarray(overlay[visible][:, :, :3])
+
+    if alpha_mask is not None:
+        alpha = alpha_mask[visible]
+    elif overlay.shape[2] == 4:
+        alpha = overlay[visible][:, :, 3]
+    else:
+        alpha = np.full(bgr.shape[:2], 255, dtype=np.uint8)
+
+    sprite = sprite_from_alpha(bgr, np.ascontiguousarray(alpha, dtype=np.uint8))
+    blit_sprite(img, sprite, (x1, y1))
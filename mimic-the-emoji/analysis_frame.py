@@ -0,0 +1,82 @@
+import cv2
+import numpy as np
+
+# Lebar default frame analisis (deteksi wajah, motion check)
+DEFAULT_ANALYSIS_WIDTH = 480
+
+
+# ===========================================================
+#   FRAME ANALISIS RESOLUSI RENDAH (DUAL-RESOLUTION PIPELINE)
+# ===========================================================
+class AnalysisFrame:
+    """
+    Salinan grayscale beresolusi rendah dari frame display.
+
+    Grayscale, deteksi/tracking wajah, dan motion check cukup berjalan
+    di frame kecil ini; render tetap di resolusi display. Frame kecil
+    dihitung sekali per frame ke buffer yang dipakai ulang (resize
+    warna dulu, baru konversi gray, sehingga cvtColor hanya menyentuh
+    piksel kecil). Box dari frame analisis dipetakan kembali ke
+    koordinat display dengan to_display().
+
+    Parameters:
+        width (int|None): Lebar frame analisis (px). None/0 atau lebih
+            besar dari frame → analisis di resolusi penuh.
+    """
+
+    def __init__(self, width=DEFAULT_ANALYSIS_WIDTH):
+        self.width = width or 0
+        self.scale = 1.0           # faktor display / analisis
+        self._shape = None
+        self._small = None
+        self._gray = None
+
+    def _allocate(self, shape):
+        h, w = shape[:2]
+        if 0 < self.width < w:
+            sw = self.width
+            sh = max(1, int(round(h * sw / w)))
+            self._small = np.empty((sh, sw, 3), np.uint8)
+        else:
+            sw, sh = w, h
+            self._small = None
+        self._gray = np.empty((sh, sw), np.uint8)
+        self._size = (sw, sh)
+        self.scale = w / sw
+        self._shape = shape
+
+    def gray(self, frame):
+        """
+        Membuat frame analisis grayscale dari frame display.
+
+        Parameters:
+            frame (numpy.ndarray): Frame display (BGR).
+
+        Returns:
+            numpy.ndarray: Frame grayscale kecil (buffer yang sama tiap frame).
+        """
+        if frame.shape != self._shape:
+            self._allocate(frame.shape)
+
+        if self._small is not None:
+            cv2.resize(frame, self._size, dst=self._small, interpolation=cv2.INTER_LINEAR)
+            cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        else:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        return self._gray
+
+    def to_display(self, boxes):
+        """Memetakan box (x, y, w, h) dari frame analisis ke frame display."""
+        s = self.scale
+        if s == 1.0:
+            return [tuple(int(v) for v in box) for box in boxes]
+        return [(int(round(x * s)), int(round(y * s)), int(round(w * s)), int(round(h * s)))
+                for (x, y, w, h) in boxes]
+
+    def to_analysis(self, boxes):
+        """Memetakan box (x, y, w, h) dari frame display ke frame analisis."""
+        s = self.scale
+        if s == 1.0:
+            return [tuple(int(v) for v in box) for box in boxes]
+        return [(int(round(x / s)), int(round(y / s)), int(round(w / s)), int(round(h / s)))
+                for (x, y, w, h) in boxes]
@@ -1,20 +1,481 @@
+import os
+import queue
+import threading
+import time
+
 import pygame
 
-def init_audio():
+# Folder SFX yang di-decode sekali saat init_audio()
+AUDIO_DIR = "assets/audio"
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg")
+
+# Jumlah channel yang dicadangkan untuk SFX
+SFX_CHANNELS = 8
+
+# Prioritas per SFX (nama file tanpa ekstensi). Jika semua channel
+# sibuk, SFX baru boleh mencuri channel berprioritas <= miliknya.
+SFX_PRIORITY = {
+    "mariostart": 3,
+    "correct": 2,
+    "yay": 2,
+    "confeti": 1,
+    "truth-detector-buzzer": 1,
+}
+DEFAULT_PRIORITY = 1
+
+BGM_PATH = "assets/audio/bgm.mp3"
+
+# Event game → aksi audio: ("sfx", nama), ("bgm", path), atau ("bgm_stop",)
+AUDIO_EVENTS = {
+    "countdown": [("sfx", "mariostart")],
+    "game_start": [("bgm", BGM_PATH)],
+    "correct": [("sfx", "correct")],
+    "round_complete": [("sfx", "confeti")],
+    "game_end": [("bgm_stop",)],
+    "game_over": [("sfx", "confeti"), ("sfx", "yay")],
+}
+
+# Pilihan output audio: "pygame" (mixer) atau "null" (tanpa perangkat suara)
+AUDIO_BACKENDS = ("pygame", "null")
+
+# Event yang sama dalam jendela ini (ms) hanya diputar sekali
+COALESCE_MS = 150
+
+
+def sound_name(path):
+    """Nama SFX dari path: 'assets/audio/correct.mp3' → 'correct'."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+# ===========================================================
+#   AUDIO MANAGER: CACHE SFX + POOL CHANNEL + VOICE STEALING
+# ===========================================================
+class AudioManager:
     """
-    Menginisialisasi sistem audio pygame.mixer.
+    Mengelola BGM dan SFX tanpa decode file di tengah game.
 
-    Fungsi ini wajib dipanggil sebelum menggunakan fungsi audio lain
-    seperti play_bgm() atau play_sfx().
+    Semua SFX di audio_dir di-decode sekali ke pygame.mixer.Sound saat
+    init(). play() hanya memilih channel dari pool yang dicadangkan dan
+    langsung kembali (pygame memutar suara di thread mixer-nya sendiri).
+    Jika semua channel sibuk, channel dengan prioritas terendah (yang
+    paling lama berbunyi) dicuri, asalkan prioritasnya tidak lebih
+    tinggi dari SFX baru; jika tidak, SFX baru dilewati.
+
+    File yang tidak ada (mis. BGM yang belum disertakan) atau perangkat
+    audio yang tidak tersedia hanya menghasilkan satu peringatan; semua
+    pemanggilan berikutnya menjadi no-op tanpa mencoba ulang.
+
+    Parameters:
+        audio_dir (str): Folder SFX yang di-preload.
+        channels (int): Jumlah channel pool SFX.
+        priorities (dict|None): Prioritas per nama SFX.
+    """
+
+    def __init__(self, audio_dir=AUDIO_DIR, channels=SFX_CHANNELS, priorities=None):
+        self.audio_dir = audio_dir
+        self.n_channels = channels
+        self.priorities = dict(SFX_PRIORITY if priorities is None else priorities)
+
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._sounds = {}          # nama → pygame.mixer.Sound
+        self._channels = []
+        self._playing = []         # per channel: (prioritas, waktu mulai)
+        self._failed = set()       # path yang gagal di-load (tidak dicoba ulang)
+
+        # Counter statistik
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    # -----------------------------------------------------------
+    #   Inisialisasi
+    # -----------------------------------------------------------
+    def init(self):
+        """
+        Menginisialisasi mixer, mencadangkan channel, dan preload SFX.
+
+        Returns:
+            bool: True jika audio aktif.
+        """
+        if self.enabled:
+            return True
+        try:
+            pygame.mixer.init()
+            # Pool mendapat channel tambahan; channel yang sudah ada tetap
+            # bebas untuk Sound.play() di luar pool
+            pygame.mixer.set_num_channels(pygame.mixer.get_num_channels() + self.n_channels)
+            # Channel 0..n-1 (pool) dicadangkan: tidak dipakai pygame secara otomatis
+            pygame.mixer.set_reserved(self.n_channels)
+        except pygame.error as e:
+            print(f"[audio] mixer tidak tersedia, audio dimatikan: {e}")
+            return False
+
+        self._channels = [pygame.mixer.Channel(i) for i in range(self.n_channels)]
+        self._playing = [(0, 0.0)] * self.n_channels
+        self.enabled = True
+        self.preload()
+        return True
+
+    def preload(self, folder=None):
+        """
+        Decode semua file audio di folder ke cache (sekali per file).
+
+        Returns:
+            int: Jumlah SFX di cache.
+        """
+        folder = folder or self.audio_dir
+        t0 = time.perf_counter()
+        for entry in sorted(os.listdir(folder)) if os.path.isdir(folder) else []:
+            if os.path.splitext(entry)[1].lower() in AUDIO_EXTENSIONS:
+                self._load(os.path.join(folder, entry))
+        print(f"[audio] {len(self._sounds)} SFX di-preload dalam "
+              f"{(time.perf_counter() - t0) * 1000:.0f} ms")
+        return len(self._sounds)
+
+    def _load(self, path):
+        name = sound_name(path)
+        if name in self._sounds:
+            return self._sounds[name]
+        if path in self._failed:
+            return None
+        try:
+            sound = self._sounds[name] = pygame.mixer.Sound(path)
+            return sound
+        except (pygame.error, FileNotFoundError) as e:
+            self._failed.add(path)
+            print(f"[audio] gagal load {path}: {e}")
+            return None
+
+    # -----------------------------------------------------------
+    #   SFX
+    # -----------------------------------------------------------
+    def play(self, sound, volume=1.0, priority=None):
+        """
+        Memutar SFX dari cache lewat pool channel (non-blocking).
+
+        Parameters:
+            sound (str): Nama SFX ('correct') atau path file.
+            volume (float): Volume channel (0.0–1.0).
+            priority (int|None): Prioritas (default dari SFX_PRIORITY).
+
+        Returns:
+            bool: True jika SFX diputar.
+        """
+        if not self.enabled:
+            return False
+
+        name = sound_name(sound)
+        snd = self._sounds.get(name)
+        if snd is None:
+            # SFX di luar audio_dir: load sekali lalu ikut di-cache
+            snd = self._load(sound) if os.path.splitext(sound)[1] else None
+            if snd is None:
+                return False
+        if priority is None:
+            priority = self.priorities.get(name, DEFAULT_PRIORITY)
+
+        with self._lock:
+            index = self._pick_channel(priority)
+            if index is None:
+                self.dropped += 1
+                return False
+            channel = self._channels[index]
+            channel.set_volume(volume)
+            channel.play(snd)
+            self._playing[index] = (priority, time.monotonic())
+            self.played += 1
+        return True
+
+    def _pick_channel(self, priority):
+        """Channel bebas, atau channel yang boleh dicuri, atau None."""
+        victim = None
+        for i, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return i
+            # Kandidat curian: prioritas terendah, lalu yang paling lama
+            if victim is None or self._playing[i] < self._playing[victim]:
+                victim = i
+
+        if victim is None or self._playing[victim][0] > priority:
+            return None
+        self._channels[victim].stop()
+        self.stolen += 1
+        return victim
+
+    # -----------------------------------------------------------
+    #   BGM
+    # -----------------------------------------------------------
+    def play_bgm(self, path, volume=0.5):
+        """
+        Memutar BGM secara looping; file yang tidak ada dilewati.
+
+        Returns:
+            bool: True jika BGM diputar.
+        """
+        if not self.enabled or path in self._failed:
+            return False
+        if not os.path.isfile(path):
+            self._failed.add(path)
+            print(f"[audio] BGM tidak ditemukan, dilewati: {path}")
+            return False
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(-1)
+        except pygame.error as e:
+            self._failed.add(path)
+            print(f"[audio] gagal memutar BGM {path}: {e}")
+            return False
+        return True
+
+    def stop_bgm(self):
+        """Menghentikan BGM (no-op jika audio tidak aktif)."""
+        if self.enabled:
+            pygame.mixer.music.stop()
+
+    def stats(self):
+        """
+        Mengembalikan counter statistik SFX.
+
+        Returns:
+            dict: cached, played, stolen, dan dropped.
+        """
+        with self._lock:
+            return {"cached": len(self._sounds), "played": self.played,
+                    "stolen": self.stolen, "dropped": self.dropped}
+
+
+# ===========================================================
+#   BACKEND NULL (TANPA PERANGKAT SUARA)
+# ===========================================================
+class NullAudioManager:
+    """
+    Pengganti AudioManager yang tidak memutar apa pun.
+
+    Dipakai di mesin tanpa perangkat suara, CI, dan render headless;
+    setiap pemanggilan hanya dicatat di counter (dan log jika verbose).
+
+    Parameters:
+        verbose (bool): Cetak setiap aksi audio.
+    """
+
+    enabled = True
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.played = 0
+        self.log = []
+
+    def init(self):
+        return True
+
+    def play(self, sound, volume=1.0, priority=None):
+        self.played += 1
+        self._record("sfx", sound)
+        return True
+
+    def play_bgm(self, path, volume=0.5):
+        self._record("bgm", path)
+        return True
+
+    def stop_bgm(self):
+        self._record("bgm_stop", None)
+
+    def _record(self, action, arg):
+        self.log.append((time.monotonic(), action, arg))
+        if self.verbose:
+            print(f"[audio:null] {action} {arg or ''}")
+
+    def stats(self):
+        return {"cached": 0, "played": self.played, "stolen": 0, "dropped": 0}
+
+
+# ===========================================================
+#   THREAD AUDIO + ANTREAN EVENT (RENDER LOOP TIDAK PERNAH MENUNGGU MIXER)
+# ===========================================================
+class AudioThread:
+    """
+    Menjalankan semua pemanggilan mixer di thread tersendiri.
+
+    Kode game hanya memanggil post("correct") yang langsung kembali;
+    thread ini mengambil event dari antrean, menerjemahkannya lewat
+    AUDIO_EVENTS, lalu memanggil manager (AudioManager atau
+    NullAudioManager). Event yang sama yang datang dalam jendela
+    coalesce_ms (mis. beberapa kecocokan beruntun) digabung menjadi
+    satu suara.
 
     Parameters:
+        manager (AudioManager|NullAudioManager): Output audio.
+        coalesce_ms (float): Jendela penggabungan event duplikat.
+        events (dict|None): Pemetaan event → aksi (default AUDIO_EVENTS).
+    """
+
+    def __init__(self, manager, coalesce_ms=COALESCE_MS, events=None):
+        self.manager = manager
+        self.coalesce_s = coalesce_ms / 1000.0
+        self.events = AUDIO_EVENTS if events is None else events
+
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._last = {}            # key event → waktu terakhir diputar
+
+        # Counter statistik
+        self.posted = 0
+        self.handled = 0
+        self.coalesced = 0
+
+    def start(self):
+        """
+        Menjalankan thread audio.
+
+        Returns:
+            AudioThread: self, agar bisa dipakai berantai.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="AudioThread", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Memproses sisa antrean lalu menghentikan thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def post(self, event, *args):
+        """
+        Mengirim event audio (non-blocking).
+
+        Parameters:
+            event (str): Nama event (kunci AUDIO_EVENTS) atau aksi
+                langsung "sfx"/"bgm"/"bgm_stop".
+            *args: Argumen aksi langsung (nama SFX / path BGM, volume).
+
+        Returns:
+            None
+        """
+        if self._thread is None:
+            return
+        self.posted += 1
+        self._queue.put((time.monotonic(), event, args))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            # Ambil semua event yang sudah menunggu sekaligus (batch)
+            batch = [item]
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._handle_batch(batch)
+                    return
+                batch.append(item)
+            self._handle_batch(batch)
+
+    def _handle_batch(self, batch):
+        for posted_at, event, args in batch:
+            key = (event, args)
+            last = self._last.get(key)
+            if last is not None and posted_at - last < self.coalesce_s:
+                self.coalesced += 1
+                continue
+            self._last[key] = posted_at
+            self.handled += 1
+            try:
+                self._dispatch(event, args)
+            except Exception as e:
+                print(f"[audio] event {event} gagal: {e}")
+
+    def _dispatch(self, event, args):
+        actions = self.events.get(event, [(event, *args)])
+        for action, *params in actions:
+            if action == "sfx":
+                self.manager.play(*params)
+            elif action == "bgm":
+                self.manager.play_bgm(*params)
+            elif action == "bgm_stop":
+                self.manager.stop_bgm()
+
+    def stats(self):
+        """
+        Mengembalikan counter statistik antrean audio.
+
+        Returns:
+            dict: posted, handled, coalesced, dan stats() milik manager.
+        """
+        return {"posted": self.posted, "handled": self.handled,
+                "coalesced": self.coalesced, **self.manager.stats()}
+
+
+# audio manager global yang dipakai game, menu, dan layar game over
+audio = AudioManager()
+
+# thread audio global (dibuat oleh init_audio)
+audio_thread = None
+
+
+def post_audio_event(event, *args):
+    """
+    Mengirim event audio ke thread audio tanpa menunggu mixer.
+
+    No-op jika init_audio() belum dipanggil (mis. mode headless).
+
+    Parameters:
+        event (str): Nama event di AUDIO_EVENTS, mis. "correct".
+        *args: Argumen untuk aksi langsung ("sfx", "bgm").
+
+    Returns:
         None
+    """
+    if audio_thread is not None:
+        audio_thread.post(event, *args)
+
+
+def shutdown_audio():
+    """Menghentikan thread audio dan mencetak statistiknya."""
+    global audio_thread
+    if audio_thread is None:
+        return
+    audio_thread.stop()
+    stats = audio_thread.stats()
+    print(f"[audio] events={stats['posted']} played={stats['handled']} "
+          f"coalesced={stats['coalesced']} stolen={stats['stolen']} dropped={stats['dropped']}")
+    audio_thread = None
+
+
+# ===========================================================
+#   FUNGSI LAMA (WRAPPER TIPIS KE AudioManager)
+# ===========================================================
+def init_audio(backend="pygame"):
+    """
+    Menginisialisasi sistem audio, preload semua SFX, dan menjalankan
+    thread audio.
+
+    Fungsi ini wajib dipanggil sebelum menggunakan fungsi audio lain
+    seperti play_bgm(), play_sfx(), atau post_audio_event().
+
+    Parameters:
+        backend (str): "pygame" (mixer) atau "null" (tanpa suara).
 
     Returns:
         None
     """
-    # Inisialisasi modul audio pygame
-    pygame.mixer.init()
+    global audio, audio_thread
+    if audio_thread is not None:
+        return
+    if backend == "null":
+        audio = NullAudioManager()
+    audio.init()
+    audio_thread = AudioThread(audio).start()
 
 
 def play_bgm(path, volume=0.5):
@@ -28,14 +489,7 @@ def play_bgm(path, volume=0.5):
     Returns:
         None
     """
-    # Load file musik
-    pygame.mixer.music.load(path)
-
-    # Atur volume musik
-    pygame.mixer.music.set_volume(volume)
-
-    # Play musik secara loop tanpa henti (-1)
-    pygame.mixer.music.play(-1)
+    post_audio_event("bgm", path, volume)
 
 
 def stop_bgm():
@@ -48,14 +502,16 @@ def stop_bgm():
     Returns:
         None
     """
-    # Stop playback musik
-    pygame.mixer.music.stop()
+    post_audio_event("bgm_stop")
 
 
 def play_sfx(path, volume=1.0):
     """
     Memutar sound effect (SFX) sekali tanpa loop.
 
+    SFX diambil dari cache (di-decode sekali saat init_audio()) dan
+    diputar oleh thread audio; fungsi ini langsung kembali.
+
     Parameters:
         path (str): Path file audio SFX.
         volume (float): Volume efek suara (0.0–1.0).
@@ -63,11 +519,4 @@ def play_sfx(path, volume=1.0):
     Returns:
         None
     """
-    # Load sound effect ke objek Sound
-    sound = pygame.mixer.Sound(path)
-
-    # Set volume SFX
-    sound.set_volume(volume)
-
-    # Play sekali
-    sound.play()
\ No newline at end of file
+    post_audio_event("sfx", path, volume)
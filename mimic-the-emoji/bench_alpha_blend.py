@@ -0,0 +1,152 @@
+# bench_alpha_blend.py
+"""
+Benchmark alpha_blend vs tiga implementasi alpha blending lama.
+
+Implementasi lama disalin apa adanya di file ini sebagai referensi:
+- legacy_overlay_image_alpha : emoji_overlay lama (float64)
+- legacy_overlay_png_menu    : main_menu.overlay_png lama (split/merge + loop channel)
+- legacy_overlay_png_gameover: game_over.overlay_png lama (sama, + paste non-alpha)
+
+Yang diukur untuk tiap ukuran sprite:
+- blend_alpha      : blending satu kali dari gambar BGRA mentah
+- blit_sprite      : blit sprite yang sudah di-cache
+- blit_many        : batch blit 8 sprite dalam satu panggilan (per sprite)
+
+Contoh:
+    python bench_alpha_blend.py --repeat 1000
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+from alpha_blend import blend_alpha, blit_sprite, blit_many, make_sprite
+
+SIZES = (60, 100, 200)
+
+
+# ===========================================================
+#   IMPLEMENTASI LAMA (REFERENSI)
+# ===========================================================
+def legacy_overlay_image_alpha(img, img_overlay, pos, alpha_mask):
+    x, y = pos
+    h, w = img_overlay.shape[:2]
+    if x >= img.shape[1] or y >= img.shape[0]:
+        return
+    if x + w > img.shape[1]:
+        w = img.shape[1] - x
+        img_overlay = img_overlay[:, :w]
+        alpha_mask = alpha_mask[:, :w]
+    if y + h > img.shape[0]:
+        h = img.shape[0] - y
+        img_overlay = img_overlay[:h]
+        alpha_mask = alpha_mask[:h]
+    roi = img[y:y+h, x:x+w].astype(float)
+    overlay = img_overlay[..., :3].astype(float)
+    alpha = (alpha_mask / 255.0)[..., None]
+    comp = (1.0 - alpha) * roi + alpha * overlay
+    img[y:y+h, x:x+w] = comp.astype(img.dtype)
+
+
+def legacy_overlay_png_menu(base, img_png, x, y):
+    h, w = img_png.shape[:2]
+    if y + h > base.shape[0] or x + w > base.shape[1]:
+        return base
+    if img_png.shape[2] == 4:
+        b, g, r, a = cv2.split(img_png)
+        overlay_color = cv2.merge((b, g, r))
+        mask = a / 255.0
+        for c in range(3):
+            base[y:y+h, x:x+w, c] = (
+                base[y:y+h, x:x+w, c] * (1 - mask) +
+                overlay_color[:, :, c] * mask
+            )
+    return base
+
+
+def legacy_overlay_png_gameover(base, img_png, x, y):
+    h, w = img_png.shape[:2]
+    if y + h > base.shape[0] or x + w > base.shape[1]:
+        return base
+    if img_png.shape[2] == 4:
+        b, g, r, a = cv2.split(img_png)
+        overlay_color = cv2.merge((b, g, r))
+        mask = a / 255.0
+        for c in range(3):
+            base[y:y+h, x:x+w, c] = (
+                base[y:y+h, x:x+w, c] * (1 - mask) +
+                overlay_color[:, :, c] * mask
+            )
+    else:
+        base[y:y+h, x:x+w] = img_png
+    return base
+
+
+def bench(fn, repeat):
+    """Rata-rata waktu fn() dalam mikrodetik."""
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) * 1e6 / repeat
+
+
+def check_edges(sprite_img):
+    """Pastikan clipping di keempat sisi (termasuk x/y negatif) benar."""
+    frame = np.full((120, 160, 3), 90, dtype=np.uint8)
+    h, w = sprite_img.shape[:2]
+    for pos in [(-w // 2, -h // 2), (160 - w // 2, 120 - h // 2),
+                (-w // 2, 120 - h // 2), (-w - 5, 10), (200, 10)]:
+        # Referensi: frame diperbesar agar versi lama tidak perlu clipping
+        p = max(w, h) + 10
+        expected = np.pad(frame, ((p, p), (p, p), (0, 0)), mode="edge")
+        legacy_overlay_image_alpha(expected, sprite_img[:, :, :3],
+                                   (pos[0] + p, pos[1] + p), sprite_img[:, :, 3])
+        expected = expected[p:p + 120, p:p + 160]
+
+        actual = frame.copy()
+        blend_alpha(actual, sprite_img, pos)
+        diff = int(np.abs(expected.astype(int) - actual.astype(int)).max())
+        if diff > 1:
+            raise SystemExit(f"ERROR: clipping salah di posisi {pos} (diff {diff})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--image", default="assets/happy.png")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    src = cv2.imread(args.image, cv2.IMREAD_UNCHANGED)
+    if src is None or src.shape[2] != 4:
+        raise SystemExit(f"ERROR: {args.image} harus PNG dengan alpha channel")
+
+    frame = np.full((720, 1280, 3), 90, dtype=np.uint8)
+    pos = (300, 200)
+
+    print(f"{'size':>5} {'legacy float':>12} {'legacy menu':>12} {'legacy g.o.':>12} "
+          f"{'blend_alpha':>12} {'blit_sprite':>12} {'blit_many/8':>12}   (us/sprite)")
+
+    for size in SIZES:
+        img = cv2.resize(src, (size, size), interpolation=cv2.INTER_AREA)
+        check_edges(img)
+        sprite = make_sprite(img)
+        batch = [(sprite, (pos[0] + i * 40, pos[1])) for i in range(8)]
+
+        results = [
+            bench(lambda: legacy_overlay_image_alpha(frame, img[:, :, :3], pos, img[:, :, 3]), args.repeat),
+            bench(lambda: legacy_overlay_png_menu(frame, img, *pos), args.repeat),
+            bench(lambda: legacy_overlay_png_gameover(frame, img, *pos), args.repeat),
+            bench(lambda: blend_alpha(frame, img, pos), args.repeat),
+            bench(lambda: blit_sprite(frame, sprite, pos), args.repeat),
+            bench(lambda: blit_many(frame, batch), args.repeat) / len(batch),
+        ]
+
+        print(f"{size:>5} " + " ".join(f"{r:>12.1f}" for r in results))
+
+    print("Edge clipping (x/y negatif & keluar kanan/bawah): OK")
+
+
+if __name__ == "__main__":
+    main()
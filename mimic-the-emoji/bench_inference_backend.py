@@ -0,0 +1,125 @@
+# bench_inference_backend.py
+"""
+Benchmark backend inferensi: thread (EmotionWorker) vs proses
+(ProcessEmotionWorker, frame via shared memory) dengan 1..N proses.
+
+Untuk tiap konfigurasi, loop render tiruan berjalan selama --seconds:
+baca frame sintetis, buat frame analisis + tracking wajah (beban CPU
+nyata seperti di game), submit ke worker, lalu ambil hasil terbaru.
+Dilaporkan FPS loop render, inferensi selesai per detik, rata-rata
+waktu inferensi, frame yang dibuang, dan biaya submit() (us).
+
+Untuk kasus multi-wajah, --faces N mengirim N box wajah per frame ke
+get_emotion_scores_batch.
+
+Contoh:
+    python bench_inference_backend.py --workers 1 2 4 --seconds 10
+    python bench_inference_backend.py --faces 4 --workers 2 4 8
+"""
+import argparse
+import os
+import time
+
+from analysis_frame import AnalysisFrame
+from emotion_utils import get_emotion_scores, get_emotion_scores_batch, load_emotion_model
+from face_tracker import FaceTracker
+from frame_source import open_source
+from inference_worker import EmotionWorker
+from process_worker import ProcessEmotionWorker
+
+
+def face_boxes_for(faces, n, frame):
+    """Box wajah terdeteksi, ditambah box tiruan sampai berjumlah n."""
+    h, w = frame.shape[:2]
+    boxes = list(faces[:n])
+    size = min(w, h) // 4
+    while len(boxes) < n:
+        i = len(boxes)
+        boxes.append(((i * size) % max(1, w - size), h // 2 - size // 2, size, size))
+    return boxes
+
+
+def run(worker, args):
+    """Menjalankan loop render tiruan dengan worker tertentu."""
+    cap = open_source(args.source, pacing="fast", loop=True)
+    tracker = FaceTracker()
+    analysis = AnalysisFrame()
+
+    frames = 0
+    submit_us = 0.0
+    before = worker.stats()
+    t_end = time.perf_counter() + args.seconds
+    t0 = time.perf_counter()
+
+    while time.perf_counter() < t_end:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        faces = analysis.to_display(tracker.update(analysis.gray(frame)))
+
+        ts = time.perf_counter()
+        if args.faces > 1:
+            worker.submit(frame, face_boxes=face_boxes_for(faces, args.faces, frame))
+        else:
+            worker.submit(frame, face_box=faces[0] if faces else None)
+        submit_us += (time.perf_counter() - ts) * 1e6
+
+        worker.latest()
+        frames += 1
+
+    elapsed = time.perf_counter() - t0
+    cap.release()
+    after = worker.stats()
+    inferred = after["frames_inferred"] - before["frames_inferred"]
+    infer_ms = after["inference_ms"] - before["inference_ms"]
+    return {
+        "loop_fps": frames / elapsed,
+        "infer_per_s": inferred / elapsed,
+        "avg_infer_ms": infer_ms / inferred if inferred else 0.0,
+        "dropped": after["frames_dropped"] - before["frames_dropped"],
+        "submit_us": submit_us / max(1, frames),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="synthetic:assets/demo/gameplay.jpg")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--faces", type=int, default=1)
+    args = parser.parse_args()
+
+    infer_fn = get_emotion_scores_batch if args.faces > 1 else get_emotion_scores
+    print(f"CPU cores: {os.cpu_count()}  faces/frame: {args.faces}  "
+          f"durasi: {args.seconds:.0f} s per konfigurasi")
+    print(f"{'backend':>12} {'loop fps':>9} {'infer/s':>8} {'avg ms':>8} "
+          f"{'dropped':>8} {'submit us':>10}")
+
+    def report(name, r):
+        print(f"{name:>12} {r['loop_fps']:>9.1f} {r['infer_per_s']:>8.1f} "
+              f"{r['avg_infer_ms']:>8.1f} {r['dropped']:>8} {r['submit_us']:>10.1f}")
+
+    # --- In-process (thread) ---
+    load_emotion_model()
+    worker = EmotionWorker(infer_fn=infer_fn).start()
+    try:
+        report("thread", run(worker, args))
+    finally:
+        worker.stop()
+
+    # --- Proses terpisah (shared memory) ---
+    for n in args.workers:
+        worker = ProcessEmotionWorker(infer_fn=infer_fn, workers=n).start()
+        try:
+            # Waktu load model di proses anak tidak ikut diukur
+            if not worker.wait_ready(timeout=120):
+                print(f"{'process x' + str(n):>12} gagal start")
+                continue
+            report(f"process x{n}", run(worker, args))
+        finally:
+            worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+# bench_pipeline.py
+"""
+Benchmark pipeline frame end-to-end dengan timing per tahap.
+
+Setiap frame dari klip (default: sumber sintetis dari assets/demo/*.jpg,
+atau --source rekaman.mp4) dijalankan melalui tahap-tahap run_game
+secara terpisah:
+
+- capture  : read + mirror (+ resize ke resolusi uji untuk file video)
+- gray     : frame analisis kecil (resize + grayscale, --analysis-width)
+- detect   : deteksi wajah (FaceTracker seperti di game, atau --detector haar)
+- emotion  : get_emotion_scores pada wajah pertama (sinkron)
+- emojis   : draw_floating_emojis
+- current  : draw_current_emotion
+- hud      : draw_simple_hud
+- output   : encode (cv2.VideoWriter MJPG), window (imshow), atau null
+
+Lalu seluruh run_game dijalankan headless (NullSink, jam sumber,
+inferensi sinkron) pada klip yang sama untuk throughput gabungan.
+
+Laporan berisi p50/p95/p99 per tahap, FPS, dan peak RSS untuk tiap
+resolusi (480p/720p/1080p), disimpan sebagai JSON agar bisa
+dibandingkan antar commit (--compare hasil_lama.json).
+
+Contoh:
+    python bench_pipeline.py --frames 200 --json hasil.json
+    python bench_pipeline.py --source rekaman.mp4 --resolutions 720p
+    python bench_pipeline.py --compare baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import cv2
+import numpy as np
+from emotion_utils import get_emotion_scores, dominant_emotion, get_random_emojis, load_emotion_model
+from emoji_overlay import load_emoji_images
+from face_tracker import FaceTracker, load_face_cascade
+from analysis_frame import AnalysisFrame, DEFAULT_ANALYSIS_WIDTH
+from frame_sink import NullSink, VideoWriterSink, WindowSink, make_clock
+from frame_source import open_source
+from profiling import peak_rss_mb
+from game_emotion import run_game
+from gui_helpers import draw_floating_emojis, draw_current_emotion, draw_simple_hud
+
+RESOLUTIONS = {
+    "480p": (854, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+}
+STAGES = ("capture", "gray", "detect", "emotion", "emojis", "current", "hud", "output")
+PERCENTILES = (50, 95, 99)
+
+
+# ===========================================================
+#   UTILITAS PENGUKURAN
+# ===========================================================
+def summarize(samples_ms):
+    """Ringkasan latency (ms): p50/p95/p99, mean, dan max."""
+    if not samples_ms:
+        return None
+    arr = np.asarray(samples_ms)
+    summary = {f"p{p}": float(np.percentile(arr, p)) for p in PERCENTILES}
+    summary["mean"] = float(arr.mean())
+    summary["max"] = float(arr.max())
+    return summary
+
+
+def git_commit():
+    """Hash commit saat ini (untuk membandingkan hasil antar commit)."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def open_output(kind, size, fps):
+    """Membuat sink untuk tahap output."""
+    if kind == "window":
+        cv2.namedWindow("Mimic The Emoji", cv2.WINDOW_NORMAL)
+        return WindowSink(), None
+    if kind == "encode":
+        fd, path = tempfile.mkstemp(suffix=".avi")
+        os.close(fd)
+        return VideoWriterSink(path, fps=fps, fourcc="MJPG"), path
+    return NullSink(), None
+
+
+def open_clip(args, size):
+    """Sumber frame pada resolusi uji (sintetis langsung di-resize)."""
+    if args.source == "synthetic":
+        return open_source("synthetic", pacing="fast", frames=args.frames, size=size)
+    return open_source(args.source, pacing="fast", loop=True)
+
+
+# ===========================================================
+#   TAHAP TERPISAH
+# ===========================================================
+def bench_stages(args, size, emoji_images):
+    """
+    Menjalankan tiap tahap pipeline per frame dan mencatat latency-nya.
+
+    Returns:
+        dict: Ringkasan per tahap, total per frame, dan FPS.
+    """
+    cap = open_clip(args, size)
+    sink, tmp_path = open_output(args.output, size, cap.get(cv2.CAP_PROP_FPS) or 30.0)
+
+    if args.detector == "haar":
+        cascade = load_face_cascade()
+        detect = lambda gray: list(cascade.detectMultiScale(gray, 1.3, 5))
+    else:
+        tracker = FaceTracker()
+        detect = tracker.update
+
+    analysis = AnalysisFrame(args.analysis_width)
+    timings = {stage: [] for stage in STAGES}
+    totals = []
+    round_emojis = get_random_emojis(3)
+    detected = None
+    resized = np.empty((size[1], size[0], 3), np.uint8)
+
+    def timed(stage, fn, *fn_args):
+        t0 = time.perf_counter()
+        out = fn(*fn_args)
+        timings[stage].append((time.perf_counter() - t0) * 1000)
+        return out
+
+    def capture():
+        ret, frame = cap.read()
+        if ret and (frame.shape[1], frame.shape[0]) != size:
+            cv2.resize(frame, size, dst=resized, interpolation=cv2.INTER_AREA)
+            frame = resized
+        return ret, frame
+
+    try:
+        for i in range(args.frames):
+            t_frame = time.perf_counter()
+
+            ret, frame = timed("capture", capture)
+            if not ret:
+                timings["capture"].pop()
+                break
+
+            gray = timed("gray", analysis.gray, frame)
+            faces = analysis.to_display(timed("detect", detect, gray))
+            face_box = tuple(faces[0]) if len(faces) else None
+
+            if i % args.infer_every == 0:
+                scores = timed("emotion", get_emotion_scores, frame, False, face_box)
+                detected = dominant_emotion(scores)
+
+            timed("emojis", draw_floating_emojis, frame, round_emojis, emoji_images,
+                  face_box, 100, set(), 0)
+            timed("current", draw_current_emotion, frame, detected, emoji_images)
+            timed("hud", draw_simple_hud, frame, 1, 0, 30)
+
+            def output():
+                sink.write(frame)
+                sink.poll_key()
+            timed("output", output)
+
+            totals.append((time.perf_counter() - t_frame) * 1000)
+    finally:
+        sink.close()
+        cap.release()
+        if tmp_path:
+            os.remove(tmp_path)
+
+    total_s = sum(totals) / 1000
+    return {
+        "frames": len(totals),
+        "fps": len(totals) / total_s if total_s else 0.0,
+        "frame": summarize(totals),
+        "stages": {stage: summarize(samples) for stage, samples in timings.items()},
+    }
+
+
+# ===========================================================
+#   SELURUH run_game (HEADLESS)
+# ===========================================================
+def bench_run_game(args, size):
+    """Throughput run_game penuh (headless, NullSink, inferensi sinkron)."""
+    cap = open_clip(args, size)
+    sink = NullSink()
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    t0 = time.perf_counter()
+    # Durasi game = panjang klip (+1 s karena sisa waktu dibulatkan ke bawah)
+    run_game(cap, inference_policy="sync", infer_every=args.infer_every,
+             sink=sink, clock=make_clock(cap, "source"),
+             game_duration=args.frames / fps + 1, audio=False,
+             analysis_width=args.analysis_width)
+    elapsed = time.perf_counter() - t0
+    cap.release()
+    return {
+        "frames": sink.frames_written,
+        "fps": sink.frames_written / elapsed if elapsed else 0.0,
+    }
+
+
+# ===========================================================
+#   LAPORAN
+# ===========================================================
+def print_report(name, size, result):
+    print(f"\n== {name} ({size[0]}x{size[1]}) ==")
+    print(f"{'stage':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    rows = list(result["stages"].items()) + [("frame", result["frame"])]
+    for stage, s in rows:
+        if s:
+            print(f"{stage:>10} {s['p50']:>8.2f} {s['p95']:>8.2f} "
+                  f"{s['p99']:>8.2f} {s['mean']:>8.2f}")
+    print(f"stages FPS   : {result['fps']:.1f} ({result['frames']} frames)")
+    if "run_game" in result:
+        print(f"run_game FPS : {result['run_game']['fps']:.1f}")
+    if result["peak_rss_mb"] is not None:
+        print(f"peak RSS     : {result['peak_rss_mb']:.0f} MB")
+
+
+def print_compare(old, new):
+    """Selisih p50 per tahap dan FPS terhadap hasil JSON lama."""
+    print(f"\n== compare {old.get('commit')} → {new.get('commit')} ==")
+    for name, res in new["results"].items():
+        base = old.get("results", {}).get(name)
+        if not base:
+            continue
+        print(f"{name}: fps {base['fps']:.1f} → {res['fps']:.1f}")
+        for stage, s in res["stages"].items():
+            b = base["stages"].get(stage)
+            if s and b:
+                delta = (s["p50"] - b["p50"]) / b["p50"] * 100 if b["p50"] else 0.0
+                print(f"  {stage:>10} p50 {b['p50']:>7.2f} → {s['p50']:>7.2f} ms ({delta:+.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="synthetic",
+                        help="synthetic, file video, atau folder gambar")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS),
+                        default=list(RESOLUTIONS))
+    parser.add_argument("--detector", choices=("tracker", "haar"), default="tracker")
+    parser.add_argument("--infer-every", type=int, default=1)
+    parser.add_argument("--analysis-width", type=int, default=DEFAULT_ANALYSIS_WIDTH,
+                        help="lebar frame analisis (0 = resolusi penuh)")
+    parser.add_argument("--output", choices=("encode", "window", "null"), default="encode")
+    parser.add_argument("--skip-run-game", action="store_true",
+                        help="jangan ukur run_game penuh")
+    parser.add_argument("--json", default="bench_pipeline.json")
+    parser.add_argument("--compare", default=None, help="JSON hasil lama")
+    args = parser.parse_args()
+    args.infer_every = max(1, args.infer_every)
+
+    load_emotion_model()
+    emoji_images = load_emoji_images("assets")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "source": args.source,
+        "detector": args.detector,
+        "output": args.output,
+        "infer_every": args.infer_every,
+        "analysis_width": args.analysis_width,
+        "results": {},
+    }
+
+    # Resolusi kecil dulu: peak RSS bersifat kumulatif per proses
+    for name in sorted(args.resolutions, key=lambda n: RESOLUTIONS[n][1]):
+        size = RESOLUTIONS[name]
+        result = bench_stages(args, size, emoji_images)
+        if not args.skip_run_game:
+            result["run_game"] = bench_run_game(args, size)
+        result["width"], result["height"] = size
+        result["peak_rss_mb"] = peak_rss_mb()
+        report["results"][name] = result
+        print_report(name, size, result)
+
+    with open(args.json, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nJSON: {args.json}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# bench_sprite_blit.py
+"""
+Micro-benchmark biaya blit satu emoji pada ukuran 60, 100, dan 200 px.
+
+- legacy : cv2.resize tiap frame + overlay_image_alpha lama (float64)
+- cached : get_sprite (cache) + blit_sprite (blend integer in-place)
+
+Contoh:
+    python bench_sprite_blit.py --repeat 2000
+"""
+import argparse
+import time
+
+import numpy as np
+import cv2
+from emoji_overlay import load_emoji_images, get_sprite
+from alpha_blend import blit_sprite
+from bench_alpha_blend import legacy_overlay_image_alpha
+
+SIZES = (60, 100, 200)
+
+
+def bench(fn, repeat):
+    """Rata-rata waktu fn() dalam mikrodetik."""
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) * 1e6 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emotion", default="happy")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    images = load_emoji_images("assets", sprite_sizes=SIZES)
+    img = images[args.emotion]
+    frame = np.full((480, 640, 3), 90, dtype=np.uint8)
+    pos = (200, 150)
+
+    print(f"{'size':>5} {'legacy us':>10} {'cached us':>10} {'speedup':>8} {'max diff':>9}")
+
+    for size in SIZES:
+        def legacy():
+            resized = cv2.resize(img, (size, size), interpolation=cv2.INTER_AREA)
+            legacy_overlay_image_alpha(frame, resized[:, :, :3], pos, resized[:, :, 3])
+
+        def cached():
+            blit_sprite(frame, get_sprite(images, args.emotion, size), pos)
+
+        legacy_us = bench(legacy, args.repeat)
+        cached_us = bench(cached, args.repeat)
+
+        # Selisih hasil kedua metode pada background yang sama
+        a = np.full_like(frame, 90)
+        b = a.copy()
+        resized = cv2.resize(img, (size, size), interpolation=cv2.INTER_AREA)
+        legacy_overlay_image_alpha(a, resized[:, :, :3], pos, resized[:, :, 3])
+        blit_sprite(b, get_sprite(images, args.emotion, size), pos)
+        diff = int(np.abs(a.astype(int) - b.astype(int)).max())
+
+        print(f"{size:>5} {legacy_us:>10.1f} {cached_us:>10.1f} "
+              f"{legacy_us / cached_us:>7.1f}x {diff:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import threading
+import time
+
+import cv2
+from profiling import profiler
+
+
+def negotiate_capture_size(cap, size):
+    """
+    Meminta resolusi capture tertentu ke kamera.
+
+    Kamera bebas memilih resolusi terdekat yang didukung, jadi ukuran
+    sebenarnya dibaca kembali setelah diminta. Webcam resolusi tinggi
+    sebaiknya diminta lebih kecil agar capture dan decode tidak
+    memperlambat setiap frame.
+
+    Parameters:
+        cap (cv2.VideoCapture): Kamera yang sudah dibuka.
+        size (tuple[int, int]): Resolusi yang diminta (w, h).
+
+    Returns:
+        tuple[int, int]: Resolusi yang benar-benar dipakai kamera (w, h).
+    """
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+    actual = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+              int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    print(f"[camera] requested {size[0]}x{size[1]}, got {actual[0]}x{actual[1]}")
+    return actual
+
+
+# Read gagal berturut-turut sebelum kamera dianggap terputus, dan batas
+# jeda retry (total ~10 detik sebelum menyerah)
+MAX_READ_FAILURES = 30
+RETRY_DELAY_MAX = 0.5
+
+
+# ===========================================================
+#   CAPTURE KAMERA DI THREAD TERPISAH (RING BUFFER)
+# ===========================================================
+class ThreadedCapture:
+    """
+    Membungkus cv2.VideoCapture agar frame dibaca di thread sendiri.
+
+    Thread capture menulis ke ring kecil berisi buffer yang dialokasikan
+    sekali, lalu melakukan mirror (flip) in-place. Konsumen memanggil
+    read() dan menerima buffer frame terbaru tanpa disalin; buffer itu
+    tidak akan ditimpa sampai konsumen memanggil read() berikutnya.
+
+    Interface read()/release()/isOpened()/get()/set() sama dengan
+    cv2.VideoCapture, sehingga bisa dipakai langsung oleh semua layar.
+
+    Parameters:
+        cap (cv2.VideoCapture): Kamera yang sudah dibuka.
+        flip (bool): Mirror horizontal setiap frame.
+        buffers (int): Jumlah buffer di ring (minimal 3).
+        timeout (float): Batas waktu read() menunggu frame baru (detik).
+        max_failures (int): Jumlah read gagal berturut-turut sebelum
+            capture dianggap berhenti (glitch USB/driver di-retry).
+        retry_delay (float): Jeda awal retry setelah read gagal (detik);
+            naik linear per kegagalan, maksimal RETRY_DELAY_MAX.
+    """
+
+    def __init__(self, cap, flip=True, buffers=3, timeout=1.0,
+                 max_failures=MAX_READ_FAILURES, retry_delay=0.05):
+        self.cap = cap
+        self.flip = flip
+        self.timeout = timeout
+        self.max_failures = max(1, max_failures)
+        self.retry_delay = retry_delay
+
+        self._ring = [None] * max(3, buffers)
+        self._stamps = [0.0] * len(self._ring)
+        self._latest = None        # index buffer frame terbaru
+        self._held = None          # index buffer yang sedang dipakai konsumen
+        self._seq = 0              # nomor urut frame terbaru
+        self._consumed = 0         # nomor urut frame terakhir yang dibaca
+
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._max_fps = None       # batas frame yang di-decode (mode idle)
+        self._base_timeout = timeout
+
+        # Statistik
+        self.fps = 0.0
+        self.frames_captured = 0
+        self.read_failures = 0        # total read gagal (termasuk yang pulih)
+        self.frame_timestamp = None   # timestamp frame yang sedang dipegang
+
+    # -----------------------------------------------------------
+    #   Lifecycle
+    # -----------------------------------------------------------
+    def start(self):
+        """
+        Menjalankan thread capture.
+
+        Returns:
+            ThreadedCapture: self, agar bisa dipakai berantai.
+        """
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._run, name="ThreadedCapture", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Menghentikan thread capture (kamera tidak di-release)."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(self.timeout + 1.0)
+            self._thread = None
+
+    def release(self):
+        """Menghentikan thread lalu me-release kamera."""
+        self.stop()
+        self.cap.release()
+
+    # -----------------------------------------------------------
+    #   Interface mirip cv2.VideoCapture
+    # -----------------------------------------------------------
+    def read(self):
+        """
+        Mengambil frame terbaru (menunggu jika belum ada frame baru).
+
+        Returns:
+            tuple[bool, numpy.ndarray|None]: (ret, frame). Frame adalah
+            buffer ring (bukan salinan) dan valid sampai read() berikutnya.
+            ret False bisa berarti timeout (kamera sedang retry) atau
+            capture berhenti; bedakan dengan properti stopped.
+        """
+        with self._cond:
+            deadline = time.monotonic() + self.timeout
+            while self._running and self._seq <= self._consumed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False, None
+                self._cond.wait(remaining)
+
+            if self._latest is None or self._seq <= self._consumed:
+                return False, None
+
+            self._held = self._latest
+            self._consumed = self._seq
+            self.frame_timestamp = self._stamps[self._held]
+            return True, self._ring[self._held]
+
+    @property
+    def stopped(self):
+        """True jika thread capture sudah berhenti (sumber habis/terputus)."""
+        return not self._running
+
+    def limit_fps(self, fps):
+        """
+        Membatasi jumlah frame yang di-decode per detik (mode idle).
+
+        Frame di luar batas hanya di-grab: buffer driver tetap dikuras
+        (frame tidak basi) tanpa biaya decode dan mirror. None → semua
+        frame di-decode lagi mulai frame berikutnya. Selama dibatasi,
+        timeout read() minimal dua periode decode agar FPS idle < 1
+        tidak dianggap kamera berhenti.
+
+        Parameters:
+            fps (float|None): Batas FPS decode, atau None.
+        """
+        self._max_fps = fps
+        self.timeout = max(self._base_timeout, 2.0 / fps) if fps else self._base_timeout
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    # -----------------------------------------------------------
+    #   Thread capture
+    # -----------------------------------------------------------
+    def _free_slot(self):
+        """Index buffer yang bukan frame terbaru dan tidak sedang dipegang."""
+        for i in range(len(self._ring)):
+            if i != self._latest and i != self._held:
+                return i
+
+    def _end_of_stream(self):
+        """True jika sumber punya jumlah frame dan posisinya sudah di akhir."""
+        total = self.cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        return total > 0 and self.cap.get(cv2.CAP_PROP_POS_FRAMES) >= total
+
+    def _run(self):
+        last_time = None
+        last_decode = 0.0
+        failures = 0               # read gagal berturut-turut
+
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                slot = self._free_slot()
+
+            # Mode idle: frame di antara jadwal decode hanya di-grab
+            max_fps = self._max_fps
+            if max_fps and time.monotonic() - last_decode < 1.0 / max_fps:
+                with profiler.span("camera.grab"):
+                    ret = self.cap.grab()
+                if ret:
+                    continue
+            else:
+                last_decode = time.monotonic()
+                buf = self._ring[slot]
+                with profiler.span("camera.read"):
+                    ret, frame = self.cap.read(buf) if buf is not None else self.cap.read()
+
+            if not ret:
+                failures += 1
+                self.read_failures += 1
+                if failures < self.max_failures and not self._end_of_stream():
+                    # Glitch sesaat (USB, timeout driver) → coba lagi
+                    time.sleep(min(self.retry_delay * failures, RETRY_DELAY_MAX))
+                    continue
+
+                # Kamera/video habis → bangunkan konsumen
+                print(f"[camera] capture berhenti setelah {failures} read gagal")
+                with self._cond:
+                    self._running = False
+                    self._cond.notify_all()
+                return
+            failures = 0
+
+            # Mirror in-place (tanpa alokasi frame baru)
+            if self.flip:
+                cv2.flip(frame, 1, dst=frame)
+
+            now = time.time()
+            if last_time is not None and now > last_time:
+                instant = 1.0 / (now - last_time)
+                self.fps = instant if self.fps == 0 else 0.9 * self.fps + 0.1 * instant
+            last_time = now
+
+            with self._cond:
+                self._ring[slot] = frame   # buffer baru jika ukuran berubah
+                self._stamps[slot] = now
+                self._latest = slot
+                self._seq += 1
+                self.frames_captured += 1
+                self._cond.notify_all()
@@ -0,0 +1,225 @@
+# compare_emotion_backends.py
+"""
+Perbandingan akurasi & latency backend emosi (DeepFace vs ONNX) pada
+kumpulan crop wajah yang tetap.
+
+Crop dibaca dari folder --crops. Jika crop disimpan di subfolder
+bernama label (mis. crops/happy/001.png, label sama dengan emoji_map /
+EMOTION_LABELS), akurasi tiap backend ikut dihitung; crop tanpa label
+hanya dipakai untuk kesesuaian (agreement) terhadap DeepFace.
+
+Setiap backend dijalankan di proses baru, sehingga waktu load (termasuk
+import TensorFlow/onnxruntime) dan peak RSS terukur terpisah. Latency
+diukur per crop (satu forward pass) dan per batch (--batch crop).
+
+Membuat set crop tetap dari video/folder/sintetis (Haar + crop_face):
+    python compare_emotion_backends.py --extract rekaman.mp4 --crops crops/
+
+Mengekspor model Emotion DeepFace ke ONNX (butuh tf2onnx):
+    python compare_emotion_backends.py --export assets/models/emotion.onnx
+
+Contoh:
+    python compare_emotion_backends.py --crops crops/
+    python compare_emotion_backends.py --crops crops/ --model emotion-ferplus-8.onnx --preset ferplus
+"""
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+
+import cv2
+import numpy as np
+
+from emotion_backends import EMOTION_LABELS, LABEL_ALIASES, ONNX_PRESETS, DEFAULT_ONNX_MODEL
+from frame_source import IMAGE_EXTENSIONS
+
+# ukuran crop yang disimpan --extract (tiap backend me-resize ke inputnya)
+CROP_SIZE = (96, 96)
+
+
+# ===========================================================
+#   SET CROP WAJAH
+# ===========================================================
+def load_crops(folder):
+    """
+    Membaca crop wajah dari folder (label = nama subfolder, jika valid).
+
+    Returns:
+        tuple[list[str], list[str|None]]: Path crop dan label ground truth.
+    """
+    paths, labels = [], []
+    for path in sorted(glob.glob(os.path.join(folder, "**", "*"), recursive=True)):
+        if os.path.splitext(path)[1].lower() not in IMAGE_EXTENSIONS:
+            continue
+        parent = os.path.basename(os.path.dirname(path)).lower()
+        parent = LABEL_ALIASES.get(parent, parent)
+        paths.append(path)
+        labels.append(parent if parent in EMOTION_LABELS else None)
+    return paths, labels
+
+
+def extract_crops(spec, folder, every=5, limit=200):
+    """
+    Menyimpan crop wajah (Haar) dari sebuah sumber frame ke folder.
+
+    Parameters:
+        spec (str): Sumber frame (video, folder gambar, synthetic[:glob]).
+        folder (str): Folder output.
+        every (int): Hanya proses setiap frame ke-k.
+        limit (int): Jumlah crop maksimum.
+
+    Returns:
+        int: Jumlah crop yang disimpan.
+    """
+    from emotion_utils import crop_face
+    from face_tracker import load_face_cascade
+    from frame_source import open_source
+
+    os.makedirs(folder, exist_ok=True)
+    cascade = load_face_cascade()
+    cap = open_source(spec, pacing="fast", mirror=False)
+    saved = index = 0
+    try:
+        while saved < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            index += 1
+            if index % every:
+                continue
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            for box in cascade.detectMultiScale(gray, 1.3, 5):
+                crop = crop_face(frame, box, size=CROP_SIZE)
+                if crop is not None and saved < limit:
+                    cv2.imwrite(os.path.join(folder, f"crop_{saved:05d}.png"), crop)
+                    saved += 1
+    finally:
+        cap.release()
+    return saved
+
+
+def export_deepface_onnx(path):
+    """Mengekspor model Emotion DeepFace (Keras) ke ONNX dengan tf2onnx."""
+    try:
+        import tensorflow as tf
+        import tf2onnx
+    except ImportError:
+        raise SystemExit("Ekspor butuh tensorflow dan tf2onnx (pip install tf2onnx)")
+    from emotion_backends import DeepFaceBackend
+
+    model = DeepFaceBackend().load().model.model
+    spec = (tf.TensorSpec((None, 48, 48, 1), tf.float32, name="face"),)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tf2onnx.convert.from_keras(model, input_signature=spec, output_path=path)
+    print(f"ONNX: {path}")
+
+
+# ===========================================================
+#   EVALUASI SATU BACKEND (DI PROSES BARU)
+# ===========================================================
+def evaluate_backend(name, model_path, preset, paths, batch, repeats):
+    """
+    Load backend, lalu ukur latency dan prediksi pada semua crop.
+
+    Returns:
+        dict: load_ms, latency per crop & per batch, prediksi, peak RSS.
+    """
+    from emotion_backends import create_backend
+    from profiling import peak_rss_mb
+
+    crops = [cv2.imread(p) for p in paths]
+
+    t0 = time.perf_counter()
+    backend = create_backend(name, model_path, preset).load()
+    load_ms = (time.perf_counter() - t0) * 1000
+
+    # Forward pass pertama (alokasi/graph) tidak ikut diukur
+    backend.predict(crops[:1])
+
+    single_ms, preds = [], []
+    for crop in crops:
+        t0 = time.perf_counter()
+        probs = backend.predict([crop])[0]
+        single_ms.append((time.perf_counter() - t0) * 1000)
+        preds.append(EMOTION_LABELS[int(np.argmax(probs))])
+
+    batch_ms = []
+    chunk = crops[:batch]
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        backend.predict(chunk)
+        batch_ms.append((time.perf_counter() - t0) * 1000 / len(chunk))
+
+    return {
+        "name": backend.describe(),
+        "load_ms": load_ms,
+        "single_p50": float(np.percentile(single_ms, 50)),
+        "single_p95": float(np.percentile(single_ms, 95)),
+        "batch_ms_per_face": float(np.median(batch_ms)),
+        "preds": preds,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crops", default="crops", help="folder crop wajah")
+    parser.add_argument("--model", default=DEFAULT_ONNX_MODEL, help="model .onnx")
+    parser.add_argument("--preset", choices=list(ONNX_PRESETS), default="deepface")
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--skip-deepface", action="store_true",
+                        help="hanya ukur backend ONNX")
+    parser.add_argument("--extract", default=None, metavar="SOURCE",
+                        help="buat set crop dari sumber ini ke --crops lalu keluar")
+    parser.add_argument("--every", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--export", default=None, metavar="ONNX_PATH",
+                        help="ekspor model Emotion DeepFace ke ONNX lalu keluar")
+    args = parser.parse_args()
+
+    if args.export:
+        export_deepface_onnx(args.export)
+        return
+    if args.extract:
+        n = extract_crops(args.extract, args.crops, max(1, args.every), args.limit)
+        print(f"{n} crop disimpan di {args.crops}")
+        return
+
+    paths, truth = load_crops(args.crops)
+    if not paths:
+        raise SystemExit(f"Tidak ada crop di {args.crops} (buat dengan --extract)")
+    labeled = sum(t is not None for t in truth)
+    print(f"crops: {len(paths)} ({labeled} berlabel)  batch: {args.batch}")
+
+    configs = [] if args.skip_deepface else [("deepface", None, None)]
+    configs.append(("onnx", args.model, args.preset))
+
+    results = []
+    for name, model_path, preset in configs:
+        # Proses baru per backend: waktu import & RSS tidak saling tercampur
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+            results.append(pool.submit(evaluate_backend, name, model_path, preset,
+                                       paths, args.batch, args.repeats).result())
+
+    reference = None if args.skip_deepface else results[0]["preds"]
+    print(f"\n{'backend':>40} {'load ms':>8} {'p50 ms':>7} {'p95 ms':>7} "
+          f"{'batch/face':>10} {'acc':>6} {'agree':>6} {'RSS MB':>7}")
+    for r in results:
+        acc = agree = "-"
+        if labeled:
+            hits = sum(p == t for p, t in zip(r["preds"], truth) if t is not None)
+            acc = f"{hits / labeled:.0%}"
+        if reference is not None:
+            agree = f"{sum(p == q for p, q in zip(r['preds'], reference)) / len(paths):.0%}"
+        rss = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "-"
+        print(f"{r['name']:>40} {r['load_ms']:>8.0f} {r['single_p50']:>7.2f} "
+              f"{r['single_p95']:>7.2f} {r['batch_ms_per_face']:>10.2f} "
+              f"{acc:>6} {agree:>6} {rss:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,22 @@
 # emoji_demo.py
+import argparse
+
 import cv2
 from emoji_overlay import load_emoji_images
 from gui_helpers import draw_floating_emojis
 from emotion_utils import emoji_map
+from face_tracker import FaceTracker
+from analysis_frame import AnalysisFrame, DEFAULT_ANALYSIS_WIDTH
+from frame_source import add_source_arguments, open_source_from_args
+
+parser = argparse.ArgumentParser(description="Emoji demo")
+add_source_arguments(parser)
+parser.add_argument("--analysis-width", type=int, default=DEFAULT_ANALYSIS_WIDTH)
+args = parser.parse_args()
 
-cap = cv2.VideoCapture(0)
-face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+cap = open_source_from_args(args)  # frame sudah di-mirror
+tracker = FaceTracker()
+analysis = AnalysisFrame(args.analysis_width)
 emoji_images = load_emoji_images("assets")
 demo_emojis = list(emoji_map.keys())[:3]
 
@@ -14,11 +25,10 @@ while True:
     ret, frame = cap.read()
     if not ret:
         break
-    frame = cv2.flip(frame, 1)
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    gray = analysis.gray(frame)
 
-    # --- DETECT FACES ---
-    faces = face_cascade.detectMultiScale(gray, 1.3, 5)
+    # --- DETECT / TRACK FACES ---
+    faces = analysis.to_display(tracker.update(gray))
 
     # --- visualisasi haarcascades ---
     for (x, y, w, h) in faces:
@@ -31,7 +41,7 @@ while True:
         )
 
     # Pick the first face for emoji "anchor"
-    face_box = tuple(faces[0]) if len(faces) else None
+    face_box = faces[0] if faces else None
 
     # --- DRAW EMOJIS ---
     draw_floating_emojis(frame, demo_emojis, emoji_images, face_box=face_box, size=100)
@@ -47,3 +57,8 @@ while True:
 
 cap.release()
 cv2.destroyAllWindows()
+
+stats = tracker.stats()
+print(f"Face detection: {stats['detect_ms_per_frame']:.2f} ms/frame, "
+      f"tracking: {stats['track_ms_per_frame']:.2f} ms/frame "
+      f"({stats['detections']} full detections in {stats['frames']} frames)")
@@ -1,10 +1,18 @@
 import os
+
 import cv2
+from alpha_blend import make_sprite, blend_alpha
+
+# Cache sprite dengan key (emotion, size)
+_sprite_cache = {}
+
+# Ukuran sprite yang dipakai UI (floating emoji & current emotion)
+DEFAULT_SPRITE_SIZES = (60, 100)
 
 # ===========================================================
 #   LOAD EMOJI PNG/WEBP KE DALAM DICTIONARY
 # ===========================================================
-def load_emoji_images(folder_path="assets"):
+def load_emoji_images(folder_path="assets", sprite_sizes=DEFAULT_SPRITE_SIZES):
     """
     Memuat semua file gambar emoji dari folder ke dalam dictionary.
 
@@ -12,9 +20,15 @@ def load_emoji_images(folder_path="assets"):
     Nama file dijadikan key dalam dictionary (tanpa ekstensi),
     misalnya: "happy.png" -> key "happy".
 
+    Sekaligus membangun cache sprite (resize + pre-multiplied alpha)
+    untuk setiap ukuran di sprite_sizes, sehingga render loop tidak
+    perlu resize/konversi lagi.
+
     Parameters:
         folder_path (str):
             Path folder tempat file emoji disimpan.
+        sprite_sizes (tuple[int]):
+            Ukuran sprite (px) yang dibangun di awal.
 
     Returns:
         dict[str, numpy.ndarray]:
@@ -43,19 +57,53 @@ def load_emoji_images(folder_path="assets"):
 
         images[name] = img
 
+        # Bangun sprite siap pakai untuk ukuran yang dipakai UI
+        for size in sprite_sizes:
+            get_sprite(images, name, size)
+
     return images
 
 
 # ===========================================================
-#   OVERLAY GAMBAR DENGAN ALPHA BLENDING MANUAL
+#   SPRITE CACHE (RESIZE + PRE-MULTIPLIED ALPHA SEKALI SAJA)
+# ===========================================================
+def get_sprite(emoji_images, emotion, size):
+    """
+    Mengambil sprite dari cache (dibangun sekali per (emotion, size)).
+
+    Parameters:
+        emoji_images (dict): Hasil load_emoji_images().
+        emotion (str): Nama emosi.
+        size (int): Sisi sprite (px).
+
+    Returns:
+        Sprite|None: Sprite, atau None jika emoji tidak ada.
+    """
+    img = emoji_images.get(emotion)
+    if img is None:
+        return None
+
+    key = (emotion, size)
+    sprite = _sprite_cache.get(key)
+    if sprite is None or sprite.source is not img:
+        sprite = make_sprite(img, size)
+        _sprite_cache[key] = sprite
+    return sprite
+
+
+# ===========================================================
+#   OVERLAY GAMBAR DENGAN ALPHA BLENDING
 # ===========================================================
 def overlay_image_alpha(img, img_overlay, pos, alpha_mask):
     """
     Menempelkan gambar overlay (dengan alpha mask) ke frame utama.
 
-    Proses ini menggunakan alpha blending manual:
+    Formula alpha blending:
         output = (1 - alpha) * background + alpha * overlay
 
+    Dikerjakan oleh alpha_blend.blend_alpha (integer, semua channel
+    sekaligus, clipping di keempat sisi termasuk posisi negatif).
+
     Parameters:
         img (numpy.ndarray):
             Frame utama (background) tempat gambar ditempel.
@@ -70,37 +118,4 @@ def overlay_image_alpha(img, img_overlay, pos, alpha_mask):
         None
         (Modifies img directly)
     """
-
-    x, y = pos
-    h, w = img_overlay.shape[:2]
-
-    # Jika titik awal sudah di luar frame → tidak perlu overlay
-    if x >= img.shape[1] or y >= img.shape[0]:
-        return
-
-    # Jika overlay melebihi batas kanan frame → potong lebar
-    if x + w > img.shape[1]:
-        w = img.shape[1] - x
-        img_overlay = img_overlay[:, :w]
-        alpha_mask = alpha_mask[:, :w]
-
-    # Jika overlay melebihi batas bawah frame → potong tinggi
-    if y + h > img.shape[0]:
-        h = img.shape[0] - y
-        img_overlay = img_overlay[:h]
-        alpha_mask = alpha_mask[:h]
-
-    # Region tempat overlay ditempel
-    roi = img[y:y+h, x:x+w].astype(float)
-
-    # Pisahkan pixel overlay
-    overlay = img_overlay[..., :3].astype(float)
-
-    # Normalisasi alpha mask ke 0–1 dan expand dims
-    alpha = (alpha_mask / 255.0)[..., None]
-
-    # Formula alpha blending:
-    comp = (1.0 - alpha) * roi + alpha * overlay
-
-    # Replace region dengan hasil blending
-    img[y:y+h, x:x+w] = comp.astype(img.dtype)
\ No newline at end of file
+    blend_alpha(img, img_overlay, pos, alpha_mask)
@@ -0,0 +1,301 @@
+import os
+
+import cv2
+import numpy as np
+
+# urutan kelas output model Emotion milik DeepFace (label yang dipakai game)
+EMOTION_LABELS = ["angry", "disgust", "fear", "happy", "sad", "surprise", "neutral"]
+
+# ukuran input model emosi DeepFace (grayscale 48x48)
+EMOTION_INPUT_SIZE = (48, 48)
+
+# detector yang dipakai DeepFace untuk jalur full-frame
+DETECTOR_BACKEND = "opencv"
+
+# Pilihan backend klasifikasi emosi:
+# - "deepface" → model Emotion DeepFace (TensorFlow/Keras)
+# - "onnx"     → model emosi hasil ekspor ONNX via cv2.dnn / onnxruntime
+EMOTION_BACKENDS = ("deepface", "onnx")
+
+# env var agar proses inferensi terpisah memakai backend yang sama
+BACKEND_ENV = "MIMIC_EMOTION_BACKEND"
+MODEL_ENV = "MIMIC_EMOTION_MODEL"
+PRESET_ENV = "MIMIC_EMOTION_PRESET"
+
+DEFAULT_ONNX_MODEL = "assets/models/emotion.onnx"
+
+# Preprocessing per jenis model ONNX:
+# - "deepface": ekspor model Emotion DeepFace (tf2onnx), NHWC 48x48, piksel/255,
+#               output softmax dengan urutan EMOTION_LABELS
+# - "ferplus"  : emotion-ferplus dari ONNX Model Zoo, NCHW 64x64, piksel 0..255,
+#               output logit 8 kelas (softmax dihitung di sini)
+ONNX_PRESETS = {
+    "deepface": {
+        "size": EMOTION_INPUT_SIZE,
+        "scale": 1 / 255.0,
+        "layout": "nhwc",
+        "softmax": False,
+        "labels": EMOTION_LABELS,
+    },
+    "ferplus": {
+        "size": (64, 64),
+        "scale": 1.0,
+        "layout": "nchw",
+        "softmax": True,
+        "labels": ["neutral", "happiness", "surprise", "sadness",
+                   "anger", "disgust", "fear", "contempt"],
+    },
+}
+
+# nama kelas model lain → label game (kelas tanpa padanan dibuang)
+LABEL_ALIASES = {"happiness": "happy", "sadness": "sad", "anger": "angry"}
+
+
+def _no_progress(stage, progress):
+    pass
+
+
+def _gray_batch(faces, size):
+    """Stack crop wajah BGR menjadi array grayscale (N, h, w) float32."""
+    gray = []
+    for face in faces:
+        g = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY) if face.ndim == 3 else face
+        if (g.shape[1], g.shape[0]) != tuple(size):
+            g = cv2.resize(g, tuple(size), interpolation=cv2.INTER_AREA)
+        gray.append(g)
+    return np.stack(gray).astype(np.float32)
+
+
+_cascade = None
+
+
+def _largest_face(frame):
+    """Box (x, y, w, h) wajah terbesar menurut Haar cascade, atau None."""
+    from face_tracker import load_face_cascade
+
+    global _cascade
+    if _cascade is None:
+        _cascade = load_face_cascade()
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    faces = _cascade.detectMultiScale(gray, 1.3, 5)
+    if len(faces) == 0:
+        return None
+    return max(faces, key=lambda f: f[2] * f[3])
+
+
+# ===========================================================
+#   BACKEND DEEPFACE (TENSORFLOW)
+# ===========================================================
+class DeepFaceBackend:
+    """
+    Klasifikasi emosi dengan model Emotion DeepFace.
+
+    deepface (dan TensorFlow) baru di-import saat load(), sehingga
+    backend lain tidak ikut menanggung waktu start dan memorinya.
+
+    Parameters:
+        detector_backend (str): Detector DeepFace untuk jalur full-frame.
+    """
+
+    name = "deepface"
+    input_size = EMOTION_INPUT_SIZE
+
+    def __init__(self, detector_backend=DETECTOR_BACKEND):
+        self.detector_backend = detector_backend
+        self.model = None
+        self._deepface = None
+
+    def describe(self):
+        return f"emotion model + {self.detector_backend} detector"
+
+    def load(self, progress=_no_progress):
+        """
+        Build model emosi dan detector DeepFace (cache milik DeepFace).
+
+        Parameters:
+            progress (callable): progress(stage, 0..1) dipanggil per tahap.
+        """
+        progress("importing deepface", 0.05)
+        from deepface import DeepFace
+
+        self._deepface = DeepFace
+        progress("building emotion model", 0.5)
+        self.model = DeepFace.build_model(model_name="Emotion", task="facial_attribute")
+        progress("building face detector", 0.75)
+        DeepFace.build_model(model_name=self.detector_backend, task="face_detector")
+        return self
+
+    def predict(self, faces):
+        """
+        Menjalankan model sekali untuk sekumpulan crop wajah.
+
+        Parameters:
+            faces (list[numpy.ndarray]): Crop wajah BGR seukuran input_size.
+
+        Returns:
+            numpy.ndarray: Probabilitas (N, 7) dengan urutan EMOTION_LABELS.
+        """
+        batch = _gray_batch(faces, self.input_size)[..., None] / 255.0
+        return np.asarray(self.model.model.predict_on_batch(batch))
+
+    def analyze(self, frame, enforce_detection=False):
+        """
+        Analisis full-frame (detector DeepFace mencari wajah sendiri).
+
+        Returns:
+            dict: {emotion: probabilitas 0..1}.
+        """
+        result = self._deepface.analyze(frame, actions=["emotion"],
+                                        detector_backend=self.detector_backend,
+                                        enforce_detection=enforce_detection)
+        # DeepFace memberi persen (0–100)
+        return {name: float(value) / 100.0 for name, value in result[0]["emotion"].items()}
+
+
+# ===========================================================
+#   BACKEND ONNX (CV2.DNN / ONNXRUNTIME, TANPA TENSORFLOW)
+# ===========================================================
+class OnnxBackend:
+    """
+    Klasifikasi emosi dengan model ONNX di CPU.
+
+    Memakai onnxruntime jika terpasang (runtime "auto"), jika tidak
+    cv2.dnn yang sudah ikut OpenCV. Output model dipetakan ke
+    EMOTION_LABELS sehingga cocok dengan emoji_map dan smoothing.
+    Jalur full-frame mencari wajah terbesar dengan Haar cascade.
+
+    Parameters:
+        model_path (str|None): Path file .onnx (default DEFAULT_ONNX_MODEL).
+        preset (str): Kunci ONNX_PRESETS sesuai jenis model.
+        runtime (str): "auto", "onnxruntime", atau "opencv".
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path=None, preset="deepface", runtime="auto"):
+        if preset not in ONNX_PRESETS:
+            raise ValueError(f"Preset ONNX tidak dikenal: {preset!r} "
+                             f"(pilihan: {', '.join(ONNX_PRESETS)})")
+        self.model_path = model_path or DEFAULT_ONNX_MODEL
+        self.preset = preset
+        self.runtime = runtime
+        self.config = ONNX_PRESETS[preset]
+        self.input_size = tuple(self.config["size"])
+        self._run = None
+        self._runtime_used = None
+
+        # Matriks pemetaan kelas model → EMOTION_LABELS
+        self._label_map = np.zeros((len(self.config["labels"]), len(EMOTION_LABELS)),
+                                   dtype=np.float32)
+        for i, label in enumerate(self.config["labels"]):
+            label = LABEL_ALIASES.get(label, label)
+            if label in EMOTION_LABELS:
+                self._label_map[i, EMOTION_LABELS.index(label)] = 1.0
+
+    def describe(self):
+        return (f"onnx {os.path.basename(self.model_path)} "
+                f"({self.preset}, {self._runtime_used or self.runtime})")
+
+    def load(self, progress=_no_progress):
+        """
+        Membuka model ONNX dengan runtime yang tersedia.
+
+        Parameters:
+            progress (callable): progress(stage, 0..1) dipanggil per tahap.
+        """
+        progress("loading onnx model", 0.3)
+        if not os.path.isfile(self.model_path):
+            raise FileNotFoundError(
+                f"Model ONNX tidak ditemukan: {self.model_path} "
+                f"(ekspor dengan compare_emotion_backends.py --export)")
+
+        if self.runtime in ("auto", "onnxruntime"):
+            try:
+                import onnxruntime as ort
+            except ImportError:
+                if self.runtime == "onnxruntime":
+                    raise
+            else:
+                session = ort.InferenceSession(self.model_path,
+                                               providers=["CPUExecutionProvider"])
+                input_name = session.get_inputs()[0].name
+                self._run = lambda blob: session.run(None, {input_name: blob})[0]
+                self._runtime_used = "onnxruntime"
+                return self
+
+        net = cv2.dnn.readNetFromONNX(self.model_path)
+
+        def run(blob):
+            net.setInput(blob)
+            return net.forward()
+
+        self._run = run
+        self._runtime_used = "opencv"
+        return self
+
+    def predict(self, faces):
+        """
+        Menjalankan model sekali untuk sekumpulan crop wajah.
+
+        Parameters:
+            faces (list[numpy.ndarray]): Crop wajah BGR (di-resize ke
+                input_size jika perlu).
+
+        Returns:
+            numpy.ndarray: Probabilitas (N, 7) dengan urutan EMOTION_LABELS.
+        """
+        batch = _gray_batch(faces, self.input_size) * self.config["scale"]
+        blob = batch[:, None] if self.config["layout"] == "nchw" else batch[..., None]
+
+        out = np.asarray(self._run(np.ascontiguousarray(blob)), dtype=np.float32)
+        out = out.reshape(len(faces), -1)
+        if self.config["softmax"]:
+            out = np.exp(out - out.max(axis=1, keepdims=True))
+            out /= out.sum(axis=1, keepdims=True)
+
+        probs = out @ self._label_map
+        total = probs.sum(axis=1, keepdims=True)
+        return probs / np.where(total > 0, total, 1.0)
+
+    def analyze(self, frame, enforce_detection=False):
+        """
+        Analisis full-frame: wajah terbesar (Haar), atau seluruh frame.
+
+        Returns:
+            dict: {emotion: probabilitas 0..1}.
+        """
+        box = _largest_face(frame)
+        if box is None:
+            if enforce_detection:
+                raise ValueError("Wajah tidak terdeteksi")
+            face = frame
+        else:
+            x, y, w, h = box
+            face = frame[y:y + h, x:x + w]
+        probs = self.predict([face])[0]
+        return dict(zip(EMOTION_LABELS, (float(v) for v in probs)))
+
+
+def create_backend(name=None, model_path=None, preset=None):
+    """
+    Membuat backend klasifikasi emosi.
+
+    Nilai None diambil dari env var (MIMIC_EMOTION_BACKEND,
+    MIMIC_EMOTION_MODEL, MIMIC_EMOTION_PRESET), default "deepface".
+
+    Parameters:
+        name (str|None): Salah satu EMOTION_BACKENDS.
+        model_path (str|None): Path model ONNX (backend "onnx").
+        preset (str|None): Preset ONNX (backend "onnx").
+
+    Returns:
+        DeepFaceBackend|OnnxBackend: Backend yang belum di-load.
+    """
+    name = name or os.environ.get(BACKEND_ENV) or "deepface"
+    if name == "deepface":
+        return DeepFaceBackend()
+    if name == "onnx":
+        return OnnxBackend(model_path or os.environ.get(MODEL_ENV),
+                           preset or os.environ.get(PRESET_ENV) or "deepface")
+    raise ValueError(f"Backend emosi tidak dikenal: {name!r} "
+                     f"(pilihan: {', '.join(EMOTION_BACKENDS)})")
@@ -0,0 +1,171 @@
+import math
+import time
+from collections import deque
+
+import numpy as np
+from emotion_utils import EMOTION_LABELS
+
+# Mode smoothing:
+# - "ema"      → rata-rata probabilitas berbobot waktu (sampel baru lebih berat)
+# - "majority" → voting label dominan di dalam window
+SMOOTHING_MODES = ("ema", "majority")
+
+
+# ===========================================================
+#   SMOOTHING + HYSTERESIS UNTUK EMOSI TERDETEKSI
+# ===========================================================
+class EmotionSmoother:
+    """
+    Menghaluskan hasil deteksi emosi dari waktu ke waktu.
+
+    Setiap sampel (probabilitas per kelas) disimpan di ring buffer.
+    Sebuah emosi baru dianggap "stabil" jika skor hasil smoothing-nya
+    >= threshold secara terus-menerus selama hold_ms. Karena smoothing
+    berbasis timestamp, sampel boleh datang tidak rutin (mis. inferensi
+    hanya tiap frame ke-k).
+
+    Parameters:
+        window (int): Jumlah sampel di ring buffer.
+        mode (str): "ema" atau "majority".
+        tau_ms (float): Konstanta waktu EMA (ms).
+        threshold (float): Skor minimum (0–1) agar emosi dianggap valid.
+        hold_ms (float): Lama emosi harus bertahan di atas threshold (ms).
+        stale_ms (float): Jika tidak ada sampel baru selama ini (ms),
+            hasil dianggap kedaluwarsa.
+    """
+
+    def __init__(self, window=8, mode="ema", tau_ms=250, threshold=0.5,
+                 hold_ms=300, stale_ms=1000):
+        if mode not in SMOOTHING_MODES:
+            raise ValueError(f"mode harus salah satu dari {SMOOTHING_MODES}")
+
+        self.mode = mode
+        self.tau = tau_ms / 1000.0
+        self.threshold = threshold
+        self.hold = hold_ms / 1000.0
+        self.stale = stale_ms / 1000.0
+
+        # Ring buffer berisi (timestamp, vektor probabilitas)
+        self._buffer = deque(maxlen=max(1, window))
+
+        # State hysteresis
+        self._candidate = None     # emosi yang sedang "ditahan"
+        self._since = None         # timestamp awal emosi di atas threshold
+
+    def reset(self):
+        """Mengosongkan buffer dan state hysteresis."""
+        self._buffer.clear()
+        self.reset_hold()
+
+    def reset_hold(self):
+        """
+        Memulai ulang hitungan hold, tanpa menghapus buffer.
+
+        Dipanggil setelah emosi stabil dipakai (mis. cocok dengan target)
+        agar emosi yang sama tidak langsung dihitung lagi.
+        """
+        self._candidate = None
+        self._since = None
+
+    def update(self, scores, timestamp=None):
+        """
+        Menambahkan satu sampel hasil inferensi.
+
+        Parameters:
+            scores (dict|None): {emotion: probability 0..1}, None jika
+                wajah tidak terdeteksi (dihitung sebagai sampel kosong).
+            timestamp (float|None): Waktu sampel (default time.time()).
+
+        Returns:
+            None
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        probs = np.zeros(len(EMOTION_LABELS), dtype=np.float32)
+        if scores:
+            for i, name in enumerate(EMOTION_LABELS):
+                probs[i] = scores.get(name, 0.0)
+
+        self._buffer.append((timestamp, probs))
+
+        # Perbarui state hysteresis berdasarkan skor smoothing terbaru
+        emotion, confidence = self.smoothed_emotion(timestamp)
+        if emotion is None or confidence < self.threshold:
+            self.reset_hold()
+        elif emotion != self._candidate:
+            self._candidate = emotion
+            self._since = timestamp
+
+    def smoothed(self, now=None):
+        """
+        Menghitung skor per kelas hasil smoothing pada waktu now.
+
+        Parameters:
+            now (float|None): Waktu evaluasi (default sampel terakhir).
+
+        Returns:
+            dict|None: {emotion: score 0..1}, None jika buffer kosong.
+        """
+        if not self._buffer:
+            return None
+
+        if now is None:
+            now = self._buffer[-1][0]
+
+        if self.mode == "ema":
+            # Bobot eksponensial berdasarkan umur sampel
+            total = np.zeros(len(EMOTION_LABELS), dtype=np.float32)
+            weight_sum = 0.0
+            for t, probs in self._buffer:
+                weight = math.exp(-max(0.0, now - t) / self.tau) if self.tau > 0 else 1.0
+                total += weight * probs
+                weight_sum += weight
+            smoothed = total / weight_sum if weight_sum > 0 else total
+        else:
+            # Voting: tiap sampel memberi 1 suara ke label dominannya
+            smoothed = np.zeros(len(EMOTION_LABELS), dtype=np.float32)
+            for _, probs in self._buffer:
+                if probs.any():
+                    smoothed[int(np.argmax(probs))] += 1
+            smoothed /= len(self._buffer)
+
+        return dict(zip(EMOTION_LABELS, (float(v) for v in smoothed)))
+
+    def smoothed_emotion(self, now=None):
+        """
+        Mengembalikan emosi dominan hasil smoothing beserta skornya.
+
+        Returns:
+            tuple[str|None, float]: (emotion, score).
+        """
+        scores = self.smoothed(now)
+        if not scores or not any(scores.values()):
+            return None, 0.0
+
+        emotion = max(scores, key=scores.get)
+        return emotion, scores[emotion]
+
+    def stable_emotion(self, now=None):
+        """
+        Mengembalikan emosi yang sudah bertahan >= hold_ms di atas threshold.
+
+        Parameters:
+            now (float|None): Waktu sekarang (default time.time()).
+
+        Returns:
+            str|None: Nama emosi stabil, atau None.
+        """
+        if now is None:
+            now = time.time()
+
+        if self._candidate is None or not self._buffer:
+            return None
+
+        # Tidak ada sampel baru terlalu lama → jangan percaya hasil lama
+        if now - self._buffer[-1][0] > self.stale:
+            return None
+
+        if now - self._since >= self.hold:
+            return self._candidate
+        return None
@@ -1,6 +1,13 @@
 # emotion_utils.py
-from deepface import DeepFace
+import os
 import random
+import threading
+import time
+import cv2
+import numpy as np
+
+from emotion_backends import (DETECTOR_BACKEND, EMOTION_INPUT_SIZE, EMOTION_LABELS,
+                              BACKEND_ENV, MODEL_ENV, PRESET_ENV, create_backend)
 
 # map emoji glyph
 emoji_map = {
@@ -12,14 +19,234 @@ emoji_map = {
     "😨": "fear"
 }
 
-def get_emotion(frame, enforce_detection=False):
-    """Return dominant emotion name or None."""
+# padding di sekitar bounding box Haar (rasio terhadap sisi box)
+FACE_CROP_PAD = 0.15
+
+def crop_face(frame, face_box, pad=FACE_CROP_PAD, size=EMOTION_INPUT_SIZE):
+    """
+    Mengambil crop persegi (dengan padding) di sekitar face_box lalu
+    me-resize ke ukuran input model.
+
+    Di tepi frame, crop digeser masuk (bukan dipotong) sehingga tetap
+    persegi dan aspect ratio wajah tidak berubah saat di-resize.
+
+    Parameters:
+        frame (numpy.ndarray): Frame BGR.
+        face_box (tuple): Bounding box wajah (x, y, w, h).
+        pad (float): Padding di tiap sisi, relatif terhadap sisi box.
+        size (tuple): Ukuran output (w, h).
+
+    Returns:
+        numpy.ndarray|None: Crop wajah, atau None jika box di luar frame.
+    """
+    x, y, w, h = [int(v) for v in face_box]
+    frame_h, frame_w = frame.shape[:2]
+    if w <= 0 or h <= 0 or x >= frame_w or y >= frame_h or x + w <= 0 or y + h <= 0:
+        return None
+
+    # sisi persegi tidak boleh melebihi frame
+    side = min(int(max(w, h) * (1 + 2 * pad)), frame_w, frame_h)
+    cx, cy = x + w // 2, y + h // 2
+
+    # geser ke dalam batas frame (tetap persegi)
+    x1 = min(max(0, cx - side // 2), frame_w - side)
+    y1 = min(max(0, cy - side // 2), frame_h - side)
+
+    return cv2.resize(frame[y1:y1 + side, x1:x1 + side], size, interpolation=cv2.INTER_AREA)
+
+# backend klasifikasi emosi aktif (lihat emotion_backends), dibuat saat pertama dipakai
+_backend = None
+_models = {}
+_model_lock = threading.Lock()
+_load_error = None      # exception load pertama yang gagal (tidak di-retry)
+_warmup_thread = None
+
+# statistik cold-start (ms), untuk memantau regresi waktu start
+model_stats = {"load_ms": None, "first_inference_ms": None}
+
+# status load model di background (dibaca menu untuk progress bar)
+_status = {"stage": "idle", "progress": 0.0, "ready": False, "error": None}
+_status_lock = threading.Lock()
+
+def set_emotion_backend(name, model_path=None, preset=None):
+    """Select the emotion classifier backend ("deepface" or "onnx").
+
+    Must be called before the model is loaded. The choice is also
+    written to the environment so spawned inference processes use the
+    same backend.
+    """
+    global _backend
+    with _model_lock:
+        if _models:
+            raise RuntimeError("emotion model already loaded")
+        _backend = create_backend(name, model_path, preset)
+        os.environ[BACKEND_ENV] = name
+        for key, value in ((MODEL_ENV, model_path), (PRESET_ENV, preset)):
+            if value:
+                os.environ[key] = value
+    return _backend
+
+def get_emotion_backend():
+    """Return the active backend (not necessarily loaded yet)."""
+    global _backend
+    with _model_lock:
+        if _backend is None:
+            _backend = create_backend()
+        return _backend
+
+def load_emotion_model(detector_backend=DETECTOR_BACKEND, progress=None):
+    """Load the active emotion backend once and cache it.
+
+    For the DeepFace backend the model and detector are built once and
+    reused by analyze() afterwards. Safe to call from several threads.
+    progress(stage, fraction) is called as loading advances.
+    """
+    global _load_error
+    backend = get_emotion_backend()
+    with _model_lock:
+        if "emotion" not in _models:
+            if _load_error is not None:
+                raise RuntimeError(f"emotion model failed to load: {_load_error}")
+            if getattr(backend, "detector_backend", None):
+                backend.detector_backend = detector_backend
+            t0 = time.perf_counter()
+            try:
+                _models["emotion"] = backend.load(progress) if progress else backend.load()
+            except Exception as e:
+                _load_error = e
+                raise
+            model_stats["load_ms"] = (time.perf_counter() - t0) * 1000
+            print(f"[model] {backend.describe()} loaded in {model_stats['load_ms']:.0f} ms")
+    return _models["emotion"]
+
+def get_emotion_model():
+    """
+    Mengambil backend emosi yang sudah di-load (di-load saat pertama dipakai).
+
+    Jika load sebelumnya gagal, RuntimeError langsung dilempar tanpa
+    mencoba load ulang, agar worker inferensi tidak tertahan oleh load
+    multi-detik di setiap panggilan.
+
+    Returns:
+        DeepFaceBackend|OnnxBackend: Backend yang siap dipakai.
+    """
+    model = _models.get("emotion")
+    if model is not None:
+        return model
+    if _load_error is not None:
+        raise RuntimeError(f"emotion model failed to load: {_load_error}")
+    return load_emotion_model()
+
+def warmup_emotion_model():
+    """Run one inference on a dummy face so the first real call is fast."""
+    size = get_emotion_backend().input_size
+    get_emotion(np.zeros((size[1], size[0], 3), dtype=np.uint8), face_box=(0, 0, *size))
+
+def _set_status(stage, progress, ready=False, error=None):
+    with _status_lock:
+        _status.update(stage=stage, progress=progress, ready=ready, error=error)
+
+def _load_and_warmup():
     try:
-        result = DeepFace.analyze(frame, actions=["emotion"], enforce_detection=enforce_detection)
-        return result[0]["dominant_emotion"]
+        load_emotion_model(progress=_set_status)
+        _set_status("warming up", 0.9)
+        warmup_emotion_model()
+        _set_status("ready", 1.0, ready=True)
+    except Exception as e:
+        _set_status("error", 0.0, error=str(e))
+        print(f"[model] loading failed: {e}")
+
+def start_model_loading():
+    """Load and warm up the model on a daemon thread (only once).
+
+    Progress can be polled with model_loading_status().
+    """
+    global _warmup_thread
+    if _warmup_thread is None:
+        _set_status("starting", 0.0)
+        _warmup_thread = threading.Thread(target=_load_and_warmup, name="ModelLoader", daemon=True)
+        _warmup_thread.start()
+    return _warmup_thread
+
+def start_model_warmup():
+    """Kept for older callers: same as start_model_loading()."""
+    return start_model_loading()
+
+def model_loading_status():
+    """Return a copy of {stage, progress 0..1, ready, error}."""
+    with _status_lock:
+        return dict(_status)
+
+def _record_first_inference(t0):
+    if model_stats["first_inference_ms"] is None:
+        model_stats["first_inference_ms"] = (time.perf_counter() - t0) * 1000
+        print(f"[model] first inference took {model_stats['first_inference_ms']:.0f} ms")
+
+def get_emotion_scores(frame, enforce_detection=False, face_box=None):
+    """Return {emotion: probability 0..1} for one face, or None.
+
+    If face_box (x, y, w, h) is given, only that face crop is classified
+    and the detector is skipped; otherwise the backend analyses the full
+    frame (DeepFace detector, or Haar for the ONNX backend).
+    """
+    try:
+        backend = get_emotion_model()
+        t0 = time.perf_counter()
+        face = crop_face(frame, face_box, size=backend.input_size) if face_box is not None else None
+        if face is not None:
+            scores = dict(zip(EMOTION_LABELS, (float(v) for v in backend.predict([face])[0])))
+        else:
+            scores = backend.analyze(frame, enforce_detection=enforce_detection)
+        _record_first_inference(t0)
+        return scores
     except Exception:
         return None
 
+def dominant_emotion(scores):
+    """Return the highest-scoring emotion name, or None if scores is None."""
+    if not scores:
+        return None
+    return max(scores, key=scores.get)
+
+def get_emotion(frame, enforce_detection=False, face_box=None):
+    """Return dominant emotion name or None (see get_emotion_scores)."""
+    return dominant_emotion(get_emotion_scores(frame, enforce_detection, face_box))
+
+def predict_emotion_batch(faces):
+    """Run the emotion model once on a list of BGR face crops.
+
+    Crops should match the backend input size (see crop_face). Returns
+    an (N, 7) array of class probabilities in EMOTION_LABELS order.
+    """
+    return get_emotion_model().predict(faces)
+
+def get_emotion_scores_batch(frame, face_boxes):
+    """Return {emotion: probability} (or None) for every face box.
+
+    All faces are classified in a single batched forward pass.
+    """
+    scores = [None] * len(face_boxes)
+    size = get_emotion_backend().input_size
+    crops = [crop_face(frame, box, size=size) for box in face_boxes]
+    valid = [i for i, crop in enumerate(crops) if crop is not None]
+    if not valid:
+        return scores
+
+    try:
+        t0 = time.perf_counter()
+        probs = predict_emotion_batch([crops[i] for i in valid])
+        _record_first_inference(t0)
+    except Exception:
+        return scores
+
+    for i, p in zip(valid, probs):
+        scores[i] = dict(zip(EMOTION_LABELS, (float(v) for v in p)))
+    return scores
+
+def get_emotions_batch(frame, face_boxes):
+    """Return the dominant emotion (or None) for every face box."""
+    return [dominant_emotion(s) for s in get_emotion_scores_batch(frame, face_boxes)]
+
 def get_random_emojis(n=3):
     """Return n random emoji keys from emoji_map."""
     return random.sample(list(emoji_map.keys()), n)
@@ -0,0 +1,220 @@
+import time
+
+import cv2
+
+
+def load_face_cascade():
+    """
+    Memuat Haar cascade wajah bawaan OpenCV.
+
+    Returns:
+        cv2.CascadeClassifier: Detektor wajah frontal.
+    """
+    return cv2.CascadeClassifier(
+        cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+    )
+
+
+def box_iou(a, b):
+    """Intersection-over-union dua box (x, y, w, h)."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+# ===========================================================
+#   DETECT-THEN-TRACK UNTUK BOUNDING BOX WAJAH
+# ===========================================================
+class FaceTracker:
+    """
+    Mengganti deteksi Haar per frame dengan pipeline detect-then-track.
+
+    Deteksi penuh (detectMultiScale) hanya dijalankan tiap detect_every
+    frame atau ketika confidence tracking turun. Di antaranya, tiap wajah
+    diikuti dengan template matching pada area sekitar box sebelumnya.
+    Posisi box dihaluskan (EMA) agar emoji di atas kepala tidak bergetar.
+
+    Parameters:
+        cascade (cv2.CascadeClassifier|None): Detektor wajah.
+        detect_every (int): Interval deteksi penuh (frame).
+        search_margin (float): Lebar area pencarian di sekitar box,
+            relatif terhadap ukuran box.
+        min_score (float): Skor template matching minimum (0–1);
+            di bawahnya track dianggap hilang dan deteksi diulang.
+        smoothing (float): Bobot box baru pada EMA (1.0 = tanpa smoothing).
+        scale_factor (float): Parameter detectMultiScale.
+        min_neighbors (int): Parameter detectMultiScale.
+    """
+
+    def __init__(self, cascade=None, detect_every=10, search_margin=0.5,
+                 min_score=0.6, smoothing=0.5, scale_factor=1.3, min_neighbors=5):
+        self.cascade = cascade if cascade is not None else load_face_cascade()
+        self.detect_every = max(1, detect_every)
+        self.search_margin = search_margin
+        self.min_score = min_score
+        self.smoothing = smoothing
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+
+        # Tiap track: {"id": int, "box": (x, y, w, h) float, "template": ndarray}
+        self._tracks = []
+        self._next_id = 0
+        self._since_detect = 0
+        self._force_detect = True
+
+        # Statistik waktu
+        self.frames = 0
+        self.detections = 0
+        self.detect_ms = 0.0
+        self.track_ms = 0.0
+
+    def reset(self):
+        """Menghapus semua track; frame berikutnya dideteksi penuh."""
+        self._tracks = []
+        self._force_detect = True
+
+    def update(self, gray):
+        """
+        Memproses satu frame grayscale.
+
+        Parameters:
+            gray (numpy.ndarray): Frame grayscale.
+
+        Returns:
+            list[tuple[int, int, int, int]]: Box wajah (x, y, w, h).
+        """
+        self.frames += 1
+
+        need_detect = (self._force_detect or not self._tracks
+                       or self._since_detect >= self.detect_every)
+
+        if not need_detect:
+            t0 = time.perf_counter()
+            lost = self._track(gray)
+            self.track_ms += (time.perf_counter() - t0) * 1000
+            self._since_detect += 1
+
+            # Confidence turun → deteksi ulang di frame yang sama
+            need_detect = lost
+
+        if need_detect:
+            t0 = time.perf_counter()
+            self._detect(gray)
+            self.detect_ms += (time.perf_counter() - t0) * 1000
+            self.detections += 1
+            self._since_detect = 0
+
+        return self.boxes()
+
+    def boxes(self):
+        """Box semua track saat ini (dibulatkan ke int)."""
+        return [tuple(int(round(v)) for v in t["box"]) for t in self._tracks]
+
+    def track_ids(self):
+        """
+        ID tiap track, urutannya sama dengan boxes().
+
+        ID tetap selama wajah yang sama terus diikuti (termasuk saat
+        deteksi ulang, lewat asosiasi IoU), sehingga bisa dipakai
+        sebagai identitas pemain. Wajah baru mendapat ID baru.
+
+        Returns:
+            list[int]: ID track.
+        """
+        return [t["id"] for t in self._tracks]
+
+    def stats(self):
+        """
+        Statistik waktu rata-rata per frame.
+
+        Returns:
+            dict: frames, detections, detect_ms_per_frame, track_ms_per_frame.
+        """
+        frames = max(1, self.frames)
+        return {
+            "frames": self.frames,
+            "detections": self.detections,
+            "detect_ms_per_frame": self.detect_ms / frames,
+            "track_ms_per_frame": self.track_ms / frames,
+        }
+
+    def _smooth(self, old, new):
+        a = self.smoothing
+        return tuple(a * n + (1 - a) * o for o, n in zip(old, new))
+
+    def _template(self, gray, box):
+        x, y, w, h = [int(round(v)) for v in box]
+        return gray[max(0, y):y + h, max(0, x):x + w].copy()
+
+    def _detect(self, gray):
+        """Deteksi penuh, lalu cocokkan dengan track lama (IoU) untuk smoothing."""
+        faces = self.cascade.detectMultiScale(gray, self.scale_factor, self.min_neighbors)
+
+        # Asosiasi greedy: pasangan (wajah, track lama) dengan IoU terbesar
+        # dulu, tiap track lama paling banyak dipakai satu wajah
+        boxes = [tuple(float(v) for v in face) for face in faces]
+        pairs = sorted(((box_iou(t["box"], box), i, j)
+                        for i, box in enumerate(boxes)
+                        for j, t in enumerate(self._tracks)), reverse=True)
+        matched, used = {}, set()
+        for iou, i, j in pairs:
+            if iou <= 0.3:
+                break
+            if i not in matched and j not in used:
+                matched[i] = self._tracks[j]
+                used.add(j)
+
+        tracks = []
+        for i, box in enumerate(boxes):
+            # Wajah yang sama dengan track lama → ID sama, haluskan posisinya
+            old = matched.get(i)
+            if old is not None:
+                box = self._smooth(old["box"], box)
+                track_id = old["id"]
+            else:
+                track_id = self._next_id
+                self._next_id += 1
+
+            template = self._template(gray, box)
+            if template.size:
+                tracks.append({"id": track_id, "box": box, "template": template})
+
+        self._tracks = tracks
+        self._force_detect = False
+
+    def _track(self, gray):
+        """
+        Template matching tiap track pada area sekitar box sebelumnya.
+
+        Returns:
+            bool: True jika ada track yang hilang (perlu deteksi ulang).
+        """
+        fh, fw = gray.shape[:2]
+
+        for track in self._tracks:
+            x, y, w, h = track["box"]
+            template = track["template"]
+            th, tw = template.shape[:2]
+
+            # Area pencarian di sekitar box lama
+            mx = int(w * self.search_margin)
+            my = int(h * self.search_margin)
+            sx1, sy1 = max(0, int(x) - mx), max(0, int(y) - my)
+            sx2, sy2 = min(fw, int(x + w) + mx), min(fh, int(y + h) + my)
+
+            search = gray[sy1:sy2, sx1:sx2]
+            if search.shape[0] < th or search.shape[1] < tw:
+                return True
+
+            result = cv2.matchTemplate(search, template, cv2.TM_CCOEFF_NORMED)
+            _, score, _, (lx, ly) = cv2.minMaxLoc(result)
+            if score < self.min_score:
+                return True
+
+            track["box"] = self._smooth(track["box"], (sx1 + lx, sy1 + ly, tw, th))
+
+        return False
@@ -0,0 +1,152 @@
+import time
+
+from analysis_frame import AnalysisFrame
+from face_tracker import load_face_cascade
+
+# FPS saat idle: cukup untuk melihat orang yang datang ke depan kamera
+IDLE_FPS = 4
+
+# Detik tanpa wajah sebelum masuk mode idle (0 = mode idle mati)
+IDLE_AFTER_S = 15.0
+
+# Deteksi kehadiran (Haar) pada frame analisis kecil, tiap beberapa frame
+PRESENCE_WIDTH = 320
+PRESENCE_CHECK_EVERY = 5
+
+
+# ===========================================================
+#   FRAME-RATE GOVERNOR + MODE IDLE HEMAT DAYA
+# ===========================================================
+class FrameGovernor:
+    """
+    Mengatur laju frame SceneEngine.
+
+    Setiap scene punya target FPS sendiri; sisa waktu frame diisi
+    sleep sampai jadwal frame berikutnya (bukan busy-spin). Jika mode
+    idle aktif dan tidak ada wajah/input selama idle_after detik, target
+    turun ke idle_fps dan scene game berhenti mengirim frame ke
+    inferensi emosi. Begitu wajah terlihat (atau ada klik/tombol),
+    governor langsung bangun: jadwal frame di-reset sehingga frame
+    berikutnya tidak menunggu sisa periode idle.
+
+    Scene yang tidak mendeteksi wajah sendiri (menu, countdown, game
+    over) diperiksa lewat observe(): Haar pada frame analisis kecil
+    tiap check_every frame, dan tiap frame selama idle.
+
+    Parameters:
+        idle_after (float): Detik tanpa aktivitas sebelum idle (0 = mati).
+        idle_fps (float): Target FPS selama idle.
+        check_every (int): Interval deteksi kehadiran saat aktif (frame).
+        presence_width (int): Lebar frame analisis deteksi kehadiran (px).
+    """
+
+    def __init__(self, idle_after=0.0, idle_fps=IDLE_FPS,
+                 check_every=PRESENCE_CHECK_EVERY, presence_width=PRESENCE_WIDTH):
+        self.idle_after = idle_after or 0.0
+        self.idle_fps = idle_fps
+        self.check_every = max(1, check_every)
+        self.presence_width = presence_width
+
+        self.idle = False
+        self.on_change = None          # callback(idle) saat status idle berubah
+        self._last_active = time.perf_counter()
+        self._next_frame = None
+        self._frames = 0
+
+        # Detektor kehadiran dibuat saat pertama dipakai
+        self._cascade = None
+        self._analysis = None
+
+        # Statistik
+        self.idle_entries = 0
+        self.wakeups = 0
+
+    @property
+    def enabled(self):
+        return self.idle_after > 0
+
+    # -----------------------------------------------------------
+    #   Aktivitas & kehadiran
+    # -----------------------------------------------------------
+    def activity(self):
+        """Ada aktivitas (wajah, input, ganti scene): reset timer idle."""
+        self._last_active = time.perf_counter()
+        if self.idle:
+            self._set_idle(False)
+
+    def report_faces(self, count):
+        """Dipanggil scene yang mendeteksi wajah sendiri (jumlah wajah)."""
+        if count:
+            self.activity()
+
+    def observe(self, frame):
+        """
+        Deteksi kehadiran untuk scene yang tidak mendeteksi wajah sendiri.
+
+        Parameters:
+            frame (numpy.ndarray): Frame kamera (BGR, tidak diubah).
+        """
+        if not self.enabled:
+            return
+        self._frames += 1
+        # Saat idle setiap frame diperiksa agar bisa bangun secepatnya
+        if not self.idle and self._frames % self.check_every:
+            return
+
+        if self._cascade is None:
+            self._cascade = load_face_cascade()
+            self._analysis = AnalysisFrame(self.presence_width)
+        gray = self._analysis.gray(frame)
+        self.report_faces(len(self._cascade.detectMultiScale(gray, 1.3, 5)))
+
+    def update(self):
+        """Masuk idle jika tidak ada aktivitas selama idle_after detik."""
+        if (self.enabled and not self.idle
+                and time.perf_counter() - self._last_active >= self.idle_after):
+            self._set_idle(True)
+
+    def _set_idle(self, idle):
+        self.idle = idle
+        self._next_frame = None        # jadwal baru mulai dari sekarang
+        if idle:
+            self.idle_entries += 1
+        else:
+            self.wakeups += 1
+        if self.on_change is not None:
+            self.on_change(idle)
+
+    # -----------------------------------------------------------
+    #   Pacing
+    # -----------------------------------------------------------
+    def target_fps(self, fps):
+        """
+        Target FPS efektif untuk scene.
+
+        Parameters:
+            fps (float|None): Target FPS scene (None = ikut sumber frame).
+
+        Returns:
+            float|None: Target setelah mode idle diperhitungkan.
+        """
+        if self.idle:
+            return min(fps, self.idle_fps) if fps else self.idle_fps
+        return fps
+
+    def restart(self):
+        """Mulai jadwal frame baru (mis. saat scene berganti)."""
+        self._next_frame = None
+
+    def wait(self, fps):
+        """Sleep sampai jadwal frame berikutnya (jika ada target FPS)."""
+        if not fps:
+            self._next_frame = None
+            return
+        period = 1.0 / fps
+        now = time.perf_counter()
+        if self._next_frame is None or now - self._next_frame > period:
+            # Pertama kali / tertinggal jauh: mulai jadwal baru
+            self._next_frame = now
+        self._next_frame += period
+        delay = self._next_frame - now
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,196 @@
+import os
+import sys
+import time
+
+import cv2
+
+WINDOW_NAME = "Mimic The Emoji"
+CLOCK_MODES = ("wall", "source")
+
+
+# ===========================================================
+#   TUJUAN FRAME HASIL RENDER (WINDOW / VIDEO / RAW / NULL)
+# ===========================================================
+class WindowSink:
+    """
+    Menampilkan frame ke window OpenCV (perilaku default game).
+
+    Parameters:
+        window_name (str): Nama window tujuan.
+    """
+
+    headless = False
+
+    def __init__(self, window_name=WINDOW_NAME):
+        self.window_name = window_name
+        self.frames_written = 0
+
+    def write(self, frame):
+        cv2.imshow(self.window_name, frame)
+        self.frames_written += 1
+
+    def poll_key(self):
+        """Tombol yang ditekan (0–255), atau -1 jika tidak ada."""
+        key = cv2.waitKey(1)
+        return key & 0xFF if key != -1 else -1
+
+    def close(self):
+        pass
+
+
+class NullSink:
+    """Membuang frame (untuk profiling tanpa biaya encode/tampil)."""
+
+    headless = True
+
+    def __init__(self):
+        self.frames_written = 0
+
+    def write(self, frame):
+        self.frames_written += 1
+
+    def poll_key(self):
+        return -1
+
+    def close(self):
+        pass
+
+
+class VideoWriterSink(NullSink):
+    """
+    Menyimpan frame ke file video dengan cv2.VideoWriter.
+
+    Writer dibuka saat frame pertama datang (ukuran frame baru diketahui).
+
+    Parameters:
+        path (str): Path file output (mis. hasil.mp4 / hasil.avi).
+        fps (float): Frame rate video output.
+        fourcc (str): Kode codec 4 karakter (default "mp4v").
+    """
+
+    def __init__(self, path, fps=30.0, fourcc="mp4v"):
+        super().__init__()
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc
+        self._writer = None
+
+    def write(self, frame):
+        if self._writer is None:
+            h, w = frame.shape[:2]
+            self._writer = cv2.VideoWriter(
+                self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (w, h))
+            if not self._writer.isOpened():
+                raise ValueError(f"video {self.path} tidak bisa ditulis")
+        self._writer.write(frame)
+        self.frames_written += 1
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+
+def _detach_stdout():
+    """
+    Memindahkan stdout asli ke fd baru dan mengarahkan fd 1 ke stderr.
+
+    Returns:
+        io.BufferedWriter: Stream biner ke stdout asli.
+    """
+    sys.stdout.flush()
+    raw_fd = os.dup(1)
+    os.dup2(2, 1)
+    return os.fdopen(raw_fd, "wb")
+
+
+class RawSink(NullSink):
+    """
+    Menulis frame BGR24 mentah ke stream biner (mis. pipe ke ffmpeg).
+
+    Dengan stdout ("-"), file descriptor stdout asli dipakai khusus untuk
+    frame, dan fd 1 proses dialihkan ke stderr (termasuk proses anak
+    yang dibuat sesudahnya), sehingga log [model]/[pipeline]/... tidak
+    pernah tercampur dengan data frame.
+
+    Parameters:
+        stream: Objek file biner, atau path ("-" = stdout).
+    """
+
+    def __init__(self, stream="-"):
+        super().__init__()
+        self._owned = isinstance(stream, str)
+        if stream == "-":
+            stream = _detach_stdout()
+        elif isinstance(stream, str):
+            stream = open(stream, "wb")
+        self.stream = stream
+        self.frame_size = None    # (w, h) frame pertama
+
+    def write(self, frame):
+        if self.frame_size is None:
+            self.frame_size = (frame.shape[1], frame.shape[0])
+        self.stream.write(frame.tobytes())
+        self.frames_written += 1
+
+    def close(self):
+        self.stream.flush()
+        if self._owned:
+            self.stream.close()
+
+
+def open_sink(spec=None, fps=30.0):
+    """
+    Membuka tujuan frame berdasarkan spesifikasi teks.
+
+    - None / "window"     → WindowSink
+    - "null"              → NullSink
+    - "raw" / "raw:<path>" → RawSink (default stdout)
+    - path lain           → VideoWriterSink
+
+    Parameters:
+        spec (str|None): Spesifikasi tujuan.
+        fps (float): Frame rate untuk file video.
+
+    Returns:
+        WindowSink|NullSink|VideoWriterSink|RawSink: Sink frame.
+    """
+    if spec is None or spec == "window":
+        return WindowSink()
+    if spec == "null":
+        return NullSink()
+    if spec == "raw" or spec.startswith("raw:"):
+        return RawSink(spec.split(":", 1)[1] if ":" in spec else "-")
+    return VideoWriterSink(spec, fps=fps)
+
+
+# ===========================================================
+#   JAM GAME (WAKTU DINDING / TIMESTAMP SUMBER)
+# ===========================================================
+def make_clock(cap, mode="wall"):
+    """
+    Membuat fungsi jam untuk run_game.
+
+    Mode "source" memakai cap.frame_timestamp (waktu sumber frame),
+    sehingga replay video memberi hasil yang sama berapa pun kecepatan
+    prosesnya. Jika sumber tidak punya timestamp, jam kembali ke
+    waktu dinding.
+
+    Parameters:
+        cap: Sumber frame (ThreadedCapture/FrameSource).
+        mode (str): "wall" atau "source".
+
+    Returns:
+        callable: Fungsi tanpa argumen yang mengembalikan detik (float).
+    """
+    if mode not in CLOCK_MODES:
+        raise ValueError(f"clock harus salah satu dari {CLOCK_MODES}")
+
+    if mode == "wall":
+        return time.time
+
+    def source_clock():
+        timestamp = getattr(cap, "frame_timestamp", None)
+        return timestamp if timestamp is not None else time.time()
+
+    return source_clock
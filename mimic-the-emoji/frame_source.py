@@ -0,0 +1,342 @@
+import argparse
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+
+from camera import ThreadedCapture, negotiate_capture_size
+
+PACING_MODES = ("realtime", "fast")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+SYNTHETIC_PATTERN = "assets/demo/*.jpg"
+
+
+# ===========================================================
+#   SUMBER FRAME (INTERFACE MIRIP cv2.VideoCapture)
+# ===========================================================
+class FrameSource:
+    """
+    Dasar sumber frame non-kamera (video, folder gambar, sintetis).
+
+    Interface read()/release()/isOpened()/get()/set() sama dengan
+    cv2.VideoCapture, sehingga sumber ini bisa menggantikan kamera di
+    semua layar. Timestamp frame mengikuti waktu sumber
+    (frame_index / fps), bukan waktu dinding.
+
+    Parameters:
+        fps (float): Frame rate sumber.
+        pacing (str): "realtime" → read() menunggu sesuai fps,
+            "fast" → frame dikirim secepat mungkin.
+        mirror (bool): Mirror horizontal setiap frame (seperti kamera).
+    """
+
+    def __init__(self, fps=30.0, pacing="realtime", mirror=True):
+        if pacing not in PACING_MODES:
+            raise ValueError(f"pacing harus salah satu dari {PACING_MODES}")
+
+        self.fps = float(fps) if fps and fps > 0 else 30.0
+        self.pacing = pacing
+        self.mirror = mirror
+
+        self.frame_index = 0
+        self.frame_timestamp = None   # detik sejak frame pertama (waktu sumber)
+        self._start = None
+        self._opened = True
+
+    def _next_frame(self, image):
+        """Mengembalikan (ret, frame) berikutnya; frame boleh ditimpa."""
+        raise NotImplementedError
+
+    def read(self, image=None):
+        """
+        Mengambil frame berikutnya.
+
+        Parameters:
+            image (numpy.ndarray|None): Buffer tujuan (dipakai jika
+                ukurannya cocok), seperti cv2.VideoCapture.read().
+
+        Returns:
+            tuple[bool, numpy.ndarray|None]: (ret, frame).
+        """
+        if not self._opened:
+            return False, None
+
+        ret, frame = self._next_frame(image)
+        if not ret:
+            return False, None
+
+        if self.mirror:
+            cv2.flip(frame, 1, dst=frame)
+
+        self.frame_timestamp = self.frame_index / self.fps
+        self.frame_index += 1
+
+        # Pacing realtime: tunggu sampai jadwal frame ini tiba
+        if self.pacing == "realtime":
+            now = time.monotonic()
+            if self._start is None:
+                self._start = now
+            delay = self._start + self.frame_timestamp - now
+            if delay > 0:
+                time.sleep(delay)
+
+        return True, frame
+
+    def release(self):
+        self._opened = False
+
+    def isOpened(self):
+        return self._opened
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self.frame_index
+        return 0
+
+    def set(self, prop, value):
+        return False
+
+
+def _into(image, frame):
+    """Salin frame ke buffer image jika ukurannya cocok, jika tidak buat salinan."""
+    if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+        np.copyto(image, frame)
+        return image
+    return frame.copy()
+
+
+class VideoFileSource(FrameSource):
+    """
+    Sumber frame dari file video rekaman.
+
+    Parameters:
+        path (str): Path file video.
+        loop (bool): Ulangi dari awal ketika video habis.
+        fps (float|None): Override fps (default: fps dari file).
+        pacing (str): "realtime" atau "fast".
+        mirror (bool): Mirror horizontal setiap frame.
+    """
+
+    def __init__(self, path, loop=False, fps=None, pacing="realtime", mirror=True):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise ValueError(f"video {path} tidak bisa dibuka")
+        super().__init__(fps or self.cap.get(cv2.CAP_PROP_FPS), pacing, mirror)
+        self.loop = loop
+
+    def _next_frame(self, image):
+        ret, frame = self.cap.read(image) if image is not None else self.cap.read()
+        if not ret and self.loop and self.frame_index > 0:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def release(self):
+        super().release()
+        self.cap.release()
+
+
+class ImageDirSource(FrameSource):
+    """
+    Sumber frame dari folder berisi gambar (diurutkan berdasarkan nama).
+
+    Parameters:
+        folder (str): Folder gambar (.jpg/.jpeg/.png/.bmp).
+        loop (bool): Ulangi dari gambar pertama setelah gambar terakhir.
+        fps (float): Frame rate yang disimulasikan.
+        pacing (str): "realtime" atau "fast".
+        mirror (bool): Mirror horizontal setiap frame.
+    """
+
+    def __init__(self, folder, loop=False, fps=30.0, pacing="realtime", mirror=True):
+        super().__init__(fps, pacing, mirror)
+        self.paths = sorted(p for p in glob.glob(os.path.join(folder, "*"))
+                            if p.lower().endswith(IMAGE_EXTENSIONS))
+        if not self.paths:
+            raise ValueError(f"tidak ada gambar di folder {folder}")
+        self.loop = loop
+        self._pos = 0
+
+    def _next_frame(self, image):
+        while True:
+            if self._pos >= len(self.paths):
+                if not self.loop or not self.paths:
+                    return False, None
+                self._pos = 0
+
+            path = self.paths[self._pos]
+            frame = cv2.imread(path)
+            if frame is not None:
+                self._pos += 1
+                return True, _into(image, frame)
+
+            # File rusak/tidak terbaca → dilewati (dan tidak dicoba lagi saat loop)
+            print(f"[source] gambar tidak terbaca, dilewati: {path}")
+            del self.paths[self._pos]
+
+
+class SyntheticSource(FrameSource):
+    """
+    Sumber frame sintetis dari gambar demo yang digeser perlahan.
+
+    Tiap gambar ditampilkan selama hold_frames frame dengan pergeseran
+    sinusoidal (simulasi kepala bergerak), lalu berganti ke gambar
+    berikutnya. Hasilnya deterministik, cocok untuk CI tanpa kamera.
+
+    Parameters:
+        pattern (str): Glob gambar sumber (default assets/demo/*.jpg).
+        frames (int|None): Jumlah frame total (None = tanpa batas).
+        hold_frames (int): Lama tiap gambar ditampilkan (frame).
+        size (tuple[int, int]|None): Resize gambar ke (w, h).
+        fps (float): Frame rate yang disimulasikan.
+        pacing (str): "realtime" atau "fast".
+        mirror (bool): Mirror horizontal setiap frame.
+    """
+
+    def __init__(self, pattern=SYNTHETIC_PATTERN, frames=None, hold_frames=90,
+                 size=None, fps=30.0, pacing="realtime", mirror=False):
+        super().__init__(fps, pacing, mirror)
+        self.images = []
+        for path in sorted(glob.glob(pattern)):
+            img = cv2.imread(path)
+            if img is None:
+                continue
+            if size is not None:
+                img = cv2.resize(img, tuple(size), interpolation=cv2.INTER_AREA)
+            self.images.append(img)
+        if not self.images:
+            raise ValueError(f"tidak ada gambar untuk pola {pattern}")
+
+        # Semua gambar disamakan ukurannya dengan gambar pertama
+        h, w = self.images[0].shape[:2]
+        self.images = [img if img.shape[:2] == (h, w) else
+                       cv2.resize(img, (w, h), interpolation=cv2.INTER_AREA)
+                       for img in self.images]
+
+        self.frames = frames
+        self.hold_frames = max(1, hold_frames)
+        self._size = (w, h)
+
+    def _next_frame(self, image):
+        i = self.frame_index
+        if self.frames is not None and i >= self.frames:
+            return False, None
+
+        base = self.images[(i // self.hold_frames) % len(self.images)]
+        dx = 15 * np.sin(i / 15.0)
+        dy = 8 * np.cos(i / 20.0)
+        m = np.float32([[1, 0, dx], [0, 1, dy]])
+
+        h, w = base.shape[:2]
+        if image is None or image.shape != base.shape:
+            image = np.empty_like(base)
+        cv2.warpAffine(base, m, (w, h), dst=image, borderMode=cv2.BORDER_REPLICATE)
+        return True, image
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self._size[0]
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self._size[1]
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return self.frames or 0
+        return super().get(prop)
+
+
+# ===========================================================
+#   MEMBUKA SUMBER DARI STRING --source
+# ===========================================================
+def open_source(spec=None, pacing="realtime", loop=False, mirror=True,
+                fps=None, frames=None, size=None, capture_size=None):
+    """
+    Membuka sumber frame berdasarkan spesifikasi teks.
+
+    - None / "webcam" / "0" / "webcam:1" → kamera (ThreadedCapture)
+    - "synthetic" / "synthetic:<glob>"     → SyntheticSource
+    - path folder                           → ImageDirSource
+    - path file                             → VideoFileSource
+
+    Parameters:
+        spec (str|int|None): Spesifikasi sumber.
+        pacing (str): "realtime" atau "fast" (diabaikan untuk webcam).
+        loop (bool): Ulangi video/folder ketika habis.
+        mirror (bool): Mirror horizontal setiap frame.
+        fps (float|None): Override fps sumber non-kamera.
+        frames (int|None): Jumlah frame sumber sintetis.
+        size (tuple[int, int]|None): Ukuran frame sumber sintetis (w, h).
+        capture_size (tuple[int, int]|None): Resolusi yang diminta ke
+            webcam (w, h); untuk sumber sintetis sama dengan size.
+
+    Returns:
+        ThreadedCapture|FrameSource: Objek dengan interface VideoCapture.
+    """
+    spec = "webcam" if spec is None else str(spec)
+
+    if spec.isdigit() or spec == "webcam" or spec.startswith("webcam:"):
+        index = int(spec.split(":", 1)[1]) if ":" in spec else (int(spec) if spec.isdigit() else 0)
+        cap = cv2.VideoCapture(index)
+        if capture_size is not None:
+            negotiate_capture_size(cap, capture_size)
+        return ThreadedCapture(cap, flip=mirror).start()
+
+    if spec == "synthetic" or spec.startswith("synthetic:"):
+        pattern = spec.split(":", 1)[1] if ":" in spec else SYNTHETIC_PATTERN
+        return SyntheticSource(pattern, frames=frames, size=size or capture_size,
+                               fps=fps or 30.0, pacing=pacing, mirror=mirror)
+
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, loop=loop, fps=fps or 30.0,
+                              pacing=pacing, mirror=mirror)
+
+    if os.path.isfile(spec):
+        return VideoFileSource(spec, loop=loop, fps=fps,
+                               pacing=pacing, mirror=mirror)
+
+    raise ValueError(f"sumber frame tidak dikenal: {spec}")
+
+
+def parse_size(text):
+    """Mengubah teks "WxH" menjadi tuple (w, h)."""
+    try:
+        w, h = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ukuran harus berformat WxH: {text}")
+    return w, h
+
+
+def add_source_arguments(parser):
+    """
+    Menambahkan opsi --source, --pacing, --loop, --frames, --capture-size,
+    dan --no-mirror.
+
+    Parameters:
+        parser (argparse.ArgumentParser): Parser tujuan.
+
+    Returns:
+        argparse.ArgumentParser: Parser yang sama.
+    """
+    parser.add_argument("--source", default="webcam",
+                        help="webcam[:index], file video, folder gambar, "
+                             "atau synthetic[:glob]")
+    parser.add_argument("--pacing", choices=PACING_MODES, default="realtime",
+                        help="realtime = ikuti fps sumber, fast = secepat mungkin")
+    parser.add_argument("--loop", action="store_true",
+                        help="ulangi video/folder gambar ketika habis")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="jumlah frame sumber sintetis (default: tanpa batas)")
+    parser.add_argument("--capture-size", type=parse_size, default=None,
+                        help="resolusi capture yang diminta, mis. 1280x720")
+    parser.add_argument("--no-mirror", dest="mirror", action="store_false",
+                        help="jangan mirror frame (mis. rekaman yang sudah di-mirror)")
+    return parser
+
+
+def open_source_from_args(args):
+    """Membuka sumber frame dari argumen add_source_arguments()."""
+    return open_source(args.source, pacing=args.pacing, loop=args.loop,
+                       mirror=args.mirror, frames=args.frames,
+                       capture_size=args.capture_size)
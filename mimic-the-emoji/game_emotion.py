@@ -1,200 +1,760 @@
-from main_menu import show_main_menu, show_countdown
-from game_over import show_game_over
-import cv2
 import time
-from emotion_utils import get_emotion, get_random_emojis, emoji_map
+
+# Dicatat sebelum import lain agar time-to-first-frame ikut menghitung waktu import
+_STARTUP_T0 = time.perf_counter()
+
+from main_menu import MenuScene, CountdownScene
+from game_over import GameOverScene
+import argparse
+import cv2
+import random
+from emotion_utils import get_emotion_scores, get_emotion_scores_batch, get_random_emojis, emoji_map, load_emotion_model, set_emotion_backend
+from emotion_backends import EMOTION_BACKENDS, ONNX_PRESETS
 from emoji_overlay import load_emoji_images
-from gui_helpers import draw_floating_emojis, draw_text_lines, draw_simple_hud, draw_current_emotion
-from audio_utils import init_audio, play_bgm, stop_bgm, play_sfx
+from gui_helpers import draw_floating_emojis, draw_text_lines, draw_simple_hud, draw_current_emotion, draw_player_label, draw_perf_overlay
+from audio_utils import init_audio, shutdown_audio, post_audio_event, AUDIO_BACKENDS
+from inference_worker import EmotionWorker, QUEUE_POLICIES
+from process_worker import ProcessEmotionWorker, INFERENCE_BACKENDS
+from emotion_smoother import EmotionSmoother, SMOOTHING_MODES
+from inference_scheduler import InferenceScheduler
+from face_tracker import FaceTracker, box_iou
+from analysis_frame import AnalysisFrame, DEFAULT_ANALYSIS_WIDTH
+from frame_source import add_source_arguments, open_source_from_args
+from frame_sink import CLOCK_MODES, open_sink, make_clock
+from profiling import profiler, StartupTimer
+from scene_engine import Scene, SceneEngine, engine_for
+from frame_governor import FrameGovernor, IDLE_AFTER_S, IDLE_FPS
+
+# Tahap render loop yang ditampilkan di overlay profiling
+PERF_STAGES = ["capture", "detect", "schedule", "render", "output", "inference", "camera.read"]
+
+
+def new_player(smoothing=None):
+    """
+    Membuat state progres untuk satu pemain.
+
+    Parameters:
+        smoothing (dict|None): Argumen untuk EmotionSmoother.
 
-def run_game(cap):
+    Returns:
+        dict: score, round_num, round_emojis, matched, current_index,
+        detected (emosi hasil smoothing terakhir), dan smoother.
     """
-    Fungsi utama loop permainan Mimic The Emoji.
+    return {
+        "score": 0,
+        "round_num": 1,                        # ronde ke berapa
+        "round_emojis": get_random_emojis(3),  # 3 emoji target tiap ronde
+        "matched": set(),                      # emoji yang sudah berhasil dicocokkan
+        "current_index": 0,                    # pointer emoji target saat ini
+        "detected": None,                      # emosi hasil smoothing terakhir
+        "smoother": EmotionSmoother(**(smoothing or {})),
+        "last_box": None,                      # box wajah terakhir (multi-player)
+    }
+
+
+def match_emotion(player, detected):
+    """
+    Mencocokkan emosi terdeteksi dengan emoji target pemain saat ini
+    dan memperbarui progres pemain jika cocok.
+
+    Parameters:
+        player (dict): State pemain dari new_player().
+        detected (str|None): Nama emosi hasil deteksi.
+
+    Returns:
+        bool: True jika emosi cocok dengan target.
+    """
+    if not detected or player["current_index"] >= len(player["round_emojis"]):
+        return False
+
+    key = player["round_emojis"][player["current_index"]]   # emoji target saat ini
+    target_emotion = emoji_map[key]                         # konversi emoji → nama emosi
+
+    if detected != target_emotion:
+        return False
+
+    player["matched"].add(key)
+    player["score"] += 1
+    player["current_index"] += 1
+
+    # Jika 3 emoji sudah berhasil → lanjut ronde berikutnya
+    if player["current_index"] == 3:
+        player["round_num"] += 1
+        player["matched"].clear()
+        player["current_index"] = 0
+        player["round_emojis"] = get_random_emojis(3)
+
+    return True
 
-    Game akan:
-    - Mengambil ekspresi wajah user melalui kamera.
-    - Membandingkan hasil deteksi emosi dengan urutan target emoji.
-    - Memberikan poin jika sesuai.
-    - Menampilkan HUD (score, round, timer).
-    - Mengakhiri game setelah waktu habis atau user keluar.
+
+def select_infer_fn(multiplayer):
+    """Fungsi inferensi sesuai mode: batch multi-wajah atau satu wajah."""
+    return get_emotion_scores_batch if multiplayer else get_emotion_scores
+
+
+def start_process_worker(args):
+    """
+    Menjalankan ProcessEmotionWorker jika --inference-backend process.
 
     Parameters:
-        cap (cv2.VideoCapture): Kamera aktif.
+        args (argparse.Namespace): Opsi dari parse_args().
 
     Returns:
-        int: Score akhir pemain.
-    """
-
-    # ---------------------------
-    # Variabel utama game
-    # ---------------------------
-    score = 0
-    round_num = 1                  # ronde ke berapa
-    round_emojis = get_random_emojis(3)   # 3 emoji target tiap ronde
-    matched = set()                # emoji yang sudah berhasil dicocokkan
-    current_index = 0              # pointer emoji target saat ini
-    game_duration = 30             # total waktu game
-    start_time = time.time()       # timestamp mulai
-
-    # Mainkan background music
-    play_bgm("assets/audio/bgm.mp3")
-
-    # ---------------------------
-    # Setup deteksi wajah & emoji
-    # ---------------------------
-    face_cascade = cv2.CascadeClassifier(
-        cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-    )
-    emoji_images = load_emoji_images("assets")  # load semua emoji PNG
-
-    # ---------------------------
-    # MAIN GAME LOOP
-    # ---------------------------
-    while True:
-
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        frame = cv2.flip(frame, 1)  # mirror kamera
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-        # Deteksi wajah (untuk meletakkan floating emojis)
-        faces = face_cascade.detectMultiScale(gray, 1.3, 5)
-        face_box = tuple(faces[0]) if len(faces) else None
-
-        # Deteksi emosi dari kamera
-        detected = get_emotion(frame, enforce_detection=False)
+        ProcessEmotionWorker|None: Worker yang sudah berjalan, atau None
+        untuk backend "thread" (GameScene membuat EmotionWorker sendiri).
+    """
+    if args.inference_backend != "process":
+        return None
+
+    worker = ProcessEmotionWorker(infer_fn=select_infer_fn(args.multiplayer),
+                                  workers=args.inference_workers).start()
+    print(f"[inference] backend=process workers={worker.workers}")
+    return worker
+
+
+class GameScene(Scene):
+    """
+    Scene permainan Mimic The Emoji (lihat run_game untuk detail alur).
+
+    Setup (tracker, frame analisis, worker inferensi, scheduler) dibuat
+    saat scene masuk; update() memproses satu frame; statistik dicetak
+    dan worker milik scene dihentikan saat scene keluar. Hasil scene
+    (result) adalah score akhir.
+
+    Parameters:
+        Sama dengan run_game (tanpa cap, sink, dan clock yang dimiliki
+        SceneEngine).
+    """
+
+    name = "game"
+    stop_on_source_end = True
+    reports_faces = True
+
+    def __init__(self, inference_policy="latest", multiplayer=False, max_players=4,
+                 infer_every=1, smoothing=None, game_duration=30, audio=True,
+                 analysis_width=DEFAULT_ANALYSIS_WIDTH, worker=None):
+        super().__init__()
+        self.inference_policy = inference_policy
+        self.multiplayer = multiplayer
+        self.max_players = max_players
+        self.infer_every = infer_every
+        self.smoothing = smoothing
+        self.game_duration = game_duration
+        self.audio = audio
+        self.analysis_width = analysis_width
+        self.worker = worker
+
+    def enter(self, engine):
+        super().enter(engine)
 
         # ---------------------------
-        # Gambar emoji target mengitari wajah
+        # Variabel utama game
         # ---------------------------
-        draw_floating_emojis(
-            frame,
-            round_emojis,
-            emoji_images,
-            face_box=face_box,
-            size=100,
-            matched_emojis=matched,
-            current_index=current_index
-        )
-
-        # Tampilkan emosi user saat ini (ikon kecil di HUD)
-        draw_current_emotion(frame, detected, emoji_images)
+        self.players = [new_player(self.smoothing)]   # state progres tiap pemain
+        self.start_time = None         # timestamp mulai (frame pertama)
+
+        # Mainkan background music (lewat thread audio, tidak menahan frame)
+        if self.audio:
+            post_audio_event("game_start")
 
         # ---------------------------
-        # LOGIKA PENC0C0KAN EMOJI
+        # Setup deteksi wajah & emoji
         # ---------------------------
-        if detected and current_index < len(round_emojis):
-
-            key = round_emojis[current_index]       # emoji target saat ini
-            target_emotion = emoji_map[key]         # konversi emoji → nama emosi
+        # Haar penuh tiap beberapa frame, di antaranya template tracking,
+        # keduanya pada frame analisis kecil
+        self.tracker = FaceTracker()
+        self.analysis = AnalysisFrame(self.analysis_width)
+        self.emoji_images = load_emoji_images("assets")  # load semua emoji PNG
 
-            # Jika emosi user sama dengan target:
-            if detected == target_emotion:
-                play_sfx("assets/audio/correct.mp3")
+        # ---------------------------
+        # Worker inferensi emosi (background thread / proses terpisah)
+        # ---------------------------
+        self.own_worker = self.worker is None
+        if self.own_worker:
+            self.worker = EmotionWorker(infer_fn=select_infer_fn(self.multiplayer),
+                                        policy=self.inference_policy).start()
+
+        # frame_id hasil yang terakhir diproses (hasil game sebelumnya diabaikan)
+        previous = self.worker.latest()
+        self.last_result_id = previous.frame_id if previous is not None else -1
+        self.frame_index = 0
+        self.loop_start = time.perf_counter()   # untuk throughput end-to-end
+
+        # Multi-player: ID track wajah → index pemain, dan index pemain
+        # per frame_id yang dikirim (hasil worker datang belakangan)
+        self.player_of = {}
+        self.pending_players = {}
+
+        # Scheduler: skip inferensi jika wajah tidak berubah
+        self.scheduler = InferenceScheduler()
+        self.stats_round = 1           # ronde yang sedang dicatat scheduler
+
+    def lap(self, stage):
+        # Tahap profiling game tanpa prefix (capture, detect, ...) → PERF_STAGES
+        profiler.lap(stage)
+
+    def _claim_player(self, box):
+        """
+        Memilih pemain untuk wajah (track) baru.
+
+        Urutan: pemain tanpa wajah yang terakhir terlihat di posisi ini
+        (track sempat hilang), pemain yang belum pernah punya wajah,
+        lalu pemain baru selama belum max_players.
+
+        Parameters:
+            box (tuple): Box wajah baru (x, y, w, h), koordinat display.
+
+        Returns:
+            int|None: Index pemain, atau None jika semua slot terpakai.
+        """
+        players = self.players
+        bound = set(self.player_of.values())
+        free = [i for i in range(len(players)) if i not in bound]
+
+        seen = [i for i in free if players[i]["last_box"] is not None]
+        near = max(seen, key=lambda i: box_iou(players[i]["last_box"], box), default=None)
+        if near is not None and box_iou(players[near]["last_box"], box) > 0.1:
+            return near
+
+        for i in free:
+            if players[i]["last_box"] is None:
+                return i
+
+        if len(players) < self.max_players:
+            players.append(new_player(self.smoothing))
+            return len(players) - 1
+        return None
+
+    def _assign_players(self, faces):
+        """
+        Memetakan wajah ke pemain lewat ID track FaceTracker.
+
+        Identitas pemain mengikuti track (asosiasi IoU), bukan urutan
+        kiri→kanan, sehingga score dan progres tidak berpindah orang
+        saat pemain bersilangan atau salah satunya keluar frame.
+
+        Parameters:
+            faces (list[tuple]): Box wajah (urutan sama dengan track_ids()).
+
+        Returns:
+            list[tuple[int, tuple]]: (index pemain, box) terurut per index.
+        """
+        ids = self.tracker.track_ids()
+        live = set(ids)
+        self.player_of = {t: i for t, i in self.player_of.items() if t in live}
+
+        visible = []
+        for track_id, box in zip(ids, faces):
+            index = self.player_of.get(track_id)
+            if index is None:
+                index = self._claim_player(box)
+                if index is None:
+                    continue
+                self.player_of[track_id] = index
+            self.players[index]["last_box"] = box
+            visible.append((index, box))
+        return sorted(visible)
+
+    def handle(self, event):
+        # Game berhenti jika user menekan 'q'
+        if event.kind == "key" and event.key == ord('q'):
+            self.finish()
+
+    def update(self, frame, now):
+        players = self.players
+        worker = self.worker
+        analysis = self.analysis
+        scheduler = self.scheduler
+        multiplayer = self.multiplayer
+        emoji_images = self.emoji_images
+
+        # Waktu game mengikuti clock (waktu dinding atau timestamp sumber)
+        if self.start_time is None:
+            self.start_time = now
+
+        # Frame analisis kecil (grayscale) dihitung sekali per frame
+        gray = analysis.gray(frame)
+
+        # Deteksi wajah (untuk floating emojis & crop input DeepFace),
+        # box dipetakan ke koordinat display
+        faces = analysis.to_display(self.tracker.update(gray))
+        self.lap("detect")
+
+        # Wajah terlihat → governor langsung bangun; selama idle
+        # (lama tanpa wajah) inferensi emosi dijeda
+        governor = self.engine.governor
+        governor.report_faces(len(faces))
+        on_schedule = self.frame_index % self.infer_every == 0 and not governor.idle
+        self.frame_index += 1
+
+        # Kirim frame ke worker (tidak blocking), ambil hasil terbaru
+        # (face_box dikirim agar DeepFace cukup menganalisis crop wajah)
+        if multiplayer:
+            # Pemain = track wajah (identitas tetap walau posisi berubah)
+            visible = self._assign_players(faces)
+            face_boxes = [box for _, box in visible]
+            if (face_boxes and on_schedule
+                    and scheduler.should_infer(gray, analysis.to_analysis(face_boxes), now)):
+                frame_id = worker.submit(frame, timestamp=now, face_boxes=face_boxes)
+                if frame_id is not None:
+                    self.pending_players[frame_id] = [index for index, _ in visible]
+        else:
+            face_boxes = faces[:1]
+            face_box = face_boxes[0] if face_boxes else None
+            if on_schedule and scheduler.should_infer(gray, analysis.to_analysis(face_boxes), now):
+                worker.submit(frame, timestamp=now, enforce_detection=False, face_box=face_box)
+
+        result = worker.latest()
+        is_new_result = result is not None and result.frame_id != self.last_result_id
+        if is_new_result:
+            # result.emotion berisi skor per kelas (list per wajah pada multi-player)
+            if multiplayer:
+                # Skor ke-k milik pemain yang wajahnya ke-k saat frame dikirim
+                owners = self.pending_players.pop(result.frame_id, [])
+                for frame_id in [f for f in self.pending_players if f < result.frame_id]:
+                    del self.pending_players[frame_id]
+                targets = [players[i] for i in owners]
+                all_scores = result.emotion
+            else:
+                targets, all_scores = players, [result.emotion]
+            for player, scores in zip(targets, all_scores):
+                player["smoother"].update(scores, result.timestamp)
+                player["detected"] = player["smoother"].smoothed_emotion()[0]
+            self.last_result_id = result.frame_id
+        if result is not None:
+            profiler.counter("result_age_ms", (now - result.timestamp) * 1000)
+        self.lap("schedule")
 
-                matched.add(key)
-                score += 1
-                current_index += 1
+        # ---------------------------
+        # Gambar emoji target mengitari wajah
+        # ---------------------------
+        if multiplayer:
+            for i, box in visible:
+                player = players[i]
+                draw_floating_emojis(
+                    frame,
+                    player["round_emojis"],
+                    emoji_images,
+                    face_box=box,
+                    size=100,
+                    matched_emojis=player["matched"],
+                    current_index=player["current_index"]
+                )
+                draw_player_label(frame, box, i + 1, player["score"], player["detected"])
+        else:
+            player = players[0]
+            draw_floating_emojis(
+                frame,
+                player["round_emojis"],
+                emoji_images,
+                face_box=face_box,
+                size=100,
+                matched_emojis=player["matched"],
+                current_index=player["current_index"]
+            )
+
+            # Tampilkan emosi user saat ini (ikon kecil di HUD)
+            draw_current_emotion(frame, player["detected"], emoji_images)
 
-                # Jika 3 emoji sudah berhasil → lanjut ronde berikutnya
-                if current_index == 3:
-                    round_num += 1
-                    matched.clear()
-                    current_index = 0
-                    round_emojis = get_random_emojis(3)
+        # ---------------------------
+        # LOGIKA PENC0C0KAN EMOJI
+        # ---------------------------
+        # Hanya emosi yang stabil (lolos smoothing + hold) yang dicocokkan;
+        # setelah cocok, hold di-reset agar tidak dihitung berkali-kali
+        for player in players:
+            stable = player["smoother"].stable_emotion(now)
+            round_num = player["round_num"]
+            if match_emotion(player, stable):
+                player["smoother"].reset_hold()
+                if self.audio:
+                    # Beberapa kecocokan beruntun digabung oleh thread audio
+                    post_audio_event("correct")
+                    if player["round_num"] != round_num:
+                        post_audio_event("round_complete")
 
         # ---------------------------
         # HUD: score, round, time
         # ---------------------------
-        remaining = max(0, int(game_duration - (time.time() - start_time)))
-        draw_simple_hud(frame, round_num, score, remaining)
+        remaining = max(0, int(self.game_duration - (now - self.start_time)))
+        leader = max(players, key=lambda p: p["score"])
+
+        # Catat statistik scheduler tiap kali ronde berganti
+        if leader["round_num"] != self.stats_round:
+            scheduler.end_round(self.stats_round, worker.stats()["avg_inference_ms"])
+            self.stats_round = leader["round_num"]
+        draw_simple_hud(frame, leader["round_num"], leader["score"], remaining)
+        self.lap("render")
+
+        # Overlay FPS/latency (hanya saat profiling aktif)
+        if profiler.enabled:
+            draw_perf_overlay(frame, profiler.stats(), PERF_STAGES)
+
+        # Game berhenti jika waktu habis (frame ini tetap ditampilkan)
+        if remaining == 0:
+            self.finish()
+        return frame
+
+    def exit(self):
+        players = self.players
+        worker = self.worker
+        scheduler = self.scheduler
+
+        # Hentikan worker inferensi (jika dibuat di sini) & laporkan statistik
+        if self.own_worker:
+            worker.stop()
+        elapsed = time.perf_counter() - self.loop_start
+        frame_index = self.frame_index
+        print(f"[pipeline] frames={frame_index} elapsed={elapsed:.2f} s "
+              f"throughput={frame_index / elapsed if elapsed else 0:.1f} fps")
+
+        stats = worker.stats()
+        print(f"[inference] submitted={stats['frames_submitted']} "
+              f"inferred={stats['frames_inferred']} dropped={stats['frames_dropped']} "
+              f"avg={stats['avg_inference_ms']:.1f} ms")
+
+        tracking = self.tracker.stats()
+        print(f"[tracker] detections={tracking['detections']}/{tracking['frames']} frames "
+              f"detect={tracking['detect_ms_per_frame']:.2f} ms/frame "
+              f"track={tracking['track_ms_per_frame']:.2f} ms/frame")
+
+        scheduler.end_round(self.stats_round, stats["avg_inference_ms"])
+        for r in scheduler.rounds:
+            print(f"[scheduler] round {r['round']}: skip_ratio={r['skip_ratio']:.0%} "
+                  f"cpu_saved~{r['cpu_saved_ms']:.0f} ms reasons={r['reasons']}")
+
+        if self.multiplayer:
+            for i, player in enumerate(players):
+                print(f"[game] P{i + 1} score={player['score']} round={player['round_num']}")
+
+        # Stop background music ketika game selesai
+        if self.audio:
+            post_audio_event("game_end")
+
+        self.result = max(player["score"] for player in players)
+
+
+def run_game(cap, inference_policy="latest", multiplayer=False, max_players=4,
+             infer_every=1, smoothing=None, sink=None, clock=None,
+             game_duration=30, audio=True, analysis_width=DEFAULT_ANALYSIS_WIDTH,
+             worker=None):
+    """
+    Fungsi utama loop permainan Mimic The Emoji.
+
+    Game akan:
+    - Mengambil ekspresi wajah user melalui kamera.
+    - Membandingkan hasil deteksi emosi dengan urutan target emoji.
+    - Memberikan poin jika sesuai.
+    - Menampilkan HUD (score, round, timer).
+    - Mengakhiri game setelah waktu habis atau user keluar.
+
+    Deteksi emosi berjalan di EmotionWorker (background thread) sehingga
+    tampilan tetap mengikuti frame rate kamera; logika pencocokan memakai
+    hasil inferensi terbaru yang sudah selesai.
+
+    Pada mode multi-player, setiap wajah yang terdeteksi menjadi satu
+    pemain (identitas mengikuti track wajah) dengan score, progres emoji,
+    dan posisi floating emoji masing-masing. Semua wajah diklasifikasi
+    dalam satu batch inferensi.
+
+    Hasil inferensi tidak langsung dicocokkan: probabilitas per kelas
+    dihaluskan oleh EmotionSmoother, dan emoji baru dianggap cocok jika
+    emosinya bertahan di atas threshold selama hold_ms. Karena itu
+    inferensi cukup dijalankan tiap frame ke-k (infer_every).
+
+    InferenceScheduler juga melewati inferensi selama wajah statis dan
+    memakai ulang hasil terakhir (dengan batas umur maksimum).
+
+    Frame hasil render dikirim ke sink (default window OpenCV). Dengan
+    sink headless (VideoWriterSink/RawSink/NullSink) dan clock dari
+    timestamp sumber, game bisa dijalankan tanpa display dan hasilnya
+    deterministik untuk replay rekaman.
+
+    Grayscale, deteksi wajah, dan motion check berjalan di frame analisis
+    beresolusi rendah (analysis_width); box wajah dipetakan kembali ke
+    koordinat display untuk emoji dan crop inferensi.
+
+    Wrapper GameScene: dengan sink default, scene berjalan di
+    SceneEngine milik cap (window, antrean input, buffer yang sama
+    dengan menu); sink/clock lain memakai engine tersendiri.
+
+    Parameters:
+        cap (ThreadedCapture|FrameSource): Sumber frame aktif (sudah di-mirror).
+        inference_policy (str): Kebijakan antrean worker,
+            "latest", "drop_oldest", atau "sync".
+        multiplayer (bool): Aktifkan mode multi-player.
+        max_players (int): Jumlah pemain maksimum pada mode multi-player.
+        infer_every (int): Kirim frame ke worker setiap frame ke-k.
+        smoothing (dict|None): Argumen EmotionSmoother (window, mode,
+            tau_ms, threshold, hold_ms, stale_ms).
+        sink (WindowSink|NullSink|None): Tujuan frame (default WindowSink).
+        clock (callable|None): Jam game dalam detik (default time.time),
+            mis. make_clock(cap, "source").
+        game_duration (float): Lama permainan (detik menurut clock).
+        audio (bool): Kirim event audio (BGM & SFX) ke thread audio.
+        analysis_width (int|None): Lebar frame analisis (None = resolusi penuh).
+        worker (EmotionWorker|ProcessEmotionWorker|None): Worker inferensi
+            yang sudah berjalan (dipakai ulang antar game, tidak dihentikan
+            di sini). None → EmotionWorker baru dengan inference_policy.
+
+    Returns:
+        int: Score akhir pemain (score tertinggi pada mode multi-player).
+    """
+    scene = GameScene(inference_policy=inference_policy, multiplayer=multiplayer,
+                      max_players=max_players, infer_every=infer_every,
+                      smoothing=smoothing, game_duration=game_duration, audio=audio,
+                      analysis_width=analysis_width, worker=worker)
+    if sink is None and clock is None:
+        engine = engine_for(cap)
+    else:
+        engine = SceneEngine(cap, sink=sink, clock=clock)
+    return engine.run_scene(scene)
+
+
+def parse_args(argv=None):
+    """
+    Membaca argumen command line.
+
+    Parameters:
+        argv (list[str]|None): Daftar argumen (default: sys.argv).
 
-        # Tampilkan frame
-        cv2.imshow("Mimic The Emoji", frame)
+    Returns:
+        argparse.Namespace: Opsi program.
+    """
+    parser = argparse.ArgumentParser(description="Mimic The Emoji")
+    parser.add_argument("--multiplayer", action="store_true",
+                        help="mode multi-player (setiap wajah = satu pemain)")
+    parser.add_argument("--max-players", type=int, default=4,
+                        help="jumlah pemain maksimum pada mode multi-player")
+    parser.add_argument("--infer-every", type=int, default=1,
+                        help="jalankan inferensi emosi setiap frame ke-k")
+    parser.add_argument("--smoothing", choices=SMOOTHING_MODES, default="ema",
+                        help="metode smoothing emosi")
+    parser.add_argument("--hold-ms", type=float, default=300,
+                        help="lama emosi harus bertahan sebelum dihitung cocok")
+    parser.add_argument("--headless", action="store_true",
+                        help="tanpa window/menu: satu game, frame ke --output")
+    parser.add_argument("--output", default=None,
+                        help="tujuan frame headless: file video, raw[:path] (raw = stdout, log ke stderr), atau null")
+    parser.add_argument("--clock", choices=CLOCK_MODES, default=None,
+                        help="jam game (default: source saat headless, wall jika tidak)")
+    parser.add_argument("--duration", type=float, default=30,
+                        help="lama permainan dalam detik")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed urutan emoji target pada mode headless")
+    parser.add_argument("--analysis-width", type=int, default=DEFAULT_ANALYSIS_WIDTH,
+                        help="lebar frame analisis untuk deteksi wajah (0 = resolusi penuh)")
+    parser.add_argument("--inference-backend", choices=INFERENCE_BACKENDS, default="thread",
+                        help="thread = inferensi di proses game, process = proses terpisah")
+    parser.add_argument("--inference-workers", type=int, default=1,
+                        help="jumlah proses inferensi untuk backend process")
+    parser.add_argument("--inference-policy", choices=QUEUE_POLICIES, default=None,
+                        help="antrean frame worker: latest, drop_oldest, atau sync "
+                             "(default latest; headless dengan --clock source: sync)")
+    parser.add_argument("--emotion-backend", choices=EMOTION_BACKENDS, default="deepface",
+                        help="classifier emosi: deepface (TensorFlow) atau onnx (cv2.dnn/onnxruntime)")
+    parser.add_argument("--emotion-model", default=None,
+                        help="path model .onnx untuk --emotion-backend onnx")
+    parser.add_argument("--emotion-preset", choices=list(ONNX_PRESETS), default="deepface",
+                        help="jenis model ONNX (preprocessing & urutan label)")
+    parser.add_argument("--audio", choices=AUDIO_BACKENDS, default="pygame",
+                        help="output audio: pygame, atau null untuk mesin tanpa perangkat suara")
+    parser.add_argument("--idle-after", type=float, default=IDLE_AFTER_S,
+                        help="detik tanpa wajah sebelum mode idle hemat daya (0 = mati)")
+    parser.add_argument("--idle-fps", type=float, default=IDLE_FPS,
+                        help="target FPS selama mode idle")
+    parser.add_argument("--profile", action="store_true",
+                        help="aktifkan profiling + overlay FPS/latency (atau env MIMIC_PROFILE=1)")
+    parser.add_argument("--trace", default=None,
+                        help="simpan Chrome-trace JSON sesi ini ke path ini")
+    add_source_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.idle_fps <= 0:
+        parser.error("--idle-fps harus > 0")
+    if args.inference_backend == "process" and args.inference_policy not in (None, "latest"):
+        parser.error('--inference-backend process hanya mendukung --inference-policy latest')
+    return args
+
+
+def run_headless(args):
+    """
+    Menjalankan satu game tanpa display, menu, dan audio.
 
-        # Game berhenti jika:
-        # 1) user menekan 'q'
-        # 2) waktu habis
-        if cv2.waitKey(1) & 0xFF == ord('q') or remaining == 0:
-            break
+    Frame hasil render (HUD, floating emoji, emosi saat ini) dikirim ke
+    sink dari --output. Dengan clock "source", inferensi dijalankan
+    sinkron sehingga replay rekaman selalu memberi hasil yang sama dan
+    bisa diproses lebih cepat dari real-time (--pacing fast).
 
-    # Stop background music ketika game selesai
-    stop_bgm()
+    Parameters:
+        args (argparse.Namespace): Opsi dari parse_args().
 
+    Returns:
+        int: Score akhir.
+    """
+    cap = open_source_from_args(args)
+    clock_mode = args.clock or "source"
+    sink = open_sink(args.output or "null", fps=cap.get(cv2.CAP_PROP_FPS) or 30.0)
+
+    load_emotion_model()
+    worker = start_process_worker(args)
+
+    # Urutan emoji target tetap → replay deterministik
+    random.seed(args.seed)
+
+    t0 = time.perf_counter()
+    try:
+        policy = args.inference_policy or ("sync" if clock_mode == "source" else "latest")
+        score = run_game(cap, inference_policy=policy,
+                         multiplayer=args.multiplayer,
+                         max_players=args.max_players,
+                         infer_every=max(1, args.infer_every),
+                         smoothing={"mode": args.smoothing, "hold_ms": args.hold_ms},
+                         sink=sink, clock=make_clock(cap, clock_mode),
+                         game_duration=args.duration, audio=False,
+                         analysis_width=args.analysis_width, worker=worker)
+    finally:
+        if worker is not None:
+            worker.stop()
+        sink.close()
+        cap.release()
+
+    elapsed = time.perf_counter() - t0
+    print(f"[headless] score={score} frames={sink.frames_written} "
+          f"render={elapsed:.2f} s output={args.output or 'null'}")
     return score
 
 
-def main():
+def main(args=None):
     """
     Fungsi utama untuk menjalankan keseluruhan alur program:
 
     1. Mengaktifkan kamera & window.
-    2. Menampilkan main menu.
+    2. Menampilkan main menu (load + warm-up model di background,
+       tombol Start aktif setelah model siap).
     3. Menampilkan countdown.
     4. Menjalankan game loop.
     5. Menyimpan highscore.
     6. Menampilkan layar Game Over.
     7. Mengulang jika user ingin kembali ke menu.
 
+    Dengan --headless, satu game dijalankan tanpa window (run_headless).
+    Jika profiling aktif, Chrome trace disimpan saat program selesai.
+
     Parameters:
-        None
+        args (argparse.Namespace|None): Opsi dari parse_args().
 
     Returns:
         None
     """
 
-    # Inisialisasi kamera
-    cap = cv2.VideoCapture(0)
-    cv2.namedWindow("Mimic The Emoji", cv2.WINDOW_NORMAL)
-    cv2.resizeWindow("Mimic The Emoji", 1600, 900)
+    if args is None:
+        args = parse_args([])
 
-    # Inisialisasi audio pygame
-    init_audio()
+    # Profiling: flag --profile/--trace atau env MIMIC_PROFILE
+    if args.profile or args.trace:
+        profiler.enable(args.trace)
 
-    # ---------------------------
-    # LOOP UTAMA PROGRAM
-    # ---------------------------
-    while True:
+    set_emotion_backend(args.emotion_backend, args.emotion_model, args.emotion_preset)
 
-        # Tampilkan Main Menu (return False jika user keluar)
-        if not show_main_menu(cap):
-            break
+    try:
+        if args.headless:
+            run_headless(args)
+        else:
+            run_interactive(args)
+    finally:
+        trace_path = profiler.dump_chrome_trace()
+        if trace_path:
+            print(f"[profile] Chrome trace: {trace_path}")
 
-        # Hitung mundur sebelum game dimulai
-        show_countdown(cap)
 
-        # Jalankan game → dapatkan score
-        score = run_game(cap)
+def run_interactive(args):
+    """
+    Alur interaktif: menu → countdown → game → game over, berulang.
 
-        # ---------------------------
-        # Load & update highscore file
-        # ---------------------------
-        try:
-            highscore = int(open("highscore.txt").read())
-        except:
-            highscore = 0
+    Parameters:
+        args (argparse.Namespace): Opsi dari parse_args().
 
-        if score > highscore:
-            highscore = score
-            with open("highscore.txt", "w") as f:
-                f.write(str(highscore))
+    Returns:
+        None
+    """
 
-        # ---------------------------
-        # Layar Game Over
-        # ---------------------------
-        action = show_game_over(cap, score, highscore)
+    startup = StartupTimer(_STARTUP_T0)
 
-        # Jika user memilih quit
-        if action == "quit":
-            break
+    # Inisialisasi sumber frame (default kamera: dibaca di thread sendiri &
+    # di-mirror in-place), dipakai bersama oleh menu, countdown, game, game over
+    cap = open_source_from_args(args)
+    cv2.namedWindow("Mimic The Emoji", cv2.WINDOW_NORMAL)
+    cv2.resizeWindow("Mimic The Emoji", 1600, 900)
+
+    # Inisialisasi audio (preload SFX + thread audio)
+    init_audio(args.audio)
 
-        # Jika user memilih menu → ulangi loop
+    # Model emosi TIDAK di-load di sini: menu tampil dulu, model (DeepFace/
+    # TensorFlow) di-load di background oleh MenuScene. Dengan backend
+    # process, proses anak yang me-load model dan menu menunggu mereka siap.
+    worker = start_process_worker(args)
+    status_fn = worker.loading_status if worker is not None else None
 
-    cap.release()
-    cv2.destroyAllWindows()
+    # Satu engine: satu capture, satu window, satu antrean input untuk semua scene
+    # Governor: target FPS per scene + mode idle saat lama tidak ada wajah
+    engine = SceneEngine(cap, clock=make_clock(cap, args.clock or "wall"),
+                         governor=FrameGovernor(args.idle_after, args.idle_fps))
+
+    try:
+        # ---------------------------
+        # LOOP UTAMA PROGRAM
+        # ---------------------------
+        while True:
+
+            # Tampilkan Main Menu (return False jika user keluar)
+            if not engine.run_scene(MenuScene(status_fn=status_fn, startup=startup)):
+                break
+
+            # Hitung mundur sebelum game dimulai
+            engine.run_scene(CountdownScene())
+
+            # Jalankan game → dapatkan score
+            score = engine.run_scene(GameScene(
+                inference_policy=args.inference_policy or "latest",
+                multiplayer=args.multiplayer,
+                max_players=args.max_players,
+                infer_every=max(1, args.infer_every),
+                smoothing={"mode": args.smoothing, "hold_ms": args.hold_ms},
+                game_duration=args.duration,
+                analysis_width=args.analysis_width, worker=worker))
+
+            # ---------------------------
+            # Load & update highscore file
+            # ---------------------------
+            try:
+                highscore = int(open("highscore.txt").read())
+            except:
+                highscore = 0
+
+            if score > highscore:
+                highscore = score
+                with open("highscore.txt", "w") as f:
+                    f.write(str(highscore))
+
+            # ---------------------------
+            # Layar Game Over
+            # ---------------------------
+            action = engine.run_scene(GameOverScene(score, highscore))
+
+            # Jika user memilih quit
+            if action == "quit":
+                break
+
+            # Jika user memilih menu → ulangi loop
+    finally:
+        # Shutdown bersih: proses inferensi, shared memory, audio, kamera, window
+        if worker is not None:
+            worker.stop()
+        shutdown_audio()
+        engine.cpu_report()
+        print(f"[camera] source={args.source} fps={cap.fps:.1f}")
+        cap.release()
+        cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
-    main()
+    main(parse_args())
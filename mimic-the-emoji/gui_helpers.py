@@ -2,6 +2,8 @@ import time
 import numpy as np
 import cv2
 from emotion_utils import emoji_map
+from emoji_overlay import get_sprite
+from alpha_blend import blit_sprite, sprite_from_alpha
 
 # ===========================================================
 #   MENAMPILKAN BEBERAPA BARIS TEKS VERTIKAL
@@ -31,67 +33,164 @@ def draw_text_lines(img, lines, start=(10, 30), line_height=40, scale=0.9, color
 
 
 # ===========================================================
-#   HUD SEDERHANA (Ronde, Waktu, Score)
+#   GELAPKAN AREA PERSEGI (IN-PLACE, HANYA ROI)
 # ===========================================================
-def draw_simple_hud(frame, round_num, score, remaining):
+def darken_rect(frame, pt1, pt2, opacity):
     """
-    Menampilkan HUD di bagian atas layar berisi:
-    - Round
-    - Time
-    - Score
+    Menggelapkan area persegi seperti overlay hitam semi-transparan.
 
-    Teks diberi background semi-transparan agar mudah dibaca.
+    Setara dengan menggambar kotak hitam di salinan frame lalu
+    addWeighted(overlay, opacity, frame, 1 - opacity), tetapi hanya ROI
+    kotak yang diproses dan langsung ditulis ke frame.
 
     Parameters:
         frame (numpy.ndarray): Frame OpenCV.
-        round_num (int): Ronde permainan.
-        score (int): Score pemain.
-        remaining (int): Sisa waktu (detik).
+        pt1 (tuple[int, int]): Titik kiri-atas (x1, y1).
+        pt2 (tuple[int, int]): Titik kanan-bawah (x2, y2), inklusif.
+        opacity (float): Opasitas kotak hitam (0–1).
 
     Returns:
         None
+        (Modifies frame directly)
     """
-    text = f"Round: {round_num}   Time: {remaining}s   Score: {score}"
-
     h, w = frame.shape[:2]
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    font_scale = 0.8
-    thickness = 2
+    x1, y1 = max(0, pt1[0]), max(0, pt1[1])
+    x2, y2 = min(w, pt2[0] + 1), min(h, pt2[1] + 1)
+    if x1 >= x2 or y1 >= y2:
+        return
+
+    roi = frame[y1:y2, x1:x2]
+    cv2.convertScaleAbs(roi, dst=roi, alpha=1.0 - opacity)
+
+
+# ===========================================================
+#   TEKS SEBAGAI SPRITE (DIRASTER SEKALI)
+# ===========================================================
+def make_text_sprite(text, font, font_scale, color, thickness):
+    """
+    Merender teks cv2.putText ke sprite pre-multiplied alpha.
+
+    Parameters:
+        text (str): Teks.
+        font (int): Font Hershey OpenCV.
+        font_scale (float): Skala font.
+        color (tuple): Warna teks (BGR).
+        thickness (int): Ketebalan garis.
 
-    # Hitung ukuran teks untuk centering
+    Returns:
+        tuple[Sprite, tuple[int, int]]: Sprite dan offset (dx, dy)
+        dari titik baseline putText ke pojok kiri-atas sprite.
+    """
     (text_width, text_height), baseline = cv2.getTextSize(
         text, font, font_scale, thickness)
 
-    x = (w - text_width) // 2
-    y = 50
+    pad = thickness + 1
+    mask = np.zeros((text_height + baseline + 2 * pad, text_width + 2 * pad), np.uint8)
+    cv2.putText(mask, text, (pad, pad + text_height), font,
+                font_scale, 255, thickness, cv2.LINE_AA)
 
-    # Auto-scale jika teks terlalu panjang
-    if text_width > w - 40:
-        font_scale = (w - 40) / text_width * 0.8
-        thickness = 1
+    return sprite_from_alpha(color, mask, text), (-pad, -pad - text_height)
+
+
+# ===========================================================
+#   HUD SEDERHANA (Ronde, Waktu, Score)
+# ===========================================================
+class HudLayer:
+    """
+    Layer HUD yang sudah dirender sebelumnya.
+
+    Layout (posisi box, skala font) dan raster teks hanya dihitung
+    ulang ketika teks atau ukuran frame berubah, yaitu ketika score,
+    round, atau detik sisa berganti. Tiap frame hanya ROI box yang
+    digelapkan dan sprite teks di-blit, sehingga biayanya tidak
+    bergantung pada resolusi kamera.
+    """
+
+    def __init__(self):
+        self._key = None
+        self._layout = None
+
+    def _build(self, text, w, h):
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        font_scale = 0.8
+        thickness = 2
+
+        # Hitung ukuran teks untuk centering
         (text_width, text_height), baseline = cv2.getTextSize(
             text, font, font_scale, thickness)
+
         x = (w - text_width) // 2
+        y = 50
 
-    # Background box semi-transparan
-    padding_x = 20
-    padding_y = 12
+        # Auto-scale jika teks terlalu panjang
+        if text_width > w - 40:
+            font_scale = (w - 40) / text_width * 0.8
+            thickness = 1
+            (text_width, text_height), baseline = cv2.getTextSize(
+                text, font, font_scale, thickness)
+            x = (w - text_width) // 2
 
-    box_x1 = max(0, x - padding_x)
-    box_y1 = max(0, y - text_height - padding_y)
-    box_x2 = min(w, x + text_width + padding_x)
-    box_y2 = min(h, y + padding_y // 2)
+        # Background box semi-transparan
+        padding_x = 20
+        padding_y = 12
 
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (box_x1, box_y1),
-                  (box_x2, box_y2), (0, 0, 0), -1)
+        box = ((max(0, x - padding_x), max(0, y - text_height - padding_y)),
+               (min(w, x + text_width + padding_x), min(h, y + padding_y // 2)))
 
-    # Blend overlay → frame untuk transparansi
-    frame[:] = cv2.addWeighted(overlay, 0.45, frame, 0.55, 0)
+        sprite, (dx, dy) = make_text_sprite(
+            text, font, font_scale, (255, 255, 255), thickness)
 
-    # Gambar teks
-    cv2.putText(frame, text, (x, y), font,
-                font_scale, (255, 255, 255), thickness, cv2.LINE_AA)
+        return box, sprite, (x + dx, y + dy)
+
+    def draw(self, frame, text):
+        """
+        Menggambar HUD dengan teks tertentu ke frame (in-place).
+
+        Parameters:
+            frame (numpy.ndarray): Frame OpenCV.
+            text (str): Teks HUD.
+
+        Returns:
+            None
+        """
+        h, w = frame.shape[:2]
+        key = (text, w, h)
+        if key != self._key:
+            self._layout = self._build(text, w, h)
+            self._key = key
+
+        box, sprite, pos = self._layout
+        darken_rect(frame, box[0], box[1], 0.45)
+        blit_sprite(frame, sprite, pos)
+
+
+# layer HUD bawaan untuk draw_simple_hud()
+_hud_layer = HudLayer()
+
+
+def draw_simple_hud(frame, round_num, score, remaining, layer=None):
+    """
+    Menampilkan HUD di bagian atas layar berisi:
+    - Round
+    - Time
+    - Score
+
+    Teks diberi background semi-transparan agar mudah dibaca.
+    Background hanya digelapkan pada area box (tanpa menyalin frame),
+    dan teks diambil dari HudLayer yang di-cache.
+
+    Parameters:
+        frame (numpy.ndarray): Frame OpenCV.
+        round_num (int): Ronde permainan.
+        score (int): Score pemain.
+        remaining (int): Sisa waktu (detik).
+        layer (HudLayer|None): Layer cache (default layer bawaan).
+
+    Returns:
+        None
+    """
+    text = f"Round: {round_num}   Time: {remaining}s   Score: {score}"
+    (layer or _hud_layer).draw(frame, text)
 
 
 # ===========================================================
@@ -160,29 +259,19 @@ def draw_floating_emojis(frame, emoji_keys, emoji_images,
     for i, key in enumerate(emoji_keys):
 
         emotion = emoji_map[key]   # map emoji → nama emotion
-        img = emoji_images.get(emotion)
 
-        if img is None:
+        # Sprite sudah di-resize & pre-multiplied (cache)
+        sprite = get_sprite(emoji_images, emotion, size)
+        if sprite is None:
             continue
 
-        # Resize emoji
-        resized = cv2.resize(img, (size, size), interpolation=cv2.INTER_AREA)
-
         x, y = positions[i]
         x, y = max(0, x), max(0, y)
 
         # ---------------------------
         # Gambar emoji (dengan alpha)
         # ---------------------------
-        if resized.shape[2] == 4:
-            alpha = resized[:, :, 3]
-            overlay = resized[:, :, :3]
-            from emoji_overlay import overlay_image_alpha
-            overlay_image_alpha(frame, overlay, (x, y), alpha)
-        else:
-            h, w = resized.shape[:2]
-            if y + h <= frame.shape[0] and x + w <= frame.shape[1]:
-                frame[y:y+h, x:x+w] = resized
+        blit_sprite(frame, sprite, (x, y))
 
         # ---------------------------
         # Highlight kuning → target sekarang
@@ -220,30 +309,20 @@ def draw_current_emotion(frame, detected_emotion, emoji_images, size=60):
     if detected_emotion is None:
         return
 
-    img = emoji_images.get(detected_emotion)
-    if img is None:
+    sprite = get_sprite(emoji_images, detected_emotion, size)
+    if sprite is None:
         return
 
     h, w = frame.shape[:2]
 
-    resized = cv2.resize(img, (size, size), interpolation=cv2.INTER_AREA)
-
     # Posisi panel
     x = 20
     y = h - size - 90
     box_w = 100
     box_h = size + 55
 
-    # Background semi transparan
-    overlay = frame.copy()
-    cv2.rectangle(
-        overlay,
-        (x - 10, y - 10),
-        (x - 10 + box_w, y - 10 + box_h),
-        (0, 0, 0),
-        -1
-    )
-    cv2.addWeighted(overlay, 0.35, frame, 0.65, 0, frame)
+    # Background semi transparan (hanya area panel)
+    darken_rect(frame, (x - 10, y - 10), (x - 10 + box_w, y - 10 + box_h), 0.35)
 
     # Text label
     cv2.putText(frame, "Current Emotion:", (x, y + 15),
@@ -254,10 +333,79 @@ def draw_current_emotion(frame, detected_emotion, emoji_images, size=60):
     emoji_x = x + 10
     emoji_y = y + 25
 
-    if resized.shape[2] == 4:
-        alpha = resized[:, :, 3]
-        overlay_emoji = resized[:, :, :3]
-        from emoji_overlay import overlay_image_alpha
-        overlay_image_alpha(frame, overlay_emoji, (emoji_x, emoji_y), alpha)
-    else:
-        frame[emoji_y:emoji_y+size, emoji_x:emoji_x+size] = resized
+    blit_sprite(frame, sprite, (emoji_x, emoji_y))
+
+
+# ===========================================================
+#   LABEL PEMAIN (MODE MULTI-PLAYER)
+# ===========================================================
+def draw_player_label(frame, face_box, player_num, score, detected_emotion=None):
+    """
+    Menampilkan label pemain di bawah bounding box wajahnya, berisi
+    nomor pemain, score, dan emosi yang sedang terdeteksi.
+
+    Parameters:
+        frame (numpy.ndarray): Frame OpenCV.
+        face_box (tuple): (x, y, w, h) bounding box wajah pemain.
+        player_num (int): Nomor pemain (mulai dari 1).
+        score (int): Score pemain.
+        detected_emotion (str|None): Emosi terdeteksi terakhir.
+
+    Returns:
+        None
+    """
+    x, y, w, h = face_box
+    text = f"P{player_num}  Score: {score}"
+    if detected_emotion:
+        text += f"  ({detected_emotion})"
+
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    (text_width, text_height), _ = cv2.getTextSize(text, font, 0.6, 2)
+
+    tx = max(0, x + (w - text_width) // 2)
+    ty = min(frame.shape[0] - 10, y + h + text_height + 15)
+
+    # Background gelap agar teks tetap terbaca
+    cv2.rectangle(frame, (tx - 8, ty - text_height - 8),
+                  (tx + text_width + 8, ty + 8), (0, 0, 0), -1)
+    cv2.putText(frame, text, (tx, ty), font, 0.6,
+                (0, 255, 255), 2, cv2.LINE_AA)
+
+
+# ===========================================================
+#   OVERLAY PERFORMA (PROFILING AKTIF)
+# ===========================================================
+def draw_perf_overlay(frame, stats, stages=None):
+    """
+    Menampilkan panel kecil di kanan atas berisi FPS dan latency
+    tiap tahap (rata-rata sampel terakhir), di samping HUD.
+
+    Parameters:
+        frame (numpy.ndarray): Frame OpenCV.
+        stats (dict): Hasil Profiler.stats().
+        stages (list[str]|None): Urutan tahap yang ditampilkan
+            (default semua tahap yang tercatat).
+
+    Returns:
+        None
+    """
+    lines = [f"FPS {stats['fps']:5.1f}  {stats['frame_ms']:5.1f} ms"]
+
+    names = stages if stages is not None else sorted(stats["stages"])
+    for name in names:
+        s = stats["stages"].get(name)
+        if s:
+            lines.append(f"{name:<12}{s['avg']:6.1f} /{s['max']:6.1f} ms")
+    for name, value in sorted(stats["counters"].items()):
+        lines.append(f"{name:<12}{value:6.0f}")
+
+    font = cv2.FONT_HERSHEY_PLAIN
+    line_height = 16
+    box_w = 280
+    x = max(0, frame.shape[1] - box_w - 10)
+    y = 10
+
+    darken_rect(frame, (x, y), (x + box_w, y + line_height * len(lines) + 8), 0.55)
+    for i, line in enumerate(lines):
+        cv2.putText(frame, line, (x + 8, y + 16 + i * line_height), font, 1.0,
+                    (0, 255, 0), 1, cv2.LINE_AA)
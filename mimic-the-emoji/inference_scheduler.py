@@ -0,0 +1,158 @@
+import time
+from collections import Counter
+
+import cv2
+import numpy as np
+
+
+# ===========================================================
+#   SCHEDULER INFERENSI ADAPTIF (SKIP JIKA WAJAH STATIS)
+# ===========================================================
+class InferenceScheduler:
+    """
+    Menentukan kapan inferensi emosi perlu dijalankan ulang.
+
+    Sinyal perubahan yang dipakai (murah dihitung):
+    - Mean absolute difference (MAD) thumbnail grayscale ROI wajah
+      terhadap thumbnail saat inferensi terakhir.
+    - Pergeseran/perubahan ukuran bounding box Haar.
+    - Jumlah wajah berubah.
+    - Umur hasil terakhir melebihi max_staleness_ms.
+
+    Jika tidak ada perubahan berarti, hasil terakhir dipakai ulang.
+
+    Parameters:
+        mad_threshold (float): Ambang MAD (skala 0–255).
+        move_threshold (float): Ambang pergeseran box, relatif
+            terhadap ukuran box.
+        max_staleness_ms (float): Umur maksimum hasil yang dipakai ulang.
+        thumb_size (tuple[int, int]): Ukuran thumbnail pembanding.
+    """
+
+    def __init__(self, mad_threshold=6.0, move_threshold=0.08,
+                 max_staleness_ms=500, thumb_size=(24, 24)):
+        self.mad_threshold = mad_threshold
+        self.move_threshold = move_threshold
+        self.max_staleness = max_staleness_ms / 1000.0
+        self.thumb_size = thumb_size
+
+        # Referensi saat inferensi terakhir
+        self._last_thumbs = None
+        self._last_boxes = None
+        self._last_time = None
+
+        self.rounds = []           # ringkasan statistik per ronde
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.frames = 0
+        self.inferred = 0
+        self.skipped = 0
+        self.reasons = Counter()   # alasan inferensi ulang
+
+    def _thumbnail(self, gray, box):
+        """Thumbnail grayscale kecil dari ROI wajah (atau seluruh frame)."""
+        if box is not None:
+            x, y, w, h = [int(v) for v in box]
+            roi = gray[max(0, y):y + h, max(0, x):x + w]
+            if roi.size == 0:
+                roi = gray
+        else:
+            roi = gray
+        return cv2.resize(roi, self.thumb_size, interpolation=cv2.INTER_AREA)
+
+    def _box_moved(self, old, new):
+        """True jika box bergeser/berubah ukuran melebihi move_threshold."""
+        ox, oy, ow, oh = old
+        nx, ny, nw, nh = new
+        scale = max(ow, oh, 1)
+        shift = max(abs((nx + nw / 2) - (ox + ow / 2)),
+                    abs((ny + nh / 2) - (oy + oh / 2))) / scale
+        resize = abs(max(nw, nh) - scale) / scale
+        return max(shift, resize) > self.move_threshold
+
+    def _change_reason(self, thumbs, face_boxes, now):
+        """Alasan inferensi ulang, atau None jika hasil lama masih valid."""
+        if self._last_thumbs is None:
+            return "first"
+        if now - self._last_time > self.max_staleness:
+            return "stale"
+        if len(face_boxes) != len(self._last_boxes):
+            return "faces"
+        for old, new in zip(self._last_boxes, face_boxes):
+            if self._box_moved(old, new):
+                return "motion"
+        for old, new in zip(self._last_thumbs, thumbs):
+            mad = np.mean(cv2.absdiff(old, new))
+            if mad > self.mad_threshold:
+                return "change"
+        return None
+
+    def should_infer(self, gray, face_boxes, now=None):
+        """
+        Memutuskan apakah frame ini perlu diinferensi.
+
+        Parameters:
+            gray (numpy.ndarray): Frame grayscale.
+            face_boxes (list[tuple]): Box wajah (boleh kosong →
+                seluruh frame dijadikan pembanding).
+            now (float|None): Timestamp frame (default time.time()).
+
+        Returns:
+            bool: True jika inferensi perlu dijalankan.
+        """
+        if now is None:
+            now = time.time()
+
+        face_boxes = list(face_boxes)
+        thumbs = [self._thumbnail(gray, box) for box in face_boxes] or [self._thumbnail(gray, None)]
+
+        self.frames += 1
+        reason = self._change_reason(thumbs, face_boxes, now)
+
+        if reason is None:
+            self.skipped += 1
+            return False
+
+        self._last_thumbs = thumbs
+        self._last_boxes = face_boxes
+        self._last_time = now
+        self.inferred += 1
+        self.reasons[reason] += 1
+        return True
+
+    def stats(self, avg_inference_ms=0.0):
+        """
+        Ringkasan statistik sejak awal ronde.
+
+        Parameters:
+            avg_inference_ms (float): Rata-rata biaya satu inferensi,
+                dipakai untuk estimasi CPU time yang dihemat.
+
+        Returns:
+            dict: frames, inferred, skipped, skip_ratio, cpu_saved_ms, reasons.
+        """
+        return {
+            "frames": self.frames,
+            "inferred": self.inferred,
+            "skipped": self.skipped,
+            "skip_ratio": self.skipped / self.frames if self.frames else 0.0,
+            "cpu_saved_ms": self.skipped * avg_inference_ms,
+            "reasons": dict(self.reasons),
+        }
+
+    def end_round(self, round_num, avg_inference_ms=0.0):
+        """
+        Menyimpan statistik ronde yang selesai lalu mereset counter.
+
+        Parameters:
+            round_num (int): Nomor ronde yang selesai.
+            avg_inference_ms (float): Lihat stats().
+
+        Returns:
+            dict: Statistik ronde tersebut.
+        """
+        summary = dict(self.stats(avg_inference_ms), round=round_num)
+        self.rounds.append(summary)
+        self._reset_counters()
+        return summary
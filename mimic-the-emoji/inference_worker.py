@@ -0,0 +1,204 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+from emotion_utils import get_emotion
+from profiling import profiler
+
+# Hasil inferensi terbaru yang dipublikasikan worker
+EmotionResult = namedtuple("EmotionResult", ["emotion", "timestamp", "frame_id"])
+
+# Kebijakan antrean frame:
+# - "latest"      → hanya menyimpan 1 frame terbaru (frame lama langsung dibuang)
+# - "drop_oldest" → antrean FIFO terbatas, frame tertua dibuang saat penuh
+# - "sync"        → tanpa thread, inferensi langsung di submit() (deterministik,
+#                   untuk replay/render offline)
+QUEUE_POLICIES = ("latest", "drop_oldest", "sync")
+
+
+# ===========================================================
+#   WORKER INFERENSI EMOSI DI BACKGROUND THREAD
+# ===========================================================
+class EmotionWorker:
+    """
+    Menjalankan deteksi emosi di thread terpisah agar render loop
+    tidak menunggu DeepFace.
+
+    Render loop cukup memanggil submit() dengan frame terbaru lalu
+    membaca latest() kapan saja; keduanya tidak pernah blocking.
+
+    Parameters:
+        infer_fn (callable): Fungsi inferensi, default get_emotion.
+            Dipanggil sebagai infer_fn(frame, **kwargs).
+        policy (str): "latest", "drop_oldest", atau "sync".
+        max_queue (int): Kapasitas antrean untuk policy "drop_oldest".
+        max_age (float|None): Umur maksimum frame (detik) di antrean.
+            Frame yang lebih tua dibuang worker tanpa diinferensi.
+    """
+
+    def __init__(self, infer_fn=get_emotion, policy="latest",
+                 max_queue=2, max_age=None):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"policy harus salah satu dari {QUEUE_POLICIES}")
+
+        self.infer_fn = infer_fn
+        self.policy = policy
+        self.max_queue = 1 if policy == "latest" else max(1, max_queue)
+        self.max_age = max_age
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._result = None
+        self._next_id = 0
+
+        # Counter statistik
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.frames_inferred = 0
+        self.inference_ms = 0.0    # total waktu yang dihabiskan infer_fn
+
+    def start(self):
+        """
+        Menjalankan thread worker (daemon).
+
+        Returns:
+            EmotionWorker: self, agar bisa dipakai berantai.
+        """
+        if self._thread is not None or self.policy == "sync":
+            return self
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="EmotionWorker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        """
+        Menghentikan thread worker dan mengosongkan antrean.
+
+        Parameters:
+            timeout (float): Batas waktu menunggu thread selesai (detik).
+
+        Returns:
+            None
+        """
+        with self._cond:
+            self._running = False
+            self.frames_dropped += len(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, frame, timestamp=None, **kwargs):
+        """
+        Mengirim frame ke antrean inferensi tanpa blocking.
+
+        Frame disalin terlebih dahulu sehingga pemanggil bebas
+        menggambar HUD/emoji di atas frame aslinya. Pada policy "sync"
+        inferensi langsung dijalankan dan hasilnya tersedia di latest().
+
+        Parameters:
+            frame (numpy.ndarray): Frame kamera (BGR).
+            timestamp (float|None): Waktu frame untuk EmotionResult
+                (default time.time()).
+            **kwargs: Argumen tambahan untuk infer_fn.
+
+        Returns:
+            int: frame_id yang diberikan ke frame ini.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        if self.policy == "sync":
+            with self._cond:
+                frame_id = self._next_id
+                self._next_id += 1
+                self.frames_submitted += 1
+            self._infer(frame_id, timestamp, frame, kwargs)
+            return frame_id
+
+        frame = frame.copy()
+
+        with self._cond:
+            frame_id = self._next_id
+            item = (frame_id, timestamp, time.time(), frame, kwargs)
+            self._next_id += 1
+            self.frames_submitted += 1
+
+            # Antrean penuh → buang frame tertua
+            while len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self.frames_dropped += 1
+
+            self._queue.append(item)
+            self._cond.notify()
+
+        return frame_id
+
+    def latest(self):
+        """
+        Mengambil hasil inferensi terbaru yang sudah selesai.
+
+        Returns:
+            EmotionResult|None: (emotion, timestamp, frame_id) atau None
+            jika belum ada frame yang selesai diproses.
+        """
+        with self._cond:
+            return self._result
+
+    def stats(self):
+        """
+        Mengembalikan counter statistik worker.
+
+        Returns:
+            dict: frames_submitted, frames_dropped, frames_inferred,
+            inference_ms (total) dan avg_inference_ms.
+        """
+        with self._cond:
+            return {
+                "frames_submitted": self.frames_submitted,
+                "frames_dropped": self.frames_dropped,
+                "frames_inferred": self.frames_inferred,
+                "inference_ms": self.inference_ms,
+                "avg_inference_ms": (self.inference_ms / self.frames_inferred
+                                     if self.frames_inferred else 0.0),
+            }
+
+    def _run(self):
+        """Loop utama thread worker."""
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+
+                if not self._running:
+                    return
+
+                frame_id, timestamp, submitted, frame, kwargs = self._queue.popleft()
+
+                # Frame sudah terlalu lama menunggu → tidak relevan lagi
+                if self.max_age is not None and time.time() - submitted > self.max_age:
+                    self.frames_dropped += 1
+                    continue
+
+            self._infer(frame_id, timestamp, frame, kwargs)
+
+    def _infer(self, frame_id, timestamp, frame, kwargs):
+        """Menjalankan infer_fn dan mempublikasikan hasilnya."""
+        t0 = time.perf_counter()
+        with profiler.span("inference"):
+            emotion = self.infer_fn(frame, **kwargs)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+
+        with self._cond:
+            self.inference_ms += elapsed_ms
+            # Jangan timpa hasil yang lebih baru (mis. setelah restart)
+            if self._result is None or frame_id > self._result.frame_id:
+                self._result = EmotionResult(emotion, timestamp, frame_id)
+            self.frames_inferred += 1
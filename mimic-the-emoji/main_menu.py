@@ -1,157 +1,107 @@
 import cv2
-import numpy as np
 import time
-from PIL import Image, ImageDraw, ImageFont
-from audio_utils import play_sfx
+from audio_utils import post_audio_event
+from text_cache import draw_text_custom
+from menu_render import ButtonLayer
+from emotion_utils import start_model_loading, model_loading_status
+from scene_engine import Scene, engine_for
 
-# ===========================================================
-#   Mouse Global State (variabel global untuk klik mouse)
-# ===========================================================
-mouse_clicked = False
-mouse_x, mouse_y = 0, 0
+# Target FPS layar menu & countdown (tidak perlu secepat kamera)
+MENU_FPS = 30
 
 
-def mouse_callback(event, x, y, flags, param):
+def draw_loading_bar(frame, rect, status):
     """
-    Callback function untuk menangkap event klik mouse.
+    Menggambar progress bar load model di bawah tombol Start.
 
     Parameters:
-        event (int): Jenis event dari OpenCV (misal EVENT_LBUTTONDOWN).
-        x (int): Posisi X kursor ketika event terjadi.
-        y (int): Posisi Y kursor ketika event terjadi.
-        flags (int): Flag tambahan OpenCV.
-        param: Parameter tambahan (tidak digunakan).
+        frame (numpy.ndarray): Canvas menu.
+        rect (tuple): Bounding box tombol (x, y, w, h).
+        status (dict): Status dari model_loading_status().
 
     Returns:
         None
     """
-    global mouse_clicked, mouse_x, mouse_y
-
-    # Jika user klik tombol kiri mouse → tandai posisi klik
-    if event == cv2.EVENT_LBUTTONDOWN:
-        mouse_clicked = True
-        mouse_x, mouse_y = x, y
+    bx, by, bw, bh = rect
+    h, w = frame.shape[:2]
+    x1, y1 = bx, by + bh + int(h * 0.04)
+    x2, y2 = bx + bw, y1 + max(6, int(h * 0.015))
 
+    cv2.rectangle(frame, (x1, y1), (x2, y2), (200, 200, 200), 1)
+    fill = x1 + int((x2 - x1) * status["progress"])
+    if fill > x1:
+        cv2.rectangle(frame, (x1, y1), (fill, y2), (80, 220, 80), -1)
 
-# ===========================================================
-#   RENDER TEXT DENGAN FONT CUSTOM (TrueType)
-# ===========================================================
-def draw_text_custom(frame, text, pos, size=80, color=(255, 255, 255),
-                     font_path="assets/fonts/Montserrat-Bold.ttf",
-                     center=False):
-    """
-    Menggambar teks menggunakan font custom (TTF) ke dalam frame OpenCV.
-
-    Parameters:
-        frame (numpy.ndarray): Frame gambar OpenCV.
-        text (str): Teks yang ingin ditampilkan.
-        pos (tuple): Posisi (x, y) text ditampilkan.
-        size (int): Ukuran font.
-        color (tuple): Warna teks dalam format BGR.
-        font_path (str): Path ke file font .ttf.
-        center (bool): Jika True, posisi akan di-center-kan.
-
-    Returns:
-        numpy.ndarray: Frame yang sudah berisi teks.
-    """
-    # Convert frame ke PIL image agar bisa memakai custom font
-    img_pil = Image.fromarray(frame)
-    draw = ImageDraw.Draw(img_pil)
-    font = ImageFont.truetype(font_path, size)
-
-    # Hitung ukuran bounding untuk center alignment
-    bbox = font.getbbox(text)
-    w = bbox[2] - bbox[0]
-    h = bbox[3] - bbox[1]
-
-    # Jika center=True → geser posisi agar teks berada tepat di tengah
-    if center:
-        pos = (pos[0] - w // 2, pos[1] - h // 2)
-
-    draw.text(pos, text, font=font, fill=color)
-
-    return np.array(img_pil)
+    if status["error"]:
+        label = "Model gagal dimuat (tekan q untuk keluar)"
+    else:
+        label = f"Memuat model: {status['stage']}..."
+    draw_text_custom(frame, label, (w // 2, y2 + int(h * 0.035)),
+                     size=int(w / 1600 * 32), color=(220, 220, 220),
+                     font_path="assets/fonts/Montserrat-Regular.ttf", center=True)
 
 
 # ===========================================================
-#   MENGGABUNGKAN PNG TRANSPARAN KE DALAM FRAME
+#   SCENE MAIN MENU
 # ===========================================================
-def overlay_png(base, img_png, x, y):
-    """
-    Menempelkan gambar PNG transparan ke frame OpenCV.
-
-    Parameters:
-        base (numpy.ndarray): Frame dasar.
-        img_png (numpy.ndarray): Gambar PNG (harus RGBA jika ada alpha).
-        x (int): Posisi X tempat PNG ditempel.
-        y (int): Posisi Y tempat PNG ditempel.
-
-    Returns:
-        numpy.ndarray: Frame hasil gabungan.
+class MenuScene(Scene):
     """
-    h, w = img_png.shape[:2]
-
-    # Cegah keluar batas layar
-    if y + h > base.shape[0] or x + w > base.shape[1]:
-        return base
-
-    # Jika PNG memiliki channel alpha
-    if img_png.shape[2] == 4:
-        b, g, r, a = cv2.split(img_png)
-        overlay_color = cv2.merge((b, g, r))  # ignore alpha
-        mask = a / 255.0  # normalisasi alpha (0–1)
-
-        # Blending pixel-per-pixel
-        for c in range(3):
-            base[y:y+h, x:x+w, c] = (
-                base[y:y+h, x:x+w, c] * (1 - mask) +
-                overlay_color[:, :, c] * mask
-            )
+    Menu utama: judul, tombol Start, dan progress load model.
 
-    return base
-
-
-# ===========================================================
-#   TAMPILKAN MAIN MENU
-# ===========================================================
-def show_main_menu(cap):
-    """
-    Menampilkan tampilan UI menu utama dan menunggu input klik user.
+    Menu langsung tampil walaupun model emosi belum siap: model di-load
+    di background, progress-nya digambar di bawah tombol, dan tombol
+    Start baru aktif setelah model siap.
 
     Parameters:
-        cap (cv2.VideoCapture): Kamera aktif untuk menampilkan background.
-
-    Returns:
-        bool:
-            True  → User menekan tombol "Start"
-            False → User menekan 'q' / keluar menu
+        status_fn (callable|None): Mengembalikan dict status load model
+            (stage, progress, ready, error); default model_loading_status.
+        startup (StartupTimer|None): Pencatat time-to-first-frame dan
+            time-to-playable.
+
+    Hasil scene (result):
+        True  → User menekan tombol "Start"
+        False → User menekan 'q' / keluar menu
     """
-    global mouse_clicked, mouse_x, mouse_y
 
-    window_name = "Mimic The Emoji"
-
-    # Aktifkan callback mouse untuk jendela OpenCV
-    cv2.setMouseCallback(window_name, mouse_callback)
-
-    # Load tombol start (PNG) satu kali
-    start_btn = cv2.imread("assets/ui/startButton.png", cv2.IMREAD_UNCHANGED)
-
-    if start_btn is None:
-        print("ERROR: File startButton.png tidak ditemukan!")
-        return False
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            continue
-
-        frame = cv2.flip(frame, 1)  # mirror kamera
-        blur = cv2.GaussianBlur(frame, (35, 35), 0)
-
-        # Gelapkan background untuk fokus UI
-        overlay_alpha = 0.5
-        dark = np.zeros_like(blur)
-        blur = cv2.addWeighted(blur, 1 - overlay_alpha, dark, overlay_alpha, 0)
+    name = "menu"
+    fps = MENU_FPS
+
+    def __init__(self, status_fn=None, startup=None):
+        super().__init__()
+        self.status_fn = status_fn
+        self.startup = startup
+        self.ready = False
+        self.button = None
+
+    def enter(self, engine):
+        super().enter(engine)
+
+        # Load tombol start (PNG) satu kali
+        start_btn = cv2.imread("assets/ui/startButton.png", cv2.IMREAD_UNCHANGED)
+        if start_btn is None:
+            print("ERROR: File startButton.png tidak ditemukan!")
+            self.finish(False)
+            return
+        self.button = ButtonLayer(start_btn, height_ratio=0.15, y_ratio=0.55)
+
+        # Load + warm-up model emosi di background selama menu tampil,
+        # agar menu muncul tanpa menunggu TensorFlow dan ronde pertama tidak freeze
+        if self.status_fn is None:
+            start_model_loading()
+            self.status_fn = model_loading_status
+
+    def handle(self, event):
+        # Klik di tombol (hanya saat model siap) → mulai; 'q' → keluar
+        if event.kind == "click":
+            if self.ready and self.button.contains(event.x, event.y):
+                self.finish(True)
+        elif event.key == ord('q'):
+            self.finish(False)
+
+    def update(self, frame, now):
+        # Blur + gelapkan background untuk fokus UI
+        blur = self.engine.background.render(frame)
+        self.lap("background")
 
         h, w = blur.shape[:2]
 
@@ -175,87 +125,115 @@ def show_main_menu(cap):
             center=True
         )
 
-        # ---- Button PNG Size ----
-        btn_h = int(h * 0.15)
-        btn_w = int(btn_h * (start_btn.shape[1] / start_btn.shape[0]))
-
-        # Resize tombol
-        start_btn_resized = cv2.resize(start_btn, (btn_w, btn_h), interpolation=cv2.INTER_AREA)
-
-        # Posisi tombol
-        bx = (w - btn_w) // 2
-        by = int(h * 0.55)
-
-        blur = overlay_png(blur, start_btn_resized, bx, by)
-
-        # ---- Deteksi klik user ----
-        if mouse_clicked:
-            # Jika klik berada dalam bounding box tombol
-            if bx <= mouse_x <= bx + btn_w and by <= mouse_y <= by + btn_h:
-                mouse_clicked = False
-                return True
-            mouse_clicked = False  # reset jika miss
+        # ---- Tombol redup + progress selama model belum siap ----
+        status = self.status_fn()
+        self.ready = status["ready"]
+        rect = self.button.draw(blur, enabled=self.ready)
+        if not self.ready:
+            draw_loading_bar(blur, rect, status)
 
-        cv2.imshow(window_name, blur)
+        if self.startup is not None:
+            # Frame ini ditampilkan engine tepat setelah update()
+            self.startup.mark("first_frame")
+            if self.ready:
+                self.startup.mark("playable")
 
-        # Tekan 'q' untuk keluar
-        key = cv2.waitKey(1) & 0xFF
-        if key == ord('q'):
-            return False
+        self.lap("render")
+        return blur
 
 
 # ===========================================================
-#   COUNTDOWN SEBELUM GAME DIMULAI
+#   SCENE COUNTDOWN SEBELUM GAME DIMULAI
 # ===========================================================
-def show_countdown(cap, duration=3):
+class CountdownScene(Scene):
     """
-    Menampilkan countdown animasi sebelum game dimulai.
+    Countdown animasi sebelum game dimulai.
 
     Parameters:
-        cap (cv2.VideoCapture): Kamera aktif.
         duration (int): Lama hitungan mundur dalam detik.
-
-    Returns:
-        None
     """
-    window_name = "Mimic The Emoji"
-    start_time = time.time()
 
-    # Mainkan suara start
-    play_sfx("assets/audio/mariostart.mp3")
+    name = "countdown"
+    fps = MENU_FPS
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            continue
+    def __init__(self, duration=3):
+        super().__init__()
+        self.duration = duration
+        self.start_time = None
 
-        frame = cv2.flip(frame, 1)
-        blur = cv2.GaussianBlur(frame, (35, 35), 0)
+    def enter(self, engine):
+        super().enter(engine)
 
-        # Gelapkan background
-        overlay_alpha = 0.5
-        dark = np.zeros_like(blur)
-        blur = cv2.addWeighted(blur, 1 - overlay_alpha, dark, overlay_alpha, 0)
+        # Mainkan suara start
+        post_audio_event("countdown")
 
-        # Hitung sisa waktu countdown
-        elapsed = int(time.time() - start_time)
-        number = duration - elapsed
+    def update(self, frame, now):
+        if self.start_time is None:
+            self.start_time = now
 
+        # Blur + gelapkan background
+        blur = self.engine.background.render(frame)
+        self.lap("background")
+
+        # Hitung sisa waktu countdown
+        number = self.duration - int(now - self.start_time)
         if number <= 0:
-            break  # selesai countdown
+            self.finish()  # selesai countdown
 
         h, w = blur.shape[:2]
 
         # Tampilkan angka countdown
-        blur = draw_text_custom(
-            blur,
-            str(number),
-            (w // 2, h // 2),
-            size=int(w / 1600 * 180),
-            center=True
-        )
+        if number > 0:
+            blur = draw_text_custom(
+                blur,
+                str(number),
+                (w // 2, h // 2),
+                size=int(w / 1600 * 180),
+                center=True
+            )
+
+        self.lap("render")
+        return blur
+
+    def exit(self):
+        time.sleep(0.2)  # jeda sebentar sebelum game mulai
+
+
+# ===========================================================
+#   WRAPPER LAMA (SATU ENGINE PER SUMBER FRAME)
+# ===========================================================
+def show_main_menu(cap, status_fn=None, startup=None):
+    """
+    Menampilkan tampilan UI menu utama dan menunggu input klik user.
 
-        cv2.imshow(window_name, blur)
-        cv2.waitKey(1)
+    Wrapper MenuScene di atas SceneEngine milik cap.
 
-    time.sleep(0.2)  # jeda sebentar sebelum game mulai
+    Parameters:
+        cap (ThreadedCapture|FrameSource): Sumber frame aktif (sudah di-mirror).
+        status_fn (callable|None): Mengembalikan dict status load model
+            (stage, progress, ready, error); default model_loading_status.
+        startup (StartupTimer|None): Pencatat time-to-first-frame dan
+            time-to-playable.
+
+    Returns:
+        bool:
+            True  → User menekan tombol "Start"
+            False → User menekan 'q' / keluar menu
+    """
+    return engine_for(cap).run_scene(MenuScene(status_fn, startup))
+
+
+def show_countdown(cap, duration=3):
+    """
+    Menampilkan countdown animasi sebelum game dimulai.
+
+    Wrapper CountdownScene di atas SceneEngine milik cap.
+
+    Parameters:
+        cap (ThreadedCapture|FrameSource): Sumber frame aktif (sudah di-mirror).
+        duration (int): Lama hitungan mundur dalam detik.
+
+    Returns:
+        None
+    """
+    engine_for(cap).run_scene(CountdownScene(duration))
@@ -0,0 +1,135 @@
+import cv2
+import numpy as np
+from alpha_blend import make_sprite, blit_sprite
+
+
+# ===========================================================
+#   BACKGROUND MENU: BLUR + GELAP (BUFFER DIPAKAI ULANG)
+# ===========================================================
+class MenuBackground:
+    """
+    Background blur + gelap untuk layar menu, countdown, dan game over.
+
+    Blur dijalankan pada frame yang diperkecil (downscale) lalu
+    di-upsample kembali, sehingga jauh lebih murah dibanding
+    GaussianBlur 35x35 di resolusi penuh. Semua buffer kerja
+    dialokasikan sekali per ukuran frame dan dipakai ulang.
+
+    Parameters:
+        downscale (int): Faktor pengecilan sebelum blur.
+        blur_ksize (int): Ukuran kernel blur pada resolusi penuh.
+        darken (float): Opasitas lapisan hitam (0–1).
+        refresh_every (int): Blur dihitung ulang tiap N frame;
+            di antaranya background terakhir dipakai ulang.
+    """
+
+    def __init__(self, downscale=4, blur_ksize=35, darken=0.5, refresh_every=1):
+        self.downscale = max(1, downscale)
+        self.darken = darken
+        self.refresh_every = max(1, refresh_every)
+
+        # Kernel blur disesuaikan dengan skala kecil (harus ganjil)
+        self.ksize = max(3, (blur_ksize // self.downscale) | 1)
+
+        self._shape = None
+        self._frame_count = 0
+
+    def _allocate(self, shape):
+        h, w = shape[:2]
+        sw, sh = max(1, w // self.downscale), max(1, h // self.downscale)
+        self._small_size = (sw, sh)
+        self._small = np.empty((sh, sw, 3), np.uint8)
+        self._small_blur = np.empty_like(self._small)
+        self._background = np.empty(shape, np.uint8)
+        self._canvas = np.empty(shape, np.uint8)
+        self._shape = shape
+        self._frame_count = 0
+
+    def render(self, frame):
+        """
+        Membuat canvas background dari frame kamera.
+
+        Parameters:
+            frame (numpy.ndarray): Frame kamera (BGR, sudah di-mirror).
+
+        Returns:
+            numpy.ndarray: Canvas (buffer yang sama tiap frame) berisi
+            background blur gelap, siap digambari UI.
+        """
+        if frame.shape != self._shape:
+            self._allocate(frame.shape)
+
+        if self._frame_count % self.refresh_every == 0:
+            cv2.resize(frame, self._small_size, dst=self._small,
+                       interpolation=cv2.INTER_AREA)
+            cv2.GaussianBlur(self._small, (self.ksize, self.ksize), 0,
+                             dst=self._small_blur)
+
+            # Gelapkan di resolusi kecil (lebih murah), lalu upsample
+            cv2.convertScaleAbs(self._small_blur, dst=self._small_blur,
+                                alpha=1.0 - self.darken)
+            cv2.resize(self._small_blur, (self._shape[1], self._shape[0]),
+                       dst=self._background, interpolation=cv2.INTER_LINEAR)
+        self._frame_count += 1
+
+        np.copyto(self._canvas, self._background)
+        return self._canvas
+
+
+# ===========================================================
+#   TOMBOL PNG (DI-RESIZE SEKALI PER UKURAN WINDOW)
+# ===========================================================
+class ButtonLayer:
+    """
+    Tombol PNG yang diposisikan relatif terhadap ukuran frame.
+
+    Sprite tombol (resize + pre-multiplied alpha) dan posisinya hanya
+    dihitung ulang ketika ukuran frame berubah. Versi nonaktif (redup)
+    dibuat sekalian untuk tombol yang belum bisa diklik.
+
+    Parameters:
+        img (numpy.ndarray): Gambar tombol (BGRA).
+        height_ratio (float): Tinggi tombol relatif terhadap tinggi frame.
+        y_ratio (float): Posisi atas tombol relatif terhadap tinggi frame.
+    """
+
+    def __init__(self, img, height_ratio=0.15, y_ratio=0.55):
+        self.img = img
+        self.height_ratio = height_ratio
+        self.y_ratio = y_ratio
+        self._key = None
+        self._sprite = None
+        self._sprite_disabled = None
+        self.rect = None           # (x, y, w, h) pada frame terakhir
+
+    def draw(self, canvas, enabled=True):
+        """
+        Menggambar tombol ke canvas.
+
+        Parameters:
+            canvas (numpy.ndarray): Frame tujuan.
+            enabled (bool): False → gambar versi redup.
+
+        Returns:
+            tuple[int, int, int, int]: Bounding box tombol (x, y, w, h).
+        """
+        h, w = canvas.shape[:2]
+        if (w, h) != self._key:
+            btn_h = int(h * self.height_ratio)
+            btn_w = int(btn_h * (self.img.shape[1] / self.img.shape[0]))
+            self._sprite = make_sprite(self.img, (btn_w, btn_h))
+            dim = self.img.copy()
+            dim[:, :, :3] = (dim[:, :, :3] * 0.35).astype(np.uint8)
+            self._sprite_disabled = make_sprite(dim, (btn_w, btn_h))
+            self.rect = ((w - btn_w) // 2, int(h * self.y_ratio), btn_w, btn_h)
+            self._key = (w, h)
+
+        blit_sprite(canvas, self._sprite if enabled else self._sprite_disabled, self.rect[:2])
+        return self.rect
+
+    def contains(self, x, y):
+        """True jika titik (x, y) berada di dalam tombol."""
+        if self.rect is None:
+            return False
+        bx, by, bw, bh = self.rect
+        return bx <= x <= bx + bw and by <= y <= by + bh
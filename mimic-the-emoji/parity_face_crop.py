@@ -0,0 +1,125 @@
+# parity_face_crop.py
+"""
+Cek paritas jalur inferensi face-crop vs full-frame pada video rekaman.
+
+Untuk setiap frame ke-k yang memiliki wajah (Haar), emosi dominan dihitung
+dua kali: get_emotion(frame) dan get_emotion(frame, face_box=box).
+Script melaporkan persentase kesesuaian label dan rata-rata latensi
+kedua jalur (setelah warm-up: load model dan inferensi pertama kedua
+jalur tidak ikut diukur).
+
+Contoh:
+    python parity_face_crop.py rekaman.mp4 --every 5
+"""
+import argparse
+import time
+from collections import Counter
+
+import cv2
+from emotion_utils import get_emotion
+
+
+def run_parity(video_path, every=5, max_frames=None):
+    """
+    Menjalankan kedua jalur inferensi pada video dan mengumpulkan hasilnya.
+
+    Parameters:
+        video_path (str): Path file video.
+        every (int): Hanya proses setiap frame ke-k.
+        max_frames (int|None): Batas jumlah frame yang dibandingkan.
+
+    Returns:
+        dict: Ringkasan paritas dan latensi.
+    """
+    cap = cv2.VideoCapture(video_path)
+    face_cascade = cv2.CascadeClassifier(
+        cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+    )
+
+    compared = agree = 0
+    full_ms, crop_ms = [], []
+    confusion = Counter()
+    index = -1
+    warmed = False
+
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        index += 1
+        if index % every:
+            continue
+
+        frame = cv2.flip(frame, 1)  # samakan dengan input game
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = face_cascade.detectMultiScale(gray, 1.3, 5)
+        if not len(faces):
+            continue
+
+        box = tuple(faces[0])
+        if not warmed:
+            # Load model + forward pass pertama kedua jalur tidak ikut diukur
+            get_emotion(frame)
+            get_emotion(frame, face_box=box)
+            warmed = True
+
+        t0 = time.perf_counter()
+        full = get_emotion(frame)
+        t1 = time.perf_counter()
+        crop = get_emotion(frame, face_box=box)
+        t2 = time.perf_counter()
+
+        full_ms.append((t1 - t0) * 1000)
+        crop_ms.append((t2 - t1) * 1000)
+
+        compared += 1
+        if full == crop:
+            agree += 1
+        else:
+            confusion[(full, crop)] += 1
+
+        if max_frames and compared >= max_frames:
+            break
+
+    cap.release()
+
+    def mean(values):
+        return sum(values) / len(values) if values else 0.0
+
+    return {
+        "frames_compared": compared,
+        "agreement": agree / compared if compared else 0.0,
+        "full_frame_ms": mean(full_ms),
+        "face_crop_ms": mean(crop_ms),
+        "disagreements": confusion.most_common(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", help="path video rekaman")
+    parser.add_argument("--every", type=int, default=5, help="proses setiap frame ke-k")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--min-agreement", type=float, default=0.8,
+                        help="exit code 1 jika kesesuaian di bawah nilai ini")
+    args = parser.parse_args()
+
+    summary = run_parity(args.video, every=args.every, max_frames=args.max_frames)
+
+    print(f"Frames compared : {summary['frames_compared']}")
+    print(f"Agreement       : {summary['agreement'] * 100:.1f}%")
+    print(f"Full frame      : {summary['full_frame_ms']:.1f} ms/inference")
+    print(f"Face crop       : {summary['face_crop_ms']:.1f} ms/inference")
+    if summary["face_crop_ms"]:
+        print(f"Speedup         : {summary['full_frame_ms'] / summary['face_crop_ms']:.1f}x")
+    for (full, crop), count in summary["disagreements"]:
+        print(f"  full={full!s:<9} crop={crop!s:<9} x{count}")
+
+    if summary["agreement"] < args.min_agreement:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
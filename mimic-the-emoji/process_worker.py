@@ -0,0 +1,389 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from inference_worker import EmotionResult
+from profiling import profiler
+
+# Pilihan backend inferensi:
+# - "thread"  → EmotionWorker (thread di proses game)
+# - "process" → ProcessEmotionWorker (proses terpisah, frame via shared memory)
+INFERENCE_BACKENDS = ("thread", "process")
+
+# Batas waktu satu task; slot yang lebih lama dari ini diambil kembali
+JOB_TIMEOUT_S = 30.0
+
+
+# ===========================================================
+#   PROSES WORKER (BERJALAN DI PROSES ANAK)
+# ===========================================================
+def _worker_main(infer_fn, task_queue, result_queue, owners):
+    """
+    Loop proses anak: load model sekali, lalu proses task sampai None.
+
+    Task berisi nama shared memory dan bentuk frame, bukan frame itu
+    sendiri, sehingga frame tidak pernah di-pickle. PID proses ditulis
+    ke owners[slot] saat task diambil (langsung ke shared memory, tidak
+    hilang walau proses crash), agar slot bisa diambil kembali.
+    """
+    from emotion_utils import load_emotion_model
+
+    pid = mp.current_process().pid
+    load_emotion_model()
+    result_queue.put(("ready", pid))
+
+    attached = {}   # nama shared memory → SharedMemory
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            frame_id, timestamp, slot, name, shape, kwargs = task
+            # Slot ini sedang dipegang proses ini (untuk reclaim jika proses mati)
+            owners[slot] = pid
+            shm = attached.get(name)
+            if shm is None:
+                shm = attached[name] = shared_memory.SharedMemory(name=name)
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+
+            t0 = time.perf_counter()
+            try:
+                emotion = infer_fn(frame, **kwargs)
+            except Exception:
+                emotion = None
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            del frame
+
+            result_queue.put(("result", frame_id, timestamp, slot, emotion, elapsed_ms))
+    finally:
+        for shm in attached.values():
+            shm.close()
+
+
+# ===========================================================
+#   BACKEND INFERENSI MULTI-PROSES (API SAMA DENGAN EmotionWorker)
+# ===========================================================
+class ProcessEmotionWorker:
+    """
+    Menjalankan inferensi emosi di proses terpisah (satu atau pool).
+
+    Model DeepFace/TensorFlow di-load di tiap proses anak sehingga
+    inferensi tidak berebut GIL dengan render loop. Frame disalin ke
+    slot shared memory (satu slot per frame yang sedang diproses);
+    proses anak hanya menerima nama slot dan bentuk frame.
+
+    API sama dengan EmotionWorker: start(), submit(), latest(),
+    stats(), stop(). Kebijakan antrean setara "latest": jika semua
+    slot sedang dipakai, frame baru dibuang (hasil tetap mengikuti
+    frame terbaru yang bisa diproses).
+
+    Slot yang dipegang proses anak yang mati (crash di tengah task),
+    atau task yang melewati job_timeout, diambil kembali dan dicatat,
+    sehingga slot tidak bocor dan frame berikutnya tetap diproses.
+
+    Parameters:
+        infer_fn (callable): Fungsi inferensi level modul (harus bisa
+            di-import oleh proses anak), mis. get_emotion_scores.
+        workers (int): Jumlah proses anak.
+        policy (str): Hanya "latest" (diterima agar API sama).
+        slots_per_worker (int): Jumlah slot shared memory per proses.
+        job_timeout (float): Batas waktu satu task sebelum slotnya
+            diambil kembali (detik).
+    """
+
+    def __init__(self, infer_fn=None, workers=1, policy="latest", slots_per_worker=1,
+                 job_timeout=JOB_TIMEOUT_S):
+        if policy != "latest":
+            raise ValueError('ProcessEmotionWorker hanya mendukung policy "latest"')
+        if infer_fn is None:
+            from emotion_utils import get_emotion
+            infer_fn = get_emotion
+
+        self.infer_fn = infer_fn
+        self.workers = max(1, workers)
+        self.policy = policy
+        self.n_slots = self.workers * max(1, slots_per_worker)
+        self.job_timeout = job_timeout
+
+        self._ctx = mp.get_context("spawn")
+        self._task_queue = None
+        self._result_queue = None
+        self._processes = []
+        self._collector = None
+
+        self._lock = threading.Lock()
+        self._slots = []           # (SharedMemory, ndarray view)
+        self._free = []            # index slot yang bebas
+        self._in_flight = {}       # slot → (frame_id, deadline)
+        self._owners = self._ctx.Array("q", self.n_slots, lock=False)  # slot → pid
+        self._dead = set()         # pid proses anak yang sudah tercatat mati
+        self._stopping = False
+        self._shape = None
+        self._result = None
+        self._next_id = 0
+
+        # Counter statistik
+        self.workers_ready = 0
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.frames_inferred = 0
+        self.inference_ms = 0.0
+        self.slots_reclaimed = 0
+
+    # -----------------------------------------------------------
+    #   Lifecycle
+    # -----------------------------------------------------------
+    def start(self):
+        """
+        Menjalankan proses anak dan thread pengumpul hasil.
+
+        Returns:
+            ProcessEmotionWorker: self, agar bisa dipakai berantai.
+        """
+        if self._processes:
+            return self
+
+        self._task_queue = self._ctx.Queue()
+        self._result_queue = self._ctx.Queue()
+        for i in range(self.workers):
+            p = self._ctx.Process(
+                target=_worker_main, name=f"EmotionProcess-{i}", daemon=True,
+                args=(self.infer_fn, self._task_queue, self._result_queue, self._owners))
+            p.start()
+            self._processes.append(p)
+
+        self._collector = threading.Thread(
+            target=self._collect, name="ProcessResultCollector", daemon=True)
+        self._collector.start()
+        return self
+
+    def wait_ready(self, timeout=None):
+        """Menunggu semua proses anak selesai load model."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.workers_ready < self.workers:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            if not any(p.is_alive() for p in self._processes):
+                return False
+            time.sleep(0.01)
+        return True
+
+    def loading_status(self):
+        """
+        Status start proses anak, format sama dengan model_loading_status().
+
+        Returns:
+            dict: stage, progress (0..1), ready (minimal satu proses siap),
+            dan error.
+        """
+        ready = self.workers_ready
+        error = None
+        if not ready and self._processes and not any(p.is_alive() for p in self._processes):
+            error = "proses inferensi berhenti sebelum siap"
+        return {
+            "stage": f"memulai proses inferensi {ready}/{self.workers}",
+            "progress": ready / self.workers,
+            "ready": ready > 0,
+            "error": error,
+        }
+
+    def stop(self, timeout=5.0):
+        """
+        Menghentikan proses anak dan membebaskan shared memory.
+
+        Parameters:
+            timeout (float): Batas waktu menunggu tiap proses (detik);
+                proses yang belum selesai di-terminate.
+
+        Returns:
+            None
+        """
+        if not self._processes:
+            return
+
+        self._stopping = True
+        for _ in self._processes:
+            self._task_queue.put(None)
+        for p in self._processes:
+            p.join(timeout)
+            if p.is_alive():
+                p.terminate()
+                p.join(1.0)
+        self._processes = []
+
+        # Hentikan thread pengumpul
+        self._result_queue.put(None)
+        if self._collector is not None:
+            self._collector.join(timeout)
+            self._collector = None
+
+        self._task_queue.close()
+        self._result_queue.close()
+        self._release_slots()
+
+    # -----------------------------------------------------------
+    #   API worker
+    # -----------------------------------------------------------
+    def submit(self, frame, timestamp=None, **kwargs):
+        """
+        Menyalin frame ke slot shared memory dan mengirim task.
+
+        Parameters:
+            frame (numpy.ndarray): Frame kamera (BGR uint8).
+            timestamp (float|None): Waktu frame (default time.time()).
+            **kwargs: Argumen tambahan untuk infer_fn (harus picklable).
+
+        Returns:
+            int|None: frame_id, atau None jika frame dibuang.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            self.frames_submitted += 1
+
+            if frame.shape != self._shape:
+                # Ukuran frame berubah: slot lama hanya diganti jika tidak dipakai
+                if len(self._free) != len(self._slots):
+                    self.frames_dropped += 1
+                    return None
+                self._allocate_slots(frame.shape)
+
+            if not self._free:
+                self.frames_dropped += 1
+                return None
+
+            slot = self._free.pop()
+            frame_id = self._next_id
+            self._next_id += 1
+            self._in_flight[slot] = (frame_id, time.monotonic() + self.job_timeout)
+            self._owners[slot] = 0
+
+        shm, view = self._slots[slot]
+        np.copyto(view, frame)
+        self._task_queue.put((frame_id, timestamp, slot, shm.name, frame.shape, kwargs))
+        return frame_id
+
+    def latest(self):
+        """
+        Mengambil hasil inferensi terbaru yang sudah selesai.
+
+        Returns:
+            EmotionResult|None: (emotion, timestamp, frame_id) atau None.
+        """
+        with self._lock:
+            return self._result
+
+    def stats(self):
+        """
+        Mengembalikan counter statistik worker.
+
+        Returns:
+            dict: frames_submitted, frames_dropped, frames_inferred,
+            inference_ms (total), avg_inference_ms, dan workers_ready.
+        """
+        with self._lock:
+            return {
+                "frames_submitted": self.frames_submitted,
+                "frames_dropped": self.frames_dropped,
+                "frames_inferred": self.frames_inferred,
+                "inference_ms": self.inference_ms,
+                "avg_inference_ms": (self.inference_ms / self.frames_inferred
+                                     if self.frames_inferred else 0.0),
+                "workers_ready": self.workers_ready,
+                "slots_reclaimed": self.slots_reclaimed,
+            }
+
+    # -----------------------------------------------------------
+    #   Internal
+    # -----------------------------------------------------------
+    def _allocate_slots(self, shape):
+        self._release_slots()
+        nbytes = int(np.prod(shape))
+        for _ in range(self.n_slots):
+            shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self._slots.append((shm, np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)))
+        self._free = list(range(self.n_slots))
+        self._in_flight = {}
+        self._shape = shape
+
+    def _release_slots(self):
+        # View numpy harus dilepas dulu sebelum shared memory ditutup
+        shms = [shm for shm, _ in self._slots]
+        self._slots = []
+        self._free = []
+        self._in_flight = {}
+        self._shape = None
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+    def _reclaim_slots(self):
+        """Mengambil kembali slot milik proses yang mati atau task yang macet."""
+        if self._stopping:
+            return
+        dead = {}
+        for p in self._processes:
+            if not p.is_alive():
+                dead[p.pid] = p.exitcode
+                if p.pid not in self._dead:
+                    self._dead.add(p.pid)
+                    print(f"[inference] {p.name} (pid {p.pid}) berhenti, exitcode={p.exitcode}")
+
+        now = time.monotonic()
+        with self._lock:
+            for slot, (frame_id, deadline) in list(self._in_flight.items()):
+                pid = self._owners[slot]
+                if pid in dead:
+                    reason = f"proses {pid} mati"
+                elif now > deadline:
+                    reason = f"task melewati {self.job_timeout:.0f} s"
+                else:
+                    continue
+                del self._in_flight[slot]
+                self._free.append(slot)
+                self.slots_reclaimed += 1
+                print(f"[inference] slot {slot} (frame {frame_id}) diambil kembali: {reason}")
+
+    def _collect(self):
+        """Thread pengumpul: membaca hasil dari proses anak."""
+        next_check = time.monotonic() + 0.5
+        while True:
+            try:
+                msg = self._result_queue.get(timeout=0.5)
+            except queue.Empty:
+                msg = False
+
+            # Cek proses mati / task macet tiap ~0.5 detik
+            if msg is False or time.monotonic() >= next_check:
+                self._reclaim_slots()
+                next_check = time.monotonic() + 0.5
+                if msg is False:
+                    if not any(p.is_alive() for p in self._processes):
+                        return
+                    continue
+            if msg is None:
+                return
+
+            if msg[0] == "ready":
+                with self._lock:
+                    self.workers_ready += 1
+                continue
+
+            _, frame_id, timestamp, slot, emotion, elapsed_ms = msg
+            profiler.counter("process_inference_ms", elapsed_ms)
+            with self._lock:
+                # Slot yang sudah di-reclaim (dan mungkin dipakai ulang) tidak dibebaskan lagi
+                entry = self._in_flight.get(slot)
+                if entry is not None and entry[0] == frame_id:
+                    del self._in_flight[slot]
+                    self._free.append(slot)
+                self.inference_ms += elapsed_ms
+                self.frames_inferred += 1
+                if self._result is None or frame_id > self._result.frame_id:
+                    self._result = EmotionResult(emotion, timestamp, frame_id)
@@ -0,0 +1,323 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+
+# MIMIC_PROFILE=1 → profiling aktif, MIMIC_PROFILE=trace.json → aktif + dump trace
+PROFILE_ENV = "MIMIC_PROFILE"
+
+
+class _NullSpan:
+    """Span kosong yang dipakai saat profiling mati (tanpa alokasi)."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "t0")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.t0, time.perf_counter())
+        return False
+
+
+# ===========================================================
+#   PROFILER PER FRAME (SPAN, LAP, COUNTER, CHROME TRACE)
+# ===========================================================
+class Profiler:
+    """
+    Instrumentasi ringan untuk loop game, menu, dan thread pendukung.
+
+    - span(name)  : context manager untuk mengukur satu blok (thread apa saja)
+    - frame()     : menandai awal frame baru di render loop (untuk FPS)
+    - lap(name)   : durasi sejak frame()/lap() sebelumnya, sehingga tahap
+                    berurutan di loop bisa diukur tanpa mengubah indentasi
+    - counter()   : nilai sesaat (mis. umur hasil inferensi)
+
+    Saat tidak aktif, semua method langsung return (span() memberi
+    objek kosong yang sama), jadi biayanya hanya satu pemanggilan method.
+    Jika trace_path diisi, semua span disimpan sebagai event Chrome
+    trace (buka di chrome://tracing atau https://ui.perfetto.dev).
+
+    Parameters:
+        enabled (bool): Aktifkan profiling.
+        trace_path (str|None): Path file Chrome-trace JSON.
+        window (int): Jumlah sampel terakhir per tahap untuk statistik.
+        max_events (int): Batas jumlah event trace yang disimpan.
+    """
+
+    def __init__(self, enabled=False, trace_path=None, window=120, max_events=500000):
+        self.enabled = enabled
+        self.trace_path = trace_path
+        self.window = window
+        self.max_events = max_events
+
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._counters = {}
+        self._events = []
+        self._thread_names = {}
+        self._frame_times = deque(maxlen=window)
+        self._frame_start = None
+        self._mark = None
+        self._origin = time.perf_counter()
+
+    @classmethod
+    def from_env(cls):
+        """Membuat profiler dari env var MIMIC_PROFILE."""
+        value = os.environ.get(PROFILE_ENV, "").strip()
+        if not value or value.lower() in ("0", "false", "no", "off"):
+            return cls()
+        trace_path = value if value.lower().endswith(".json") else None
+        return cls(enabled=True, trace_path=trace_path)
+
+    def enable(self, trace_path=None):
+        """Mengaktifkan profiling (opsional dengan dump Chrome trace)."""
+        self.enabled = True
+        if trace_path:
+            self.trace_path = trace_path
+
+    def disable(self):
+        self.enabled = False
+
+    # -----------------------------------------------------------
+    #   Pengukuran
+    # -----------------------------------------------------------
+    def span(self, name):
+        """Context manager pengukur blok kode bernama name."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def frame(self):
+        """Menandai awal frame baru pada render loop."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._frame_times.append(now - self._frame_start)
+            if self.trace_path:
+                self._add_event("frame", self._frame_start, now)
+        self._frame_start = self._mark = now
+
+    def lap(self, name):
+        """Mencatat durasi sejak frame()/lap() terakhir sebagai tahap name."""
+        if not self.enabled or self._mark is None:
+            return
+        now = time.perf_counter()
+        self._record(name, self._mark, now)
+        self._mark = now
+
+    def counter(self, name, value):
+        """Mencatat nilai sesaat (tampil di overlay & sebagai counter trace)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = value
+            if self.trace_path and len(self._events) < self.max_events:
+                self._events.append(("C", name, time.perf_counter(), value,
+                                     threading.get_ident()))
+
+    def _record(self, name, t0, t1):
+        with self._lock:
+            self._samples[name].append((t1 - t0) * 1000)
+        if self.trace_path:
+            self._add_event(name, t0, t1)
+
+    def _add_event(self, name, t0, t1):
+        tid = threading.get_ident()
+        with self._lock:
+            if tid not in self._thread_names:
+                self._thread_names[tid] = threading.current_thread().name
+            if len(self._events) < self.max_events:
+                self._events.append(("X", name, t0, t1 - t0, tid))
+
+    # -----------------------------------------------------------
+    #   Laporan
+    # -----------------------------------------------------------
+    def stats(self):
+        """
+        Ringkasan sampel terakhir.
+
+        Returns:
+            dict: fps, frame_ms, stages {name: {last, avg, max}} (ms),
+            dan counters.
+        """
+        with self._lock:
+            frame_times = list(self._frame_times)
+            stages = {}
+            for name, samples in self._samples.items():
+                if samples:
+                    stages[name] = {
+                        "last": samples[-1],
+                        "avg": sum(samples) / len(samples),
+                        "max": max(samples),
+                    }
+            counters = dict(self._counters)
+
+        frame_s = sum(frame_times) / len(frame_times) if frame_times else 0.0
+        return {
+            "fps": 1.0 / frame_s if frame_s else 0.0,
+            "frame_ms": frame_s * 1000,
+            "stages": stages,
+            "counters": counters,
+        }
+
+    def dump_chrome_trace(self, path=None):
+        """
+        Menyimpan semua event sebagai Chrome-trace JSON.
+
+        Parameters:
+            path (str|None): Path output (default trace_path).
+
+        Returns:
+            str|None: Path file yang ditulis, atau None.
+        """
+        path = path or self.trace_path
+        if not path:
+            return None
+
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+
+        trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                  "args": {"name": name}} for tid, name in thread_names.items()]
+        for ph, name, t0, value, tid in events:
+            ts = (t0 - self._origin) * 1e6
+            if ph == "X":
+                trace.append({"name": name, "ph": "X", "ts": ts, "dur": value * 1e6,
+                              "pid": pid, "tid": tid})
+            else:
+                trace.append({"name": name, "ph": "C", "ts": ts,
+                              "pid": pid, "tid": tid, "args": {name: value}})
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+# ===========================================================
+#   WAKTU START (TIME-TO-FIRST-FRAME & TIME-TO-PLAYABLE)
+# ===========================================================
+class StartupTimer:
+    """
+    Mencatat titik-titik penting saat program start, relatif terhadap t0.
+
+    Setiap nama hanya dicatat sekali (panggilan mark() berikutnya
+    diabaikan), sehingga aman dipanggil dari dalam loop menu.
+
+    Parameters:
+        t0 (float|None): Waktu awal perf_counter() (default: sekarang).
+    """
+
+    def __init__(self, t0=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.marks = {}
+
+    def mark(self, name):
+        """
+        Mencatat dan mencetak waktu name (detik sejak t0), sekali saja.
+
+        Returns:
+            float: Detik sejak t0 untuk name.
+        """
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.t0
+            print(f"[startup] {name}: {self.marks[name]:.2f} s")
+        return self.marks[name]
+
+
+# ===========================================================
+#   PEMAKAIAN CPU PER SCENE
+# ===========================================================
+class CpuMeter:
+    """
+    Rata-rata pemakaian CPU proses per label (mis. per scene).
+
+    CPU % = waktu CPU proses (time.process_time, semua thread: capture,
+    audio, worker inferensi) dibagi waktu dinding pada interval yang
+    sama, dalam persen satu core. Proses anak (backend inferensi
+    "process") tidak ikut terhitung.
+    """
+
+    def __init__(self):
+        self.totals = {}            # label → [cpu_s, wall_s, frames]
+        self._cpu = None
+        self._wall = None
+
+    def reset(self):
+        """Mulai interval baru (waktu sebelum ini tidak dihitung)."""
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+
+    def tick(self, label):
+        """Membebankan waktu sejak tick/reset terakhir ke label."""
+        cpu, wall = time.process_time(), time.perf_counter()
+        if self._cpu is not None:
+            total = self.totals.setdefault(label, [0.0, 0.0, 0])
+            total[0] += cpu - self._cpu
+            total[1] += wall - self._wall
+            total[2] += 1
+        self._cpu, self._wall = cpu, wall
+
+    def report(self):
+        """
+        Ringkasan per label.
+
+        Returns:
+            dict: {label: {"cpu_percent", "seconds", "fps"}}.
+        """
+        return {
+            label: {
+                "cpu_percent": 100.0 * cpu / wall if wall else 0.0,
+                "seconds": wall,
+                "fps": frames / wall if wall else 0.0,
+            }
+            for label, (cpu, wall, frames) in self.totals.items()
+        }
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size proses ini (MB), atau None jika tidak tersedia.
+
+    Memakai resource.getrusage (Linux/macOS); di Windows mencoba psutil.
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux melaporkan KB, macOS melaporkan byte
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+# profiler global yang dipakai game, menu, kamera, dan worker inferensi
+profiler = Profiler.from_env()
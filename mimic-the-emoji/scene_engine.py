@@ -0,0 +1,276 @@
+import time
+from collections import deque, namedtuple
+
+import cv2
+
+from frame_governor import FrameGovernor
+from frame_sink import WindowSink
+from menu_render import MenuBackground
+from profiling import profiler, CpuMeter
+
+# Laju retry saat frame terlewat pada scene tanpa target FPS
+MISSED_FRAME_FPS = 30
+
+# Event input dari window: kind "click" (x, y) atau "key" (key)
+InputEvent = namedtuple("InputEvent", "kind x y key")
+
+
+def click_event(x, y):
+    return InputEvent("click", x, y, None)
+
+
+def key_event(key):
+    return InputEvent("key", None, None, key)
+
+
+# ===========================================================
+#   SCENE DASAR
+# ===========================================================
+class Scene:
+    """
+    Satu layar game (menu, countdown, game, game over).
+
+    Scene tidak memiliki loop sendiri: SceneEngine memanggil update()
+    sekali per frame dengan frame kamera yang sudah dibaca, lalu
+    menampilkan canvas hasilnya. Input datang lewat handle(). Scene
+    selesai dengan finish(result).
+
+    Atribut kelas:
+        name (str): Nama scene (prefix tahap profiling).
+        fps (float|None): Target FPS; None → mengikuti sumber frame.
+        stop_on_source_end (bool): Selesai jika sumber frame habis.
+        reports_faces (bool): Scene melaporkan wajah sendiri ke
+            engine.governor (jika False, engine memeriksa kehadiran).
+    """
+
+    name = "scene"
+    fps = None
+    stop_on_source_end = False
+    reports_faces = False
+
+    def __init__(self):
+        self.engine = None
+        self.done = False
+        self.result = None
+
+    def enter(self, engine):
+        """Dipanggil saat scene masuk ke stack."""
+        self.engine = engine
+
+    def exit(self):
+        """Dipanggil saat scene keluar dari stack."""
+
+    def handle(self, event):
+        """Menangani satu InputEvent."""
+
+    def update(self, frame, now):
+        """
+        Memproses satu frame.
+
+        Parameters:
+            frame (numpy.ndarray): Frame kamera (buffer milik sumber).
+            now (float): Waktu menurut clock engine (detik).
+
+        Returns:
+            numpy.ndarray: Canvas yang ditampilkan.
+        """
+        return frame
+
+    def finish(self, result=None):
+        self.done = True
+        self.result = result
+
+    def lap(self, stage):
+        """Lap profiling dengan prefix nama scene."""
+        profiler.lap(f"{self.name}.{stage}")
+
+
+# ===========================================================
+#   ENGINE: SATU CAPTURE, SATU WINDOW, STACK SCENE
+# ===========================================================
+class SceneEngine:
+    """
+    Frame scheduler untuk semua layar game.
+
+    Engine memiliki satu sumber frame, satu sink (window), satu antrean
+    event input, dan buffer kerja bersama (mis. background blur menu),
+    sehingga berpindah scene tidak membuka ulang kamera atau me-load
+    ulang model. Setiap frame: baca frame → scene.update() → tampilkan
+    → kumpulkan input → teruskan event ke scene teratas. Laju frame
+    diatur FrameGovernor (target FPS per scene, mode idle), dan
+    pemakaian CPU dicatat per scene.
+
+    Parameters:
+        cap (ThreadedCapture|FrameSource): Sumber frame (sudah di-mirror).
+        sink (WindowSink|NullSink|None): Tujuan frame (default WindowSink).
+        clock (callable|None): Jam engine (default time.time).
+        governor (FrameGovernor|None): Pengatur laju frame (default
+            tanpa mode idle).
+    """
+
+    def __init__(self, cap, sink=None, clock=None, governor=None):
+        self.cap = cap
+        self.sink = sink if sink is not None else WindowSink()
+        self.clock = clock or time.time
+        self.stack = []
+        self.events = deque()
+
+        # Buffer bersama untuk layar menu/countdown/game over
+        self.background = MenuBackground()
+
+        self.governor = governor if governor is not None else FrameGovernor()
+        self.governor.on_change = self._on_idle_change
+        self.cpu = CpuMeter()
+        self.frames = 0
+
+    # -----------------------------------------------------------
+    #   Input
+    # -----------------------------------------------------------
+    def _on_mouse(self, event, x, y, flags, param):
+        # Callback OpenCV hanya mengantrekan event (tanpa state global)
+        if event == cv2.EVENT_LBUTTONDOWN:
+            self.events.append(click_event(x, y))
+
+    def post(self, event):
+        """Menambahkan InputEvent ke antrean (mis. dari test/remote)."""
+        self.events.append(event)
+
+    # -----------------------------------------------------------
+    #   Stack scene
+    # -----------------------------------------------------------
+    @property
+    def scene(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene):
+        # Input window selalu masuk ke antrean engine yang sedang aktif
+        if not self.sink.headless:
+            cv2.setMouseCallback(self.sink.window_name, self._on_mouse)
+        self.stack.append(scene)
+        # Ganti scene = aktivitas user; waktu setup tidak dibebankan ke scene
+        self.governor.activity()
+        self.governor.restart()
+        scene.enter(self)
+        self.cpu.reset()
+        return scene
+
+    def pop(self):
+        scene = self.stack.pop()
+        scene.exit()
+        self.governor.restart()
+        return scene
+
+    def run_scene(self, scene):
+        """
+        Menjalankan scene sampai selesai, lalu mengembalikan hasilnya.
+
+        Parameters:
+            scene (Scene): Scene yang dijalankan di atas stack.
+
+        Returns:
+            object: scene.result.
+        """
+        self.push(scene)
+        try:
+            while not scene.done:
+                self.step()
+        finally:
+            self.pop()
+        return scene.result
+
+    # -----------------------------------------------------------
+    #   Satu frame
+    # -----------------------------------------------------------
+    def step(self):
+        """Menjalankan satu frame untuk scene teratas."""
+        scene = self.scene
+        governor = self.governor
+        label = f"{scene.name} (idle)" if governor.idle else scene.name
+
+        profiler.frame()
+        ret, frame = self.cap.read()
+        scene.lap("capture")
+        if not ret:
+            if scene.stop_on_source_end and self.source_ended():
+                scene.finish(scene.result)
+                return
+            # Frame terlewat (kamera lambat/glitch yang sedang di-retry):
+            # window tetap responsif dan loop tetap tidur, tidak memutar
+            # CPU menunggu sumber
+            self._dispatch_input(scene)
+            governor.wait(governor.target_fps(scene.fps) or MISSED_FRAME_FPS)
+            self.cpu.tick(label)
+            return
+
+        # Deteksi kehadiran sebelum scene menggambar di atas frame
+        if not scene.reports_faces:
+            governor.observe(frame)
+
+        canvas = scene.update(frame, self.clock())
+        self.sink.write(canvas)
+        self.frames += 1
+
+        self._dispatch_input(scene)
+        scene.lap("output")
+
+        governor.update()
+        governor.wait(governor.target_fps(scene.fps))
+        self.cpu.tick(label)
+
+    def source_ended(self):
+        """
+        True jika read() gagal karena sumber frame benar-benar berhenti.
+
+        ThreadedCapture membedakan timeout (kamera sedang retry) dari
+        capture yang berhenti lewat properti stopped; sumber lain
+        (video, folder, sintetis) hanya gagal di akhir stream.
+        """
+        return getattr(self.cap, "stopped", True)
+
+    def _dispatch_input(self, scene):
+        """Mengumpulkan tombol dari sink lalu meneruskan antrean event ke scene."""
+        key = self.sink.poll_key()
+        if key != -1:
+            self.events.append(key_event(key))
+        if self.events:
+            self.governor.activity()
+        while self.events and not scene.done:
+            scene.handle(self.events.popleft())
+
+    # -----------------------------------------------------------
+    #   Mode idle & telemetri
+    # -----------------------------------------------------------
+    def _on_idle_change(self, idle):
+        governor = self.governor
+        if idle:
+            print(f"[power] idle: tidak ada wajah {governor.idle_after:.0f} s "
+                  f"→ {governor.idle_fps} fps, inferensi dijeda")
+        else:
+            print("[power] aktif kembali")
+
+        # Kamera ber-thread: frame di luar target idle hanya di-grab (tanpa decode)
+        limit_fps = getattr(self.cap, "limit_fps", None)
+        if limit_fps is not None:
+            limit_fps(governor.idle_fps if idle else None)
+
+    def cpu_report(self):
+        """Mencetak rata-rata CPU % dan FPS per scene."""
+        for label, r in self.cpu.report().items():
+            print(f"[power] {label}: cpu={r['cpu_percent']:.1f}% "
+                  f"fps={r['fps']:.1f} time={r['seconds']:.1f} s")
+        governor = self.governor
+        if governor.enabled:
+            print(f"[power] idle={governor.idle_entries}x wake={governor.wakeups}x")
+
+
+# Engine per sumber frame, agar wrapper show_* memakai window, antrean
+# input, dan buffer yang sama
+_engines = {}
+
+
+def engine_for(cap):
+    """SceneEngine (WindowSink) untuk cap, dibuat sekali per cap."""
+    engine = _engines.get(id(cap))
+    if engine is None or engine.cap is not cap:
+        engine = _engines[id(cap)] = SceneEngine(cap)
+    return engine
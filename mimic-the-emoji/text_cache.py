@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from alpha_blend import sprite_from_alpha, blit_sprite
+
+DEFAULT_FONT = "assets/fonts/Montserrat-Bold.ttf"
+
+
+@lru_cache(maxsize=None)
+def get_font(font_path, size):
+    """
+    Memuat font TrueType sekali per (path, size).
+
+    Parameters:
+        font_path (str): Path file .ttf.
+        size (int): Ukuran font.
+
+    Returns:
+        PIL.ImageFont.FreeTypeFont: Font yang sudah di-parse.
+    """
+    return ImageFont.truetype(font_path, size)
+
+
+# ===========================================================
+#   CACHE SPRITE TEKS (LRU)
+# ===========================================================
+class TextSpriteCache:
+    """
+    Menyimpan teks TTF yang sudah dirender menjadi sprite alpha.
+
+    Setiap kombinasi (text, font_path, size, color) dirender sekali
+    dengan PIL ke mask alpha, lalu disimpan sebagai sprite
+    pre-multiplied. Entri yang paling lama tidak dipakai dibuang
+    ketika jumlah entri melebihi max_entries.
+
+    Parameters:
+        max_entries (int): Kapasitas cache.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, size, color, font_path=DEFAULT_FONT):
+        """
+        Mengambil sprite teks (render jika belum ada di cache).
+
+        Parameters:
+            text (str): Teks.
+            size (int): Ukuran font.
+            color (tuple): Warna teks BGR.
+            font_path (str): Path font TTF.
+
+        Returns:
+            tuple[Sprite, tuple[int, int], tuple[int, int]]:
+            sprite, offset bbox (dx, dy) relatif ke posisi teks PIL,
+            dan ukuran bbox (w, h).
+        """
+        key = (text, font_path, size, tuple(color))
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = self._render(text, size, color, font_path)
+        self._entries[key] = entry
+
+        # LRU eviction
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return entry
+
+    def clear(self):
+        """Mengosongkan cache."""
+        self._entries.clear()
+
+    @staticmethod
+    def _render(text, size, color, font_path):
+        font = get_font(font_path, size)
+        left, top, right, bottom = font.getbbox(text)
+        w, h = max(1, right - left), max(1, bottom - top)
+
+        # Raster teks ke mask alpha seukuran bbox
+        mask = Image.new("L", (w, h), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+
+        sprite = sprite_from_alpha(tuple(color), np.array(mask), text)
+        return sprite, (left, top), (w, h)
+
+
+# cache bersama untuk semua layar (main menu, countdown, game over)
+text_cache = TextSpriteCache()
+
+
+# ===========================================================
+#   RENDER TEXT DENGAN FONT CUSTOM (TrueType)
+# ===========================================================
+def draw_text_custom(frame, text, pos, size=80, color=(255, 255, 255),
+                     font_path=DEFAULT_FONT, center=False):
+    """
+    Menggambar teks menggunakan font custom (TTF) ke dalam frame OpenCV.
+
+    Teks diambil dari text_cache (dirender sekali), lalu di-blit
+    langsung ke frame; PIL tidak dipakai di jalur per-frame.
+
+    Parameters:
+        frame (numpy.ndarray): Frame gambar OpenCV.
+        text (str): Teks yang ingin ditampilkan.
+        pos (tuple): Posisi (x, y) text ditampilkan.
+        size (int): Ukuran font.
+        color (tuple): Warna teks dalam format BGR.
+        font_path (str): Path ke file font .ttf.
+        center (bool): Jika True, posisi akan di-center-kan.
+
+    Returns:
+        numpy.ndarray: Frame yang sudah berisi teks (objek yang sama).
+    """
+    sprite, (dx, dy), (w, h) = text_cache.get(text, size, color, font_path)
+
+    # Jika center=True → geser posisi agar teks berada tepat di tengah
+    if center:
+        pos = (pos[0] - w // 2, pos[1] - h // 2)
+
+    blit_sprite(frame, sprite, (pos[0] + dx, pos[1] + dy))
+
+    return frame